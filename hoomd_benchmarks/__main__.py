@@ -4,59 +4,15 @@
 """Command line entrypoint for the package."""
 
 import copy
-import fnmatch
+import math
 import os
 
 import hoomd
-import numpy
 import pandas
 
-from . import common
-from .hpmc_octahedron import HPMCOctahedron
-from .hpmc_pair_kern_frenkel import HPMCPairKernFrenkel
-from .hpmc_pair_lj import HPMCPairLJ
-from .hpmc_pair_step import HPMCPairStep
-from .hpmc_pair_union_wca import HPMCPairUnionWCA
-from .hpmc_sphere import HPMCSphere
-from .md_pair_lj import MDPairLJ
-from .md_pair_opp import MDPairOPP
-from .md_pair_table import MDPairTable
-from .md_pair_wca import MDPairWCA
-from .microbenchmark_box_resize import MicrobenchmarkBoxResize
-from .microbenchmark_custom_force import MicrobenchmarkCustomForce
-from .microbenchmark_custom_trigger import MicrobenchmarkCustomTrigger
-from .microbenchmark_custom_updater import MicrobenchmarkCustomUpdater
-from .microbenchmark_empty_simulation import MicrobenchmarkEmptySimulation
-from .microbenchmark_force_array_access import MicrobenchmarkForceArrayAccess
-from .microbenchmark_get_snapshot import MicrobenchmarkGetSnapshot
-from .microbenchmark_set_snapshot import MicrobenchmarkSetSnapshot
-from .write_gsd import GSD
-from .write_gsd_log import GSDLog
-from .write_hdf5_log import HDF5Log
-
-benchmark_classes = [
-    HPMCSphere,
-    HPMCOctahedron,
-    HPMCPairLJ,
-    HPMCPairStep,
-    HPMCPairKernFrenkel,
-    HPMCPairUnionWCA,
-    MDPairLJ,
-    MDPairOPP,
-    MDPairTable,
-    MDPairWCA,
-    MicrobenchmarkBoxResize,
-    MicrobenchmarkEmptySimulation,
-    MicrobenchmarkCustomTrigger,
-    MicrobenchmarkCustomUpdater,
-    MicrobenchmarkCustomForce,
-    MicrobenchmarkGetSnapshot,
-    MicrobenchmarkSetSnapshot,
-    MicrobenchmarkForceArrayAccess,
-    GSD,
-    GSDLog,
-    HDF5Log,
-]
+from . import common, database, journal, results, scheduler, worker
+from .configuration.snapshot_cache import snapshot_cache
+from .suite import select_benchmarks
 
 parser = common.Benchmark.make_argument_parser()
 parser.add_argument(
@@ -78,46 +34,299 @@ parser.add_argument(
     help='Name identifying this benchmark run'
     ' (leave unset to use the HOOMD-blue version).',
 )
+parser.add_argument(
+    '--snapshot_cache_size',
+    type=int,
+    default=snapshot_cache.max_bytes // 1024**2,
+    help='Maximum memory (in MiB) used to cache initial configuration snapshots.',
+)
+parser.add_argument(
+    '--jsonl',
+    type=str,
+    default=None,
+    help='Append a result record for each benchmark to this JSON Lines file.',
+)
+parser.add_argument(
+    '--database',
+    type=str,
+    default=None,
+    help='Add the results to this SQLite database (see hoomd_benchmarks.database).',
+)
+parser.add_argument(
+    '--journal',
+    type=str,
+    default=None,
+    help='Record results in this JSON Lines journal and skip benchmarks that'
+    ' already completed in it.',
+)
+parser.add_argument(
+    '--isolate',
+    action='store_true',
+    help='Execute each benchmark in a new worker process.',
+)
+parser.add_argument(
+    '--timeout',
+    type=float,
+    default=None,
+    help='Stop isolated benchmarks that run longer than this many seconds.',
+)
+parser.add_argument(
+    '--launcher',
+    type=str,
+    default='',
+    help='Command that launches isolated workers (for example, "srun -n 16").',
+)
+parser.add_argument(
+    '--cores-per-job',
+    dest='cores_per_job',
+    type=int,
+    default=None,
+    help='Run isolated CPU benchmarks concurrently, each pinned to this many '
+    'cores. HOOMD-blue uses one core per MPI rank, so values above 1 require '
+    'a --launcher that starts that many ranks (for example, "mpirun -n 4").',
+)
+parser.add_argument(
+    '--numa',
+    action='store_true',
+    help='Keep the cores of each concurrent job within one NUMA node.',
+)
+parser.add_argument(
+    '--contention',
+    type=str,
+    default=None,
+    metavar='BENCHMARK',
+    help='Measure the slowdown of concurrent jobs with this benchmark class.',
+)
+parser.add_argument(
+    '--cpus',
+    type=str,
+    default=None,
+    help='Pin the suite and its workers to these cores (for example, "0-7").',
+)
 args = parser.parse_args()
 
+if args.cpus is not None:
+    os.sched_setaffinity(0, scheduler.parse_cpu_list(args.cpus))
+
+if args.cores_per_job is not None:
+    if args.device != 'CPU':
+        parser.error('--cores-per-job requires --device CPU')
+    if args.cores_per_job > 1 and not args.launcher:
+        parser.error(
+            f'--cores-per-job {args.cores_per_job} requires a --launcher that '
+            f'starts {args.cores_per_job} MPI ranks'
+        )
+    args.isolate = True
+elif args.contention is not None:
+    parser.error('--contention requires --cores-per-job')
+
 benchmark_args_ref = copy.deepcopy(vars(args))
 del benchmark_args_ref['benchmarks']
 del benchmark_args_ref['output']
 del benchmark_args_ref['name']
+del benchmark_args_ref['snapshot_cache_size']
+del benchmark_args_ref['jsonl']
+del benchmark_args_ref['database']
+del benchmark_args_ref['journal']
+del benchmark_args_ref['isolate']
+del benchmark_args_ref['timeout']
+del benchmark_args_ref['launcher']
+del benchmark_args_ref['cores_per_job']
+del benchmark_args_ref['numa']
+del benchmark_args_ref['contention']
+del benchmark_args_ref['cpus']
+
+snapshot_cache.max_bytes = args.snapshot_cache_size * 1024**2
+
+del benchmark_args_ref['device']
+if args.isolate:
+    # The workers initialize the device, this process only collects results.
+    device = None
+    is_root = True
+else:
+    device = common.make_hoomd_device(args)
+    is_root = device.communicator.rank == 0
+
+jsonl_writer = None
+if args.jsonl is not None and is_root:
+    jsonl_writer = results.JSONLWriter(args.jsonl)
 
-device = common.make_hoomd_device(args)
-benchmark_args_ref['device'] = device
+results_database = None
+if args.database is not None and is_root:
+    results_database = database.ResultsDatabase(args.database)
+
+if args.name is None:
+    run_name = hoomd.version.version
+else:
+    run_name = args.name
+
+run_journal = None
+run_id = None
+if args.journal is not None:
+    run_journal = journal.Journal(
+        args.journal, communicator=None if device is None else device.communicator
+    )
+    run_id = run_journal.run_id(run_name)
+
+if run_id is None:
+    run_id = results.new_run_id()
 
 performance = {}
 
-for benchmark_class in benchmark_classes:
+
+def suite_arguments(benchmark_class):
+    """Scale the benchmark arguments for the suite."""
     # scale the benchmark_steps by the class specific scale factor
     benchmark_args = copy.copy(benchmark_args_ref)
     benchmark_args['warmup_steps'] *= benchmark_class.SUITE_STEP_SCALE
     benchmark_args['benchmark_steps'] *= benchmark_class.SUITE_STEP_SCALE
+    benchmark_args['warmup_chunk_steps'] *= benchmark_class.SUITE_STEP_SCALE
+    benchmark_args['max_warmup_steps'] *= benchmark_class.SUITE_STEP_SCALE
 
     name = benchmark_class.__name__
-    if fnmatch.fnmatch(name, args.benchmarks) and benchmark_class.runs_on_device(
-        device
-    ):
-        benchmark = benchmark_class(**benchmark_args)
-        performance[name] = benchmark.execute()
+    if benchmark_args['latency_output'] is not None:
+        root, ext = os.path.splitext(benchmark_args['latency_output'])
+        benchmark_args['latency_output'] = f'{root}.{name}{ext}'
+
+    return benchmark_args
+
+
+def journal_key(benchmark_class):
+    """Identify a benchmark of this run in the journal."""
+    return journal.entry_key(
+        benchmark_class.__name__,
+        suite_arguments(benchmark_class),
+        args.device,
+        run_name,
+        hoomd.version.version,
+    )
+
+
+def report(name, record, formatted_performance):
+    """Store and print the result of one benchmark."""
+    if run_journal is not None:
+        run_journal.write(journal_keys[name], record)
+    if jsonl_writer is not None:
+        jsonl_writer.write(record)
+    if results_database is not None:
+        results_database.add_record(record)
+
+    if args.output is None and is_root:
+        print(f'{name}: {formatted_performance}')
+
+
+def report_isolated(name, record):
+    """Store and print the result record of an isolated worker."""
+    if record['status'] == 'skipped':
+        return
+
+    if record['status'] == 'completed':
+        formatted_performance = record['formatted_performance']
+        performance[name] = record['summary']['value']
+    else:
+        formatted_performance = record['status']
+        performance[name] = math.nan
+
+    report(name, record, formatted_performance)
+
+
+isolated_arguments = dict(
+    name=args.name, run_id=run_id, timeout=args.timeout, launcher=args.launcher
+)
+
+benchmark_classes = select_benchmarks(args.benchmarks)
+journal_keys = {
+    benchmark_class.__name__: journal_key(benchmark_class)
+    for benchmark_class in benchmark_classes
+}
+
+if run_journal is not None:
+    remaining_classes = []
+    for benchmark_class in benchmark_classes:
+        name = benchmark_class.__name__
+        key = journal_keys[name]
+        if run_journal.is_completed(key):
+            performance[name] = run_journal.completed[key]['summary']['value']
+            if args.output is None and is_root:
+                print(f'{name}: completed in journal')
+        else:
+            remaining_classes.append(benchmark_class)
+    benchmark_classes = remaining_classes
+
+if args.cores_per_job is not None:
+    sets = scheduler.core_sets(args.cores_per_job, numa=args.numa)
+    print(f'Running {len(sets)} concurrent jobs on core sets {sets}')
+
+    contention = None
+    if args.contention is not None:
+        calibration_classes = select_benchmarks(args.contention)
+        if len(calibration_classes) == 0:
+            parser.error(f'--contention: no benchmark matches {args.contention}')
+        calibration_class = calibration_classes[0]
+        contention = scheduler.measure_contention(
+            calibration_class.__name__,
+            suite_arguments(calibration_class),
+            sets,
+            args.device,
+            **isolated_arguments,
+        )
+        print(
+            f'Contention ({contention["benchmark"]}): '
+            f'{contention["slowdown"]:.3f}x slowdown'
+        )
+
+    names = [benchmark_class.__name__ for benchmark_class in benchmark_classes]
+
+    def report_packed(index, record):
+        """Store and print the result of a concurrent job."""
+        if contention is not None:
+            record['scheduler']['contention'] = contention
+        report_isolated(names[index], record)
+
+    scheduler.run_packed(
+        [
+            (benchmark_class.__name__, suite_arguments(benchmark_class))
+            for benchmark_class in benchmark_classes
+        ],
+        sets,
+        args.device,
+        callback=report_packed,
+        **isolated_arguments,
+    )
+else:
+    for benchmark_class in benchmark_classes:
+        benchmark_args = suite_arguments(benchmark_class)
+        name = benchmark_class.__name__
 
-        if args.output is None and benchmark_args['device'].communicator.rank == 0:
-            print(f'{name}: {numpy.mean(performance[name])}')
+        if args.isolate:
+            record = worker.run_isolated(
+                name, benchmark_args, args.device, **isolated_arguments
+            )
+            report_isolated(name, record)
+        elif benchmark_class.runs_on_device(device):
+            benchmark = benchmark_class(device=device, **benchmark_args)
+            start_time = results.timestamp()
+            samples = benchmark.execute()
+            stop_time = results.timestamp()
+            performance[name] = benchmark.summary['value']
 
-if args.output is not None and benchmark_args['device'].communicator.rank == 0:
-    performance_mean = {}
-    for name, performance_list in performance.items():
-        performance_mean[name] = numpy.mean(performance_list)
+            record = results.make_record(
+                benchmark,
+                samples,
+                start_time,
+                stop_time,
+                name=args.name,
+                run_id=run_id,
+            )
+            report(name, record, benchmark.format_performance())
 
-    name = args.name
-    if name is None:
-        name = hoomd.version.version
-    df = pandas.DataFrame.from_dict(performance_mean, orient='index', columns=[name])
+if args.output is not None and is_root:
+    df = pandas.DataFrame.from_dict(performance, orient='index', columns=[run_name])
 
     if os.path.isfile(args.output):
         df_old = pandas.read_csv(args.output, index_col=0)
+        # Replace the column of a previous (resumed) run with the same name.
+        df_old = df_old.drop(columns=[run_name], errors='ignore')
         df = df_old.join(df, how='outer')
 
     with open(args.output, 'w') as f:
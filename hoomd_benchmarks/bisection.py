@@ -0,0 +1,361 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Find the first HOOMD-blue build with a performance regression.
+
+Given an ordered list of builds where the first is known to be fast (good) and
+the last slow (bad), `Bisection` measures one benchmark on the midpoint of the
+remaining range and classifies it by comparing its samples with the samples of
+the good and bad endpoints (see `compare.compare`). Each step halves the range,
+so the first bad build is found in about ``log2(n)`` measurements.
+
+The suite runs in each build as in `versions` (with ``--adaptive`` and at
+least `DEFAULT_REPEAT` repetitions) and journals its results, so an
+interrupted bisection resumes without repeating measurements.
+
+Run ``python -m hoomd_benchmarks.bisection --help`` for the command line
+interface. Options that the driver does not recognize pass through to the
+suite.
+"""
+
+import argparse
+import math
+import os
+import sys
+
+from . import compare, results, stats, versions
+
+# Minimum number of samples measured in each build. The Mann-Whitney U test
+# cannot reach p < 0.05 with fewer than 4 samples in each set, and 8 leaves
+# margin for overlapping samples.
+DEFAULT_REPEAT = 8
+
+
+class BisectError(RuntimeError):
+    """The bisection cannot continue."""
+
+
+def _comparison(baseline, candidate, benchmark, **kwargs):
+    """dict: Compare the samples of two builds (one row of `compare.compare`)."""
+    df = compare.compare({benchmark: baseline}, {benchmark: candidate}, **kwargs)
+    row = df.iloc[0]
+    return dict(
+        ratio=float(row['ratio']),
+        ci_low=float(row['ci_low']),
+        ci_high=float(row['ci_high']),
+        p_value=float(row['p_value']),
+        change=row['change'],
+    )
+
+
+def min_p_value(n):
+    """float: The smallest p-value of the U test with *n* samples in each set."""
+    return stats.mann_whitney_u(range(n), range(n, 2 * n))[1]
+
+
+class Bisection:
+    """Bisect a performance regression across ordered builds.
+
+    Args:
+        environments (list[versions.Environment]): Builds in order. The first
+          is good and the last is bad.
+        benchmark (str): Name of the benchmark class.
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        suite_args (list[str]): Additional suite command line arguments.
+        directory (str): Directory for the journal files.
+        evidence (str): Append the evidence of each step to this JSON Lines
+          file.
+        repeat (int): Minimum number of samples to measure in each build.
+          The U test must be able to reach ``alpha`` with *repeat* samples
+          in each set (at least 4 at ``alpha=0.05``, see `min_p_value`).
+        kwargs: Arguments for `compare.compare` (``statistic``,
+          ``confidence``, ``alpha``, and ``min_effect``).
+    """
+
+    def __init__(
+        self,
+        environments,
+        benchmark,
+        device,
+        suite_args,
+        directory,
+        evidence=None,
+        repeat=DEFAULT_REPEAT,
+        **kwargs,
+    ):
+        alpha = kwargs.get('alpha', compare.DEFAULT_ALPHA)
+        if not min_p_value(repeat) < alpha:
+            raise ValueError(
+                f'{repeat} samples per build cannot reach significance at '
+                f'alpha={alpha} (the smallest p-value is '
+                f'{min_p_value(repeat):.3g}).'
+            )
+
+        self.environments = environments
+        self.benchmark = benchmark
+        self.device = device
+        self.suite_args = [
+            '--benchmarks',
+            benchmark,
+            '--adaptive',
+            '--repeat',
+            str(repeat),
+            *suite_args,
+        ]
+        self.directory = directory
+        self.compare_args = kwargs
+        self.steps = []
+        self._samples = {}
+        self._writer = None
+        if evidence is not None:
+            self._writer = results.JSONLWriter(evidence)
+
+    @property
+    def measurements(self):
+        """int: The number of builds measured so far."""
+        return len(self._samples)
+
+    def samples(self, index):
+        """Measure a build (or read the journaled measurement).
+
+        Args:
+            index (int): Index of the build.
+
+        Returns:
+            list[float]: The performance samples.
+
+        Raises:
+            BisectError: When the benchmark does not complete.
+        """
+        if index in self._samples:
+            return self._samples[index]
+
+        environment = self.environments[index]
+        versions.run_environments(
+            [environment], self.device, self.suite_args, self.directory
+        )
+
+        records = [
+            record
+            for record in versions.merge([environment], self.directory)
+            if record['benchmark'] == self.benchmark and record['status'] == 'completed'
+        ]
+        if len(records) == 0:
+            raise BisectError(
+                f'{self.benchmark} did not complete with {environment.name}.'
+            )
+
+        samples = [v for v in records[-1]['samples'] if v is not None]
+        self._samples[index] = samples
+        return samples
+
+    def _record(self, step):
+        self.steps.append(step)
+        if self._writer is not None:
+            self._writer.write(results.to_json(step))
+
+        print(
+            f'{step["build"]}: {step["verdict"]} '
+            f'(vs good {step["vs_good"]["ratio"]:.3f} '
+            f'p={step["vs_good"]["p_value"]:.3g}, '
+            f'vs bad {step["vs_bad"]["ratio"]:.3f} '
+            f'p={step["vs_bad"]["p_value"]:.3g})',
+            flush=True,
+        )
+
+    def classify(self, index, good, bad):
+        """Classify a build as good or bad.
+
+        Args:
+            index (int): Index of the build.
+            good (int): Index of a known good build.
+            bad (int): Index of a known bad build.
+
+        A build is ``'bad'`` when it is a regression compared to the good
+        build and ``'good'`` when it is an improvement compared to the bad
+        build. When the tests do not decide (or decide both ways), the build is
+        classified with the endpoint whose performance is closer (in log
+        ratio) and the verdict is marked ``uncertain``.
+
+        Returns:
+            str: ``'good'`` or ``'bad'``.
+        """
+        samples = self.samples(index)
+        vs_good = _comparison(
+            self.samples(good), samples, self.benchmark, **self.compare_args
+        )
+        vs_bad = _comparison(
+            self.samples(bad), samples, self.benchmark, **self.compare_args
+        )
+
+        is_bad = vs_good['change'] == 'regression'
+        is_good = vs_bad['change'] == 'improvement'
+        uncertain = is_bad == is_good
+        if uncertain:
+            is_bad = abs(math.log(vs_good['ratio'])) > abs(math.log(vs_bad['ratio']))
+
+        verdict = 'bad' if is_bad else 'good'
+        self._record(
+            dict(
+                step=len(self.steps),
+                build=self.environments[index].name,
+                index=index,
+                good=self.environments[good].name,
+                bad=self.environments[bad].name,
+                value=float(
+                    stats.STATISTICS[
+                        self.compare_args.get('statistic', stats.DEFAULT_STATISTIC)
+                    ](samples)
+                ),
+                n_samples=len(samples),
+                vs_good=vs_good,
+                vs_bad=vs_bad,
+                verdict=verdict,
+                uncertain=uncertain,
+            )
+        )
+        return verdict
+
+    def run(self):
+        """Find the first bad build.
+
+        Returns:
+            versions.Environment: The first bad build.
+
+        Raises:
+            BisectError: When the last build is not a regression compared to
+            the first, or a benchmark does not complete.
+        """
+        good = 0
+        bad = len(self.environments) - 1
+        if bad < 1:
+            raise BisectError('Provide at least two builds.')
+
+        endpoints = _comparison(
+            self.samples(good), self.samples(bad), self.benchmark, **self.compare_args
+        )
+        if endpoints['change'] != 'regression':
+            raise BisectError(
+                f'{self.environments[bad].name} is not a regression compared to '
+                f'{self.environments[good].name} (ratio {endpoints["ratio"]:.3f}, '
+                f'p={endpoints["p_value"]:.3g}).'
+            )
+
+        while bad - good > 1:
+            middle = (good + bad) // 2
+            if self.classify(middle, good, bad) == 'bad':
+                bad = middle
+            else:
+                good = middle
+
+        return self.environments[bad]
+
+
+def main():
+    """Implement the command line interface."""
+    parser = argparse.ArgumentParser(
+        prog='python -m hoomd_benchmarks.bisection',
+        description='Find the first HOOMD-blue build with a performance '
+        'regression. Unrecognized options pass through to the suite.',
+        allow_abbrev=False,
+    )
+    parser.add_argument(
+        '--builds',
+        type=str,
+        nargs='+',
+        required=True,
+        help='Build directories or installation prefixes in order, from the'
+        ' known good to the known bad build.',
+    )
+    parser.add_argument(
+        '--benchmark', type=str, required=True, help='Benchmark class name.'
+    )
+    parser.add_argument(
+        '--device', type=str, choices=['CPU', 'GPU'], required=True, help='Device.'
+    )
+    parser.add_argument(
+        '--python',
+        type=str,
+        default=sys.executable,
+        help='Python interpreter.',
+    )
+    parser.add_argument(
+        '--journal_directory',
+        type=str,
+        default='bisect',
+        help='Directory for the journal of each build.',
+    )
+    parser.add_argument(
+        '--evidence',
+        type=str,
+        default=None,
+        help='Append the evidence of each step to this JSON Lines file.',
+    )
+    parser.add_argument(
+        '--statistic',
+        type=str,
+        choices=list(stats.STATISTICS.keys()),
+        default=stats.DEFAULT_STATISTIC,
+        help='Statistic of the samples to compare (also passed to the suite).',
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=DEFAULT_REPEAT,
+        help='Minimum number of samples to measure in each build.',
+    )
+    parser.add_argument(
+        '--alpha',
+        type=float,
+        default=compare.DEFAULT_ALPHA,
+        help='Significance level of the Mann-Whitney U test.',
+    )
+    parser.add_argument(
+        '--min_effect',
+        type=float,
+        default=compare.DEFAULT_MIN_EFFECT,
+        help='Minimum relative change that counts as a regression.',
+    )
+    args, suite_args = parser.parse_known_args()
+
+    names = [os.path.basename(os.path.normpath(path)) for path in args.builds]
+    if len(set(names)) != len(names):
+        names = [os.path.normpath(path) for path in args.builds]
+
+    environments = []
+    for name, path in zip(names, args.builds):
+        pythonpath = versions.resolve_pythonpath(path)
+        if pythonpath is None:
+            parser.error(f'No hoomd package found in {path}')
+        environments.append(versions.Environment(name, args.python, pythonpath))
+
+    try:
+        bisection = Bisection(
+            environments,
+            args.benchmark,
+            args.device,
+            ['--statistic', args.statistic, *suite_args],
+            args.journal_directory,
+            evidence=args.evidence,
+            repeat=args.repeat,
+            statistic=args.statistic,
+            alpha=args.alpha,
+            min_effect=args.min_effect,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    try:
+        first_bad = bisection.run()
+    except BisectError as error:
+        print(f'Bisection failed: {error}')
+        sys.exit(1)
+
+    print(
+        f'First slow build: {first_bad.name} ({first_bad.pythonpath}) after '
+        f'{bisection.measurements} measurements.'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Checkpoints of benchmark simulations after warmup.
+
+Each checkpoint is an entry in the initial configuration cache (see
+`configuration.cache`) keyed by the benchmark class, the benchmark parameters,
+the execution device, and the HOOMD-blue version. The GSD file stores the
+simulation state after warmup. A JSON sidecar file next to it stores the tuned
+parameters that are not part of the state: HPMC move sizes, neighbor list
+buffer settings, and GPU kernel parameters.
+"""
+
+import json
+import os
+
+import hoomd
+
+from .configuration import cache
+
+# Increment when the checkpoint contents change.
+CHECKPOINT_VERSION = 1
+
+
+def sidecar_path(file_path):
+    """pathlib.Path: The path to the JSON sidecar of a checkpoint."""
+    return file_path.with_suffix('.json')
+
+
+def checkpoint_parameters(benchmark_class, arguments, device):
+    """Get the parameters that identify a checkpoint.
+
+    Args:
+        benchmark_class (type): The benchmark class.
+        arguments (dict): Benchmark parameters that affect the state after
+          warmup.
+        device (hoomd.device.Device): Device object to execute on.
+
+    Returns:
+        dict: The checkpoint parameters.
+    """
+    return dict(
+        benchmark=benchmark_class.__name__,
+        arguments=arguments,
+        device=type(device).__name__,
+        num_ranks=device.communicator.num_ranks,
+        hoomd_version=hoomd.version.version,
+    )
+
+
+def find_checkpoint(parameters):
+    """Find a checkpoint in the cache.
+
+    Args:
+        parameters (dict): The checkpoint parameters (see
+          `checkpoint_parameters`).
+
+    Returns:
+        tuple[pathlib.Path, dict]: The path to the GSD file and the tuned
+        parameters, or None when there is no checkpoint.
+    """
+    file_path = cache.get_cache_dir() / cache.entry_filename(
+        'checkpoint', CHECKPOINT_VERSION, parameters
+    )
+    if not file_path.exists() or not sidecar_path(file_path).exists():
+        return None
+
+    with open(sidecar_path(file_path)) as f:
+        return file_path, json.load(f)
+
+
+def save_checkpoint(sim, parameters, device, verbose):
+    """Save the simulation state and tuned parameters to the cache.
+
+    Args:
+        sim (hoomd.Simulation): Simulation to save.
+        parameters (dict): The checkpoint parameters (see
+          `checkpoint_parameters`).
+        device (hoomd.device.Device): Device object to execute on.
+        verbose (bool): Set to True to provide details to stdout.
+
+    Returns:
+        pathlib.Path: Path to the GSD file.
+    """
+    tuning = get_tuning(sim)
+
+    def write(file_path):
+        hoomd.write.GSD.write(state=sim.state, mode='xb', filename=str(file_path))
+
+    file_path = cache.get_entry(
+        'checkpoint', CHECKPOINT_VERSION, parameters, device, verbose, write
+    )
+
+    if device.communicator.rank == 0:
+        tmp_path = sidecar_path(file_path).with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(tuning, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, sidecar_path(file_path))
+    device.communicator.barrier()
+
+    return file_path
+
+
+def _tunable_objects(sim):
+    """Get the operations that may have tuned parameters, keyed by a path."""
+    objects = {}
+
+    integrator = sim.operations.integrator
+    if integrator is not None:
+        objects['integrator'] = integrator
+        for name in ('forces', 'methods', 'constraints'):
+            for i, operation in enumerate(getattr(integrator, name, [])):
+                objects[f'integrator.{name}.{i}'] = operation
+                nlist = getattr(operation, 'nlist', None)
+                if nlist is not None:
+                    objects[f'integrator.{name}.{i}.nlist'] = nlist
+
+    for name in ('updaters', 'writers', 'computes'):
+        for i, operation in enumerate(getattr(sim.operations, name)):
+            objects[f'{name}.{i}'] = operation
+
+    return objects
+
+
+def get_tuning(sim):
+    """Get the tuned parameters of the simulation's operations.
+
+    Args:
+        sim (hoomd.Simulation): Simulation to inspect.
+
+    Returns:
+        dict: The tuned parameters of each operation.
+    """
+    tuning = {}
+    particle_types = sim.state.particle_types
+
+    for path, operation in _tunable_objects(sim).items():
+        parameters = {}
+
+        if isinstance(operation, hoomd.hpmc.integrate.HPMCIntegrator):
+            parameters['d'] = {t: float(operation.d[t]) for t in particle_types}
+            parameters['a'] = {t: float(operation.a[t]) for t in particle_types}
+
+        if isinstance(operation, hoomd.md.nlist.NeighborList):
+            parameters['buffer'] = float(operation.buffer)
+            parameters['rebuild_check_delay'] = int(operation.rebuild_check_delay)
+
+        kernel_parameters = getattr(operation, 'kernel_parameters', None)
+        if kernel_parameters:
+            parameters['kernel_parameters'] = {
+                key: list(value) for key, value in kernel_parameters.items()
+            }
+
+        if parameters:
+            tuning[path] = parameters
+
+    return tuning
+
+
+def set_tuning(sim, tuning):
+    """Set the tuned parameters of the simulation's operations.
+
+    Args:
+        sim (hoomd.Simulation): Simulation to modify. The operations must be
+          attached (call ``sim.run(0)`` first) to set GPU kernel parameters.
+        tuning (dict): Tuned parameters from `get_tuning`.
+    """
+    objects = _tunable_objects(sim)
+
+    for path, parameters in tuning.items():
+        operation = objects[path]
+
+        for name in ('d', 'a'):
+            if name in parameters:
+                for particle_type, value in parameters[name].items():
+                    getattr(operation, name)[particle_type] = value
+
+        for name in ('buffer', 'rebuild_check_delay'):
+            if name in parameters:
+                setattr(operation, name, parameters[name])
+
+        if 'kernel_parameters' in parameters:
+            operation.kernel_parameters = {
+                key: tuple(value)
+                for key, value in parameters['kernel_parameters'].items()
+            }
@@ -4,24 +4,112 @@
 """Common code used in all benchmarks."""
 
 import argparse
+import math
+import time
+import warnings
 
 import hoomd
 import numpy
 
+from . import (
+    checkpoint,
+    decomposition,
+    energy,
+    latency,
+    mpi,
+    resources,
+    results,
+    stats,
+)
+from .configuration import (
+    CONFIGURATIONS,
+    DEFAULT_CONFIGURATION,
+    make_configuration,
+)
+from .configuration.replicate import DEFAULT_JITTER
+from .configuration.snapshot_cache import snapshot_cache
+
 DEFAULT_WARMUP_STEPS = 1000
 DEFAULT_BENCHMARK_STEPS = 1000
 DEFAULT_REPEAT = 1
 DEFAULT_N = 64000
 DEFAULT_RHO = 1.0
 DEFAULT_DIMENSIONS = 3
+DEFAULT_TARGET_CI = 0.02
+DEFAULT_MAX_TIME = 600
+DEFAULT_MAX_REPEAT = 100
+MIN_ADAPTIVE_REPEAT = 3
+DEFAULT_CHUNK_STEPS = 100
+DEFAULT_MIN_STEPS = 10
+DEFAULT_MAX_STEPS = 10_000_000
+# Grow the calibration probe until it takes at least this fraction of target_time.
+MIN_PROBE_FRACTION = 0.1
+WARMUP_MODES = ['fixed', 'steady']
+DEFAULT_WARMUP_CHUNK_STEPS = 100
+DEFAULT_WARMUP_WINDOW = 10
+DEFAULT_MAX_WARMUP_STEPS = 100_000
+
+# Parameters that only affect the measurement after warmup.
+MEASUREMENT_PARAMETERS = {
+    'device',
+    'benchmark_steps',
+    'repeat',
+    'verbose',
+    'adaptive',
+    'target_ci',
+    'max_time',
+    'max_repeat',
+    'statistic',
+    'confidence',
+    'warmup_checkpoint',
+    'target_time',
+    'min_steps',
+    'max_steps',
+    'latency',
+    'latency_period',
+    'latency_output',
+    'resources',
+    'resource_interval',
+    'energy',
+}
+
+
+def configuration_parameters(arguments, n_types=1):
+    """Get the initial configuration parameters from benchmark arguments.
+
+    Args:
+        arguments (dict): Benchmark keyword arguments (or attributes).
+        n_types (int): Number of particle types.
+
+    Returns:
+        dict: Keyword arguments for `configuration.make_configuration`
+        (excluding ``device`` and ``verbose``).
+    """
+    return dict(
+        configuration=arguments.get('configuration', DEFAULT_CONFIGURATION),
+        N=arguments.get('N', DEFAULT_N),
+        rho=arguments.get('rho', DEFAULT_RHO),
+        dimensions=arguments.get('dimensions', DEFAULT_DIMENSIONS),
+        n_types=n_types,
+        randomize_steps=arguments.get('randomize_steps', 0),
+        replicate=arguments.get('replicate', 1),
+        jitter=arguments.get('jitter'),
+        relax_steps=arguments.get('relax_steps', 0),
+    )
 
 
-def make_hoomd_device(args):
-    """Initialize a HOOMD device given the parse arguments."""
+def make_hoomd_device(args, communicator=None):
+    """Initialize a HOOMD device given the parse arguments.
+
+    Args:
+        args: Parsed arguments with ``device`` and ``verbose``.
+        communicator (hoomd.communicator.Communicator): MPI communicator of
+          the device (defaults to one partition with all ranks).
+    """
     if args.device == 'CPU':
-        device = hoomd.device.CPU()
+        device = hoomd.device.CPU(communicator=communicator)
     elif args.device == 'GPU':
-        device = hoomd.device.GPU()
+        device = hoomd.device.GPU(communicator=communicator)
     else:
         raise ValueError(f'Invalid device {args.device}.')
 
@@ -44,17 +132,110 @@ class Benchmark:
         dimensions (int): The number of dimensions (2 or 3).
 
         warmup_steps (int): Number of time steps to execute before timing
-          starts.
+          starts (fixed warmup mode), and the number of time steps in each
+          round of GPU autotuning.
 
         benchmark_steps (int): Number of time steps to execute for each
           repetition of the benchmark.
 
         repeat (int): Number of times to repeat the run of benchmark steps.
+          In adaptive mode, this is the minimum number of repetitions.
 
         verbose (bool): Set to True to see detailed output.
 
+        adaptive (bool): Set to True to repeat the run of benchmark steps until
+          the confidence interval of the performance is narrower than
+          ``target_ci``, or ``max_time`` or ``max_repeat`` is reached.
+
+        target_ci (float): Target width of the confidence interval relative to
+          the reported statistic (adaptive mode only).
+
+        max_time (float): Maximum time to spend in benchmark repetitions in
+          seconds (adaptive mode only).
+
+        max_repeat (int): Maximum number of repetitions (adaptive mode only).
+
+        statistic (str): Statistic to report in adaptive mode: ``'mean'`` or
+          ``'median'``.
+
+        confidence (float): Confidence level of the confidence interval.
+
+        configuration (str): Name of the initial configuration generator (see
+          `configuration.make_configuration`).
+
+        randomize_steps (int): Number of Monte Carlo steps to randomize lattice
+          initial configurations.
+
+        replicate (int): Build the initial configuration by replicating a
+          configuration with ``N / replicate**dimensions`` particles
+          ``replicate`` times along each box edge.
+
+        jitter (float): Maximum translation move size when relaxing replicated
+          initial configurations (defaults to ``DEFAULT_JITTER``). Only valid
+          with ``relax_steps``.
+
+        relax_steps (int): Number of Monte Carlo steps to relax replicated
+          initial configurations.
+
+        warmup_checkpoint (bool): Set to True to save the simulation state and
+          tuned parameters after warmup, and to start from a saved checkpoint
+          (skipping warmup) when one exists for the same benchmark, parameters,
+          device, and HOOMD-blue version. See `checkpoint`.
+
+        target_time (float): When set, ignore ``benchmark_steps`` and choose
+          the number of steps so that each repetition takes approximately
+          ``target_time`` seconds (see `calibrate_steps`).
+
+        min_steps (int): Minimum number of steps in each repetition when
+          ``target_time`` is set.
+
+        max_steps (int): Maximum number of steps in each repetition when
+          ``target_time`` is set.
+
+        warmup_mode (str): ``'fixed'`` to run ``warmup_steps`` steps before
+          timing. ``'steady'`` to run chunks of ``warmup_chunk_steps`` steps
+          until the observables (see `warmup_observables`) of the last
+          ``warmup_window`` chunks are stationary (see `stats.is_stationary`)
+          or ``max_warmup_steps`` is reached.
+
+        warmup_chunk_steps (int): Number of steps in each warmup chunk (steady
+          warmup mode).
+
+        warmup_window (int): Number of chunks in the stationarity test (steady
+          warmup mode). Must be at least ``stats.MIN_STATIONARITY_SAMPLES``.
+
+        max_warmup_steps (int): Maximum number of warmup steps (steady warmup
+          mode). Must allow at least ``warmup_window`` chunks.
+
+        latency (bool): Set to True to record the wall time of individual
+          steps during the benchmark repetitions with a
+          `latency.LatencyRecorder`.
+
+        latency_period (int): Record the wall time every ``latency_period``
+          steps.
+
+        latency_output (str): Name of a ``.npy`` file to save the latency
+          series to (rank 0 only).
+
+        resources (bool): Set to True to sample the resource usage of the
+          process in a background thread with a `resources.ResourceSampler`.
+
+        resource_interval (float): Time between resource samples in seconds.
+
+        energy (bool): Set to True to measure the energy consumed in each
+          repetition with the RAPL counters.
+
+        energy_reader (energy.RaplReader): Reader for the energy counters
+          (defaults to ``energy.RaplReader()``).
+
+        domain_decomposition (list): MPI domain decomposition: the number of
+          domains or the split fractions along x, y, and z (see
+          `decomposition.parse_domain_decomposition`). Leave None to let
+          HOOMD-blue choose.
+
     Derived classes must initialize a Simulation object in ``make_simulation``
-    and return it. Derived classes may also override the default
+    and return it. Use `create_state` to initialize the simulation state from
+    the chosen initial configuration. Derived classes may also override the default
     `get_performance`, `units`, `make_argument_parser`, and `run`.
 
     Note:
@@ -66,9 +247,27 @@ class Benchmark:
 
         units (str): Name of the units to report on the performance (only
           shown when verbose=True.
+
+        summary (dict): Summary statistics of the performance measured in the
+          last call to `execute` (see `stats.summarize`). ``summary['value']``
+          (and the confidence interval) is the mean of all samples in fixed
+          mode and ``statistic`` of the samples (excluding outliers) in
+          adaptive mode.
+          ``summary['benchmark_steps']`` is the number of steps in each
+          repetition and ``summary['warmup_steps']`` is the number of warmup
+          steps executed (including GPU autotuning). When ``latency`` is
+          True, ``summary['latency']`` summarizes the step latency (see
+          `latency.LatencyRecorder.summarize`). When ``resources`` is True,
+          ``summary['resources']`` lists the resource usage of each repetition
+          (see `resources.ResourceSampler.summarize`). When ``energy`` is
+          True, ``summary['energy']`` reports the energy to solution (see
+          `energy.summarize`). When ``domain_decomposition`` is set,
+          ``summary['decomposition']`` reports the local and ghost particles
+          on each rank (see `decomposition.summarize`).
     """
 
     SUITE_STEP_SCALE = 1
+    SUPPORTS_WARMUP_CHECKPOINT = True
 
     def __init__(
         self,
@@ -80,6 +279,33 @@ class Benchmark:
         benchmark_steps=DEFAULT_BENCHMARK_STEPS,
         repeat=DEFAULT_REPEAT,
         verbose=False,
+        adaptive=False,
+        target_ci=DEFAULT_TARGET_CI,
+        max_time=DEFAULT_MAX_TIME,
+        max_repeat=DEFAULT_MAX_REPEAT,
+        statistic=stats.DEFAULT_STATISTIC,
+        confidence=stats.DEFAULT_CONFIDENCE,
+        configuration=DEFAULT_CONFIGURATION,
+        randomize_steps=0,
+        replicate=1,
+        jitter=None,
+        relax_steps=0,
+        warmup_checkpoint=False,
+        target_time=None,
+        min_steps=DEFAULT_MIN_STEPS,
+        max_steps=DEFAULT_MAX_STEPS,
+        warmup_mode='fixed',
+        warmup_chunk_steps=DEFAULT_WARMUP_CHUNK_STEPS,
+        warmup_window=DEFAULT_WARMUP_WINDOW,
+        max_warmup_steps=DEFAULT_MAX_WARMUP_STEPS,
+        latency=False,
+        latency_period=1,
+        latency_output=None,
+        resources=False,
+        resource_interval=resources.DEFAULT_INTERVAL,
+        energy=False,
+        energy_reader=None,
+        domain_decomposition=None,
     ):
         self.device = device
         self.N = N
@@ -89,13 +315,178 @@ class Benchmark:
         self.benchmark_steps = benchmark_steps
         self.repeat = repeat
         self.verbose = verbose
+        self.adaptive = adaptive
+        self.target_ci = target_ci
+        self.max_time = max_time
+        self.max_repeat = max_repeat
+        self.statistic = statistic
+        self.confidence = confidence
+        self.configuration = configuration
+        self.randomize_steps = randomize_steps
+        self.replicate = replicate
+        self.jitter = jitter
+        self.relax_steps = relax_steps
+        if jitter is not None and relax_steps == 0:
+            raise ValueError('jitter requires relax_steps > 0.')
+        self.warmup_checkpoint = warmup_checkpoint
+        self.target_time = target_time
+        self.min_steps = min_steps
+        self.max_steps = max_steps
+        self.warmup_mode = warmup_mode
+        self.warmup_chunk_steps = warmup_chunk_steps
+        self.warmup_window = warmup_window
+        self.max_warmup_steps = max_warmup_steps
+        if warmup_mode == 'steady':
+            if warmup_window < stats.MIN_STATIONARITY_SAMPLES:
+                raise ValueError(
+                    f'warmup_window must be at least '
+                    f'{stats.MIN_STATIONARITY_SAMPLES}.'
+                )
+            if max_warmup_steps < warmup_window * warmup_chunk_steps:
+                raise ValueError(
+                    f'max_warmup_steps ({max_warmup_steps}) must allow '
+                    f'warmup_window ({warmup_window}) chunks of '
+                    f'warmup_chunk_steps ({warmup_chunk_steps}) steps.'
+                )
+        self.latency = latency
+        self.latency_period = latency_period
+        self.latency_output = latency_output
+        self.latency_recorder = None
+        self.resources = resources
+        self.resource_interval = resource_interval
+        self.resource_sampler = None
+        self.energy = energy
+        self.energy_reader = energy_reader
+        self._energy_repetitions = None
+        self.domain_decomposition = decomposition.parse_domain_decomposition(
+            domain_decomposition
+        )
         self.units = 'time steps per second'
+        self.summary = None
+
+        self._checkpoint_parameters = None
+        self._checkpoint = None
+        if warmup_checkpoint and self.SUPPORTS_WARMUP_CHECKPOINT:
+            self._checkpoint_parameters = checkpoint.checkpoint_parameters(
+                type(self), self.warmup_parameters(), device
+            )
+            self._checkpoint = checkpoint.find_checkpoint(self._checkpoint_parameters)
+
         self.sim = self.make_simulation()
 
     def make_simulation(self):
         """Override this method to initialize the simulation."""
         pass
 
+    def create_state(self, sim, n_types=1):
+        """Initialize the simulation state from the initial configuration.
+
+        Args:
+            sim (hoomd.Simulation): Simulation to initialize.
+            n_types (int): Number of particle types.
+
+        Make the initial configuration matching the benchmark parameters, or
+        find it in the cache. Simulations after the first that use the same
+        configuration in this process initialize from a snapshot in
+        `configuration.snapshot_cache.snapshot_cache`.
+
+        When there is a warmup checkpoint for this benchmark, initialize the
+        state from the checkpoint instead.
+        """
+        if self._checkpoint is not None:
+            path, _ = self._checkpoint
+            if self.verbose and self.device.communicator.rank == 0:
+                print(f'Using warmup checkpoint {path}')
+
+            sim.create_state_from_gsd(
+                filename=str(path),
+                domain_decomposition=decomposition.to_hoomd(self.domain_decomposition),
+            )
+            return
+
+        parameters = configuration_parameters(vars(self), n_types)
+
+        # Snapshots hold data only on rank 0 of the communicator, so a snapshot
+        # is only valid for the same rank in the same partition layout.
+        communicator = self.device.communicator
+        key = (
+            *sorted(parameters.items()),
+            (
+                'communicator',
+                communicator.num_ranks,
+                communicator.num_partitions,
+                communicator.partition,
+                communicator.rank == 0,
+            ),
+        )
+
+        cached = snapshot_cache.get(key)
+        if cached is not None:
+            if self.verbose and self.device.communicator.rank == 0:
+                print('Using cached initial configuration snapshot')
+
+            snapshot, timestep = cached
+            sim.timestep = timestep
+            sim.create_state_from_snapshot(
+                snapshot,
+                domain_decomposition=decomposition.to_hoomd(self.domain_decomposition),
+            )
+            return
+
+        path = make_configuration(
+            device=self.device, verbose=self.verbose, **parameters
+        )
+        sim.create_state_from_gsd(
+            filename=str(path),
+            domain_decomposition=decomposition.to_hoomd(self.domain_decomposition),
+        )
+
+        if snapshot_cache.max_bytes > 0:
+            snapshot_cache.put(key, (sim.state.get_snapshot(), sim.timestep), N=self.N)
+
+    @classmethod
+    def required_configurations(cls, arguments):
+        """Get the initial configurations that the benchmark will request.
+
+        Args:
+            arguments (dict): Keyword arguments that will be passed to the
+              constructor.
+
+        Derived classes that call `create_state` with other arguments must
+        override this method to match.
+
+        Returns:
+            list[dict]: Parameters of each initial configuration (see
+            `configuration_parameters`).
+        """
+        return [configuration_parameters(arguments)]
+
+    def arguments(self):
+        """Get the benchmark arguments.
+
+        Returns:
+            dict: The value of every command line option except ``device``.
+        """
+        defaults = vars(self.make_argument_parser().parse_args(['--device', 'CPU']))
+        return {
+            name: getattr(self, name)
+            for name in sorted(defaults.keys())
+            if name != 'device'
+        }
+
+    def warmup_parameters(self):
+        """Get the parameters that affect the simulation state after warmup.
+
+        Returns:
+            dict: The value of every command line option except those in
+            `MEASUREMENT_PARAMETERS`.
+        """
+        return {
+            name: value
+            for name, value in self.arguments().items()
+            if name not in MEASUREMENT_PARAMETERS
+        }
+
     def get_performance(self):
         """Get the performance of the benchmark during the last ``run``."""
         return self.sim.tps
@@ -118,9 +509,21 @@ class Benchmark:
         if print_verbose_messages:
             print(f'Running {type(self).__name__} benchmark')
 
-        if print_verbose_messages:
-            print(f'.. warming up for {self.warmup_steps} steps')
-        self.run(self.warmup_steps)
+        warmup_steps = 0
+        if self._checkpoint is not None:
+            _, tuning = self._checkpoint
+            if print_verbose_messages:
+                print('.. skipping warmup, restoring tuned parameters')
+            checkpoint.set_tuning(self.sim, tuning)
+        elif self.warmup_mode == 'steady':
+            warmup_steps += self._warmup_steady(print_verbose_messages)
+        elif self.warmup_mode == 'fixed':
+            if print_verbose_messages:
+                print(f'.. warming up for {self.warmup_steps} steps')
+            self.run(self.warmup_steps)
+            warmup_steps += self.warmup_steps
+        else:
+            raise ValueError(f'Invalid warmup mode {self.warmup_mode}.')
 
         if isinstance(self.device, hoomd.device.GPU) and hasattr(
             self.sim.operations, 'is_tuning_complete'
@@ -132,30 +535,309 @@ class Benchmark:
                         f'{self.warmup_steps} steps'
                     )
                 self.run(self.warmup_steps)
+                warmup_steps += self.warmup_steps
+
+        if self._checkpoint_parameters is not None and self._checkpoint is None:
+            checkpoint.save_checkpoint(
+                self.sim, self._checkpoint_parameters, self.device, self.verbose
+            )
+
+        if self.target_time is not None:
+            self.benchmark_steps = self.calibrate_steps(print_verbose_messages)
 
         if print_verbose_messages:
-            print(
-                f'.. running for {self.benchmark_steps} steps ' f'{self.repeat} time(s)'
+            if self.adaptive:
+                print(
+                    f'.. running for {self.benchmark_steps} steps until the '
+                    f'{self.statistic} converges'
+                )
+            else:
+                print(
+                    f'.. running for {self.benchmark_steps} steps '
+                    f'{self.repeat} time(s)'
+                )
+
+        if self.latency:
+            self.latency_recorder = latency.LatencyRecorder(
+                self._recorded_simulation(), period=self.latency_period
             )
+            self.latency_recorder.attach()
 
-        # benchmark
-        performance = []
+        if self.resources:
+            self.resource_sampler = resources.ResourceSampler(self.resource_interval)
+            self.resource_sampler.start()
+
+        self._energy_repetitions = None
+        if self.energy:
+            if self.energy_reader is None:
+                self.energy_reader = energy.RaplReader()
 
+            if self.energy_reader.available:
+                self._energy_repetitions = []
+            else:
+                warnings.warn(
+                    'Skipping the energy measurement - the RAPL counters are '
+                    'not readable.',
+                    stacklevel=2,
+                )
+
+        # benchmark
         if isinstance(self.device, hoomd.device.GPU):
             with self.device.enable_profiling():
-                for _i in range(self.repeat):
-                    self.run(self.benchmark_steps)
-                    performance.append(self.get_performance())
-                    if print_verbose_messages:
-                        print(f'.. {performance[-1]} {self.units}')
+                performance = self._measure(print_verbose_messages)
         else:
+            performance = self._measure(print_verbose_messages)
+
+        self.summary = self.summarize(performance)
+        self.summary['benchmark_steps'] = self.benchmark_steps
+        self.summary['warmup_steps'] = warmup_steps
+
+        if self.domain_decomposition is not None:
+            self.summary['decomposition'] = decomposition.summarize(
+                self._recorded_simulation()
+            )
+
+        if self.resource_sampler is not None:
+            self.resource_sampler.stop()
+            self.summary['resources'] = self.resource_sampler.summarize(self.N)
+
+            if print_verbose_messages:
+                for usage in self.summary['resources']:
+                    print(
+                        f'.. peak RSS {usage["peak_rss_per_particle"]:.4g} bytes per '
+                        f'particle, CPU utilization {usage["cpu_utilization"]:.3g}, '
+                        f'mean frequency {usage["mean_frequency"] / 1e9:.3g} GHz'
+                        + (', throttled' if usage['throttled'] else '')
+                    )
+
+        if self._energy_repetitions is not None:
+            self.summary['energy'] = energy.summarize(self._energy_repetitions, self.N)
+
+            if print_verbose_messages:
+                energy_summary = self.summary['energy']
+                print(
+                    f'.. {energy_summary["joules_per_particle_step"]:.4g} J per '
+                    f'particle step, {energy_summary["power"]:.4g} W, '
+                    f'{energy_summary["tps_per_watt"]:.4g} time steps per second '
+                    'per watt'
+                )
+
+        if self.latency_recorder is not None:
+            self.latency_recorder.detach()
+            self.summary['latency'] = self.latency_recorder.summarize()
+
+            if print_verbose_messages:
+                latency_summary = self.summary['latency']
+                print(
+                    f'.. step latency p50 {latency_summary["p50"]:.4g} s, '
+                    f'p90 {latency_summary["p90"]:.4g} s, '
+                    f'p99 {latency_summary["p99"]:.4g} s, '
+                    f'max {latency_summary["max"]:.4g} s'
+                )
+
+            if self.latency_output is not None and self.device.communicator.rank == 0:
+                self.latency_recorder.save(self.latency_output)
+
+        if print_verbose_messages and len(performance) > 1:
+            summary = self.summary
+            print(
+                f'.. {summary["statistic"]} {summary["value"]} {self.units}, '
+                f'{summary["confidence"]:.0%} CI [{summary["ci_low"]}, '
+                f'{summary["ci_high"]}], CV {summary["cv"]:.2%}'
+            )
+            if len(summary['outliers']) > 0:
+                print(f'.. rejected outliers: {summary["outliers"]}')
+
+        return performance
+
+    def warmup_observables(self):
+        """Get the observables tested for stationarity in steady warmup mode.
+
+        Derived classes may override this method to add observables. It is
+        called after each warmup chunk.
+
+        Returns:
+            dict[str, float]: The observables measured in the last ``run``.
+        """
+        return dict(performance=self.get_performance())
+
+    def _warmup_steady(self, print_verbose_messages):
+        """Run warmup chunks until the observables are stationary.
+
+        Returns:
+            int: The number of warmup steps executed.
+        """
+        if print_verbose_messages:
+            print(
+                f'.. warming up in chunks of {self.warmup_chunk_steps} steps until '
+                'steady'
+            )
+
+        history = {}
+        chunks = 0
+        steps = 0
+        while True:
+            self.run(self.warmup_chunk_steps)
+            chunks += 1
+            steps += self.warmup_chunk_steps
+            for name, value in self.warmup_observables().items():
+                history.setdefault(name, []).append(value)
+
+            steady = chunks >= self.warmup_window and all(
+                stats.is_stationary(values[-self.warmup_window :])
+                for values in history.values()
+            )
+            done = steady or steps >= self.max_warmup_steps
+
+            # Ranks may measure slightly different times, use the decision
+            # from rank 0 on all ranks.
+            if mpi.broadcast(self.device.communicator, done):
+                break
+
+        if print_verbose_messages:
+            if steady:
+                print(f'.. reached a steady state after {steps} warmup steps')
+            else:
+                print(f'.. did not reach a steady state in {steps} warmup steps')
+
+        return steps
+
+    def calibrate_steps(self, print_verbose_messages):
+        """Choose the number of steps that runs for ``target_time`` seconds.
+
+        Run a probe starting at ``min_steps`` steps and grow it by a factor of
+        10 until it takes at least `MIN_PROBE_FRACTION` of ``target_time``.
+        Extrapolate from the last probe and clamp the result to
+        [``min_steps``, ``max_steps``].
+
+        Returns:
+            int: The number of steps (the same on all ranks).
+        """
+        steps = self.min_steps
+        while True:
+            start_time = time.perf_counter()
+            self.run(steps)
+            elapsed = time.perf_counter() - start_time
+
+            done = (
+                elapsed >= self.target_time * MIN_PROBE_FRACTION
+                or steps >= self.max_steps
+            )
+
+            # Ranks may measure slightly different times, use the decision
+            # from rank 0 on all ranks.
+            if mpi.broadcast(self.device.communicator, done):
+                break
+            steps = min(steps * 10, self.max_steps)
+
+        steps = round(steps * self.target_time / max(elapsed, 1e-9))
+        steps = min(max(steps, self.min_steps), self.max_steps)
+        steps = int(mpi.broadcast(self.device.communicator, steps))
+
+        if print_verbose_messages:
+            print(
+                f'.. calibrated to {steps} steps per repetition '
+                f'(probe: {elapsed:.3g} s)'
+            )
+
+        return steps
+
+    def _recorded_simulation(self):
+        """Get the simulation whose performance is measured."""
+        return self.sim
+
+    def _executed_steps(self, steps):
+        """Get the total number of time steps that ``run(steps)`` executes."""
+        return steps
+
+    def _new_latency_segment(self):
+        """Exclude the time before the next run from the recorded latencies."""
+        if self.latency_recorder is not None:
+            self.latency_recorder.new_segment()
+
+    def _run_repetition(self):
+        """Run one repetition of the benchmark steps and get the performance."""
+        self._new_latency_segment()
+        if self.resource_sampler is not None:
+            self.resource_sampler.begin_repetition()
+        if self._energy_repetitions is not None:
+            start_energy = self.energy_reader.read()
+            start_time = time.perf_counter()
+
+        self.run(self.benchmark_steps)
+
+        if self._energy_repetitions is not None:
+            elapsed = time.perf_counter() - start_time
+            joules = self.energy_reader.energy(start_energy, self.energy_reader.read())
+            self._energy_repetitions.append(
+                (joules, elapsed, self._executed_steps(self.benchmark_steps))
+            )
+        if self.resource_sampler is not None:
+            self.resource_sampler.end_repetition()
+        return self.get_performance()
+
+    def _measure(self, print_verbose_messages):
+        """Run the benchmark repetitions and return the measured performance."""
+        performance = []
+
+        if not self.adaptive:
             for _i in range(self.repeat):
-                self.run(self.benchmark_steps)
-                performance.append(self.get_performance())
+                performance.append(self._run_repetition())
                 if print_verbose_messages:
                     print(f'.. {performance[-1]} {self.units}')
 
-        return performance
+            return performance
+
+        start_time = time.perf_counter()
+        min_repeat = max(self.repeat, MIN_ADAPTIVE_REPEAT)
+        while True:
+            performance.append(self._run_repetition())
+            if print_verbose_messages:
+                print(f'.. {performance[-1]} {self.units}')
+
+            if len(performance) < min_repeat:
+                continue
+
+            summary = self.summarize(performance)
+            done = (
+                summary['relative_ci_width'] <= self.target_ci
+                or time.perf_counter() - start_time >= self.max_time
+                or len(performance) >= self.max_repeat
+            )
+
+            # Ranks may measure slightly different times, use the decision
+            # from rank 0 on all ranks.
+            if mpi.broadcast(self.device.communicator, done):
+                if print_verbose_messages:
+                    print(
+                        f'.. stopped after {len(performance)} repetitions with '
+                        f'relative CI width {summary["relative_ci_width"]:.2%}'
+                    )
+                return performance
+
+    def summarize(self, performance):
+        """Summarize the performance samples.
+
+        Args:
+            performance (list[float]): The performance measured at each
+              benchmark stage.
+
+        In fixed mode, the summary describes the mean of all samples (without
+        rejecting outliers). In adaptive mode, it describes ``statistic``.
+
+        Returns:
+            dict: Summary statistics (see `stats.summarize`).
+        """
+        if not self.adaptive:
+            return stats.summarize(
+                performance, 'mean', self.confidence, outlier_threshold=math.inf
+            )
+
+        return stats.summarize(performance, self.statistic, self.confidence)
+
+    def format_performance(self):
+        """Format the summarized performance of the last `execute` for output."""
+        return f'{self.summary["value"]}'
 
     @staticmethod
     def make_argument_parser():
@@ -202,6 +884,165 @@ class Benchmark:
         parser.add_argument(
             '-v', '--verbose', action='store_true', help='Verbose output.'
         )
+        parser.add_argument(
+            '--adaptive',
+            action='store_true',
+            help='Repeat the run until the confidence interval converges.',
+        )
+        parser.add_argument(
+            '--target_ci',
+            type=float,
+            default=DEFAULT_TARGET_CI,
+            help='Target relative width of the confidence interval (adaptive).',
+        )
+        parser.add_argument(
+            '--max_time',
+            type=float,
+            default=DEFAULT_MAX_TIME,
+            help='Maximum time to spend repeating the run in seconds (adaptive).',
+        )
+        parser.add_argument(
+            '--max_repeat',
+            type=int,
+            default=DEFAULT_MAX_REPEAT,
+            help='Maximum number of times to repeat the run (adaptive).',
+        )
+        parser.add_argument(
+            '--statistic',
+            type=str,
+            choices=list(stats.STATISTICS.keys()),
+            default=stats.DEFAULT_STATISTIC,
+            help='Statistic to report (adaptive).',
+        )
+        parser.add_argument(
+            '--confidence',
+            type=float,
+            default=stats.DEFAULT_CONFIDENCE,
+            help='Confidence level of the confidence interval.',
+        )
+        parser.add_argument(
+            '--configuration',
+            type=str,
+            choices=CONFIGURATIONS,
+            default=DEFAULT_CONFIGURATION,
+            help='Initial configuration generator.',
+        )
+        parser.add_argument(
+            '--randomize_steps',
+            type=int,
+            default=0,
+            help='Number of steps to randomize lattice initial configurations.',
+        )
+        parser.add_argument(
+            '--replicate',
+            type=int,
+            default=1,
+            help='Replicate a smaller initial configuration along each box edge.',
+        )
+        parser.add_argument(
+            '--jitter',
+            type=float,
+            default=None,
+            help='Maximum move size when relaxing replicated configurations'
+            f' (default: {DEFAULT_JITTER}, requires --relax_steps).',
+        )
+        parser.add_argument(
+            '--relax_steps',
+            type=int,
+            default=0,
+            help='Number of steps to relax replicated configurations.',
+        )
+        parser.add_argument(
+            '--warmup_checkpoint',
+            action='store_true',
+            help='Save the state after warmup and start from it in later runs.',
+        )
+        parser.add_argument(
+            '--target_time',
+            type=float,
+            default=None,
+            help='Choose the number of benchmark steps so that each repetition '
+            'takes this many seconds.',
+        )
+        parser.add_argument(
+            '--min_steps',
+            type=int,
+            default=DEFAULT_MIN_STEPS,
+            help='Minimum number of benchmark steps (with --target_time).',
+        )
+        parser.add_argument(
+            '--max_steps',
+            type=int,
+            default=DEFAULT_MAX_STEPS,
+            help='Maximum number of benchmark steps (with --target_time).',
+        )
+        parser.add_argument(
+            '--warmup_mode',
+            type=str,
+            choices=WARMUP_MODES,
+            default='fixed',
+            help='Warm up for a fixed number of steps or until steady.',
+        )
+        parser.add_argument(
+            '--warmup_chunk_steps',
+            type=int,
+            default=DEFAULT_WARMUP_CHUNK_STEPS,
+            help='Number of steps in each warmup chunk (steady warmup).',
+        )
+        parser.add_argument(
+            '--warmup_window',
+            type=int,
+            default=DEFAULT_WARMUP_WINDOW,
+            help='Number of chunks in the stationarity test (steady warmup).',
+        )
+        parser.add_argument(
+            '--max_warmup_steps',
+            type=int,
+            default=DEFAULT_MAX_WARMUP_STEPS,
+            help='Maximum number of warmup steps (steady warmup).',
+        )
+        parser.add_argument(
+            '--latency',
+            action='store_true',
+            help='Record the wall time of individual steps.',
+        )
+        parser.add_argument(
+            '--latency_period',
+            type=int,
+            default=1,
+            help='Record the wall time every this many steps (with --latency).',
+        )
+        parser.add_argument(
+            '--latency_output',
+            type=str,
+            default=None,
+            help='Save the latency series to this .npy file (with --latency).',
+        )
+        parser.add_argument(
+            '--resources',
+            action='store_true',
+            help='Sample memory, CPU time, and CPU frequency during the benchmark.',
+        )
+        parser.add_argument(
+            '--resource_interval',
+            type=float,
+            default=resources.DEFAULT_INTERVAL,
+            help='Time between resource samples in seconds (with --resources).',
+        )
+        parser.add_argument(
+            '--energy',
+            action='store_true',
+            help='Measure the energy of each repetition with the RAPL counters.',
+        )
+        parser.add_argument(
+            '--domain_decomposition',
+            type=str,
+            nargs=3,
+            default=None,
+            metavar=('X', 'Y', 'Z'),
+            help='Number of domains (or comma separated split fractions) along'
+            ' each axis.',
+        )
         return parser
 
     @classmethod
@@ -213,30 +1054,87 @@ class Benchmark:
     def main(cls):
         """Implement the command line entrypoint for benchmarks."""
         parser = cls.make_argument_parser()
+        parser.add_argument(
+            '--jsonl',
+            type=str,
+            default=None,
+            help='Append a result record to this JSON Lines file.',
+        )
         args = parser.parse_args()
         args.device = make_hoomd_device(args)
-        benchmark = cls(**vars(args))
+
+        benchmark_args = vars(args).copy()
+        del benchmark_args['jsonl']
+        benchmark = cls(**benchmark_args)
+
+        start_time = results.timestamp()
         performance = benchmark.execute()
+        stop_time = results.timestamp()
 
         if args.device.communicator.rank == 0:
-            print(f'{numpy.mean(performance)}')
+            print(benchmark.format_performance())
+
+            if args.jsonl is not None:
+                results.JSONLWriter(args.jsonl).write(
+                    results.make_record(
+                        benchmark,
+                        performance,
+                        start_time,
+                        stop_time,
+                        run_id=results.new_run_id(),
+                    )
+                )
 
 
 class ComparativeBenchmark(Benchmark):
     """Base class for benchmarks that compare two simulation runs.
 
+    Args:
+        skip_reference (bool): Set to True to run only the compare simulation
+          and report its time steps per second.
+
+        interleave (bool): Set to True to alternate short chunks of the
+          reference and compare simulations and estimate the overhead from the
+          paired per-chunk differences.
+
+        chunk_steps (int): Number of time steps in each chunk (interleaved mode
+          only).
+
+        kwargs: Keyword arguments accepted by ``Benchmark.__init__``
+
     Derived classes should override `make_simulations` and return a pair of
     simulations to compare. `get_performance` takes the difference
     time difference between the reference and compare simulations and returns
     the inverse. This is a measure of how many times the overhead in the compare
     simulation can be called per second.
 
+    In interleaved mode, the chunks alternate in ABBA order to cancel linear
+    drifts in machine performance. The overhead and its bootstrap confidence
+    interval are computed from all chunks in all repetitions. When the
+    confidence interval includes zero, the overhead is below the noise floor
+    of the measurement and the reported performance is ``nan``.
+
     See Also:
         `common.Benchmark`
+
+    Note:
+        Comparative benchmarks do not support ``warmup_checkpoint``.
     """
 
-    def __init__(self, skip_reference=False, **kwargs):
+    SUPPORTS_WARMUP_CHECKPOINT = False
+
+    def __init__(
+        self,
+        skip_reference=False,
+        interleave=False,
+        chunk_steps=DEFAULT_CHUNK_STEPS,
+        **kwargs,
+    ):
         self.skip_reference = skip_reference
+        self.interleave = interleave
+        self.chunk_steps = chunk_steps
+        self.chunk_differences = []
+        self._last_differences = []
         super().__init__(**kwargs)
 
     def make_simulation(self):
@@ -251,19 +1149,107 @@ class ComparativeBenchmark(Benchmark):
 
     def run(self, steps):
         """Run the benchmark for the given number of steps."""
+        if self.interleave and not self.skip_reference and steps > 0:
+            self._run_interleaved(steps)
+            return
+
         if not self.skip_reference:
             self.reference_sim.run(steps)
         self.compare_sim.run(steps)
 
+    def _run_interleaved(self, steps):
+        """Run alternating chunks and record the per-chunk differences."""
+        self._last_differences = []
+
+        chunk = 0
+        while steps > 0:
+            chunk_steps = min(self.chunk_steps, steps)
+            steps -= chunk_steps
+
+            if chunk % 2 == 0:
+                sims = (self.reference_sim, self.compare_sim)
+            else:
+                sims = (self.compare_sim, self.reference_sim)
+
+            time_per_step = {}
+            for sim in sims:
+                self._new_latency_segment()
+                sim.run(chunk_steps)
+                time_per_step[id(sim)] = 1 / sim.tps
+
+            self._last_differences.append(
+                time_per_step[id(self.compare_sim)]
+                - time_per_step[id(self.reference_sim)]
+            )
+            chunk += 1
+
+    def execute(self):
+        """Execute the benchmark and report the performance.
+
+        Returns:
+            list[float]: The performance measured at each benchmark stage.
+        """
+        performance = super().execute()
+
+        if (
+            self.interleave
+            and 'time_per_call' in self.summary
+            and self.verbose
+            and self.device.communicator.rank == 0
+        ):
+            print(
+                f'.. overhead {self.summary["time_per_call"]} s per call, '
+                f'{self.confidence:.0%} CI [{self.summary["time_per_call_ci_low"]}, '
+                f'{self.summary["time_per_call_ci_high"]}] from '
+                f'{len(self.chunk_differences)} chunks'
+            )
+            if self.summary['below_noise_floor']:
+                print('.. overhead is below the noise floor')
+
+        return performance
+
+    def _measure(self, print_verbose_messages):
+        """Reset the chunk differences before measuring."""
+        self.chunk_differences = []
+        return super()._measure(print_verbose_messages)
+
     def make_simulations(self):
         """Override this method to initialize the simulations."""
         pass
 
+    def _recorded_simulation(self):
+        """Measure the compare simulation."""
+        return self.compare_sim
+
+    def _executed_steps(self, steps):
+        """Count the time steps of both simulations."""
+        if self.skip_reference:
+            return steps
+        return 2 * steps
+
+    def warmup_observables(self):
+        """Get the time steps per second of each simulation.
+
+        The overhead may be below the noise floor of a single chunk, so test
+        the performance of the two simulations for stationarity instead.
+        """
+        observables = dict(compare_tps=self.compare_sim.tps)
+        if not self.skip_reference:
+            observables['reference_tps'] = self.reference_sim.tps
+        return observables
+
     def get_performance(self):
         """Get the benchmark performance."""
         if self.skip_reference:
             return self.compare_sim.tps
 
+        if self.interleave:
+            self.chunk_differences.extend(self._last_differences)
+            overhead = self._estimate_overhead(self._last_differences)
+            if overhead['below_noise_floor']:
+                return math.nan
+            return 1 / overhead['time_per_call']
+
         # Avoid divide by zero errors when the simulation is not executed.
         if self.reference_sim.tps == 0:
             return 0
@@ -272,6 +1258,67 @@ class ComparativeBenchmark(Benchmark):
         t1 = 1 / self.compare_sim.tps
         return 1 / (t1 - t0)
 
+    def _estimate_overhead(self, differences):
+        """Estimate the time per call from per-chunk differences.
+
+        Returns:
+            dict: The mean ``time_per_call`` in seconds, the bounds of its
+            bootstrap confidence interval ``ci_low`` and ``ci_high``, and
+            ``below_noise_floor`` which is True when the interval includes
+            zero.
+        """
+        time_per_call = float(numpy.mean(differences))
+        ci_low, ci_high = stats.bootstrap_confidence_interval(
+            differences, 'mean', self.confidence
+        )
+        below_noise_floor = not ci_low > 0 or time_per_call <= 0
+        return dict(
+            time_per_call=time_per_call,
+            ci_low=ci_low,
+            ci_high=ci_high,
+            below_noise_floor=below_noise_floor,
+        )
+
+    def summarize(self, performance):
+        """Summarize the performance samples.
+
+        In interleaved mode, report the overhead estimated from all chunks in
+        the summary keys ``time_per_call``, ``time_per_call_ci_low``,
+        ``time_per_call_ci_high``, and ``below_noise_floor``. ``value``,
+        ``ci_low``, and ``ci_high`` are the corresponding calls per second.
+        """
+        summary = super().summarize(performance)
+
+        if not self.interleave or self.skip_reference:
+            return summary
+
+        overhead = self._estimate_overhead(self.chunk_differences)
+        summary['time_per_call'] = overhead['time_per_call']
+        summary['time_per_call_ci_low'] = overhead['ci_low']
+        summary['time_per_call_ci_high'] = overhead['ci_high']
+        summary['below_noise_floor'] = overhead['below_noise_floor']
+
+        if overhead['below_noise_floor']:
+            summary['value'] = math.nan
+            summary['ci_low'] = math.nan
+            summary['ci_high'] = math.nan
+        else:
+            summary['value'] = 1 / overhead['time_per_call']
+            summary['ci_low'] = 1 / overhead['ci_high']
+            summary['ci_high'] = 1 / overhead['ci_low']
+        summary['relative_ci_width'] = (
+            summary['ci_high'] - summary['ci_low']
+        ) / summary['value']
+
+        return summary
+
+    def format_performance(self):
+        """Format the summarized performance of the last `execute` for output."""
+        if self.summary.get('below_noise_floor', False):
+            return 'below noise floor'
+
+        return super().format_performance()
+
     @staticmethod
     def make_argument_parser():
         """Make an ArgumentParser instance for comparative benchmark options."""
@@ -281,4 +1328,15 @@ class ComparativeBenchmark(Benchmark):
             action='store_true',
             help='Skip the reference simulation run.',
         )
+        parser.add_argument(
+            '--interleave',
+            action='store_true',
+            help='Alternate chunks of the reference and compare simulations.',
+        )
+        parser.add_argument(
+            '--chunk_steps',
+            type=int,
+            default=DEFAULT_CHUNK_STEPS,
+            help='Number of timesteps in each chunk (interleaved).',
+        )
         return parser
@@ -0,0 +1,293 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Compare the performance of two sets of benchmark results."""
+
+import html
+import json
+import math
+
+import numpy
+import pandas
+
+from . import results, stats
+
+DEFAULT_ALPHA = 0.05
+DEFAULT_MIN_EFFECT = 0.02
+MIN_TEST_SAMPLES = 2
+
+COLUMNS = [
+    'benchmark',
+    'baseline',
+    'candidate',
+    'ratio',
+    'ci_low',
+    'ci_high',
+    'p_value',
+    'change',
+]
+
+
+def load_jsonl_samples(filenames, name):
+    """Load the samples of one run from result records.
+
+    Args:
+        filenames (list[str]): JSON Lines files (see `results.JSONLWriter`).
+        name (str): Name of the run to select.
+
+    Returns:
+        dict[str, list[float]]: The samples of each benchmark. Samples from
+        multiple executions of the same benchmark are concatenated.
+
+    Raises:
+        ValueError: When executions of one benchmark in the run have different
+          arguments.
+    """
+    samples = {}
+    argument_sets = {}
+    for filename in filenames:
+        for record in results.read_records(filename):
+            if record['name'] != name:
+                continue
+
+            _check_arguments(
+                argument_sets,
+                record['benchmark'],
+                results.to_json(record.get('arguments', {})),
+                name,
+            )
+            samples.setdefault(record['benchmark'], []).extend(
+                v for v in record['samples'] if v is not None
+            )
+
+    return samples
+
+
+def load_database_samples(database, name, hostname=None, device=None):
+    """Load the samples of one run from a results database.
+
+    Args:
+        database (database.ResultsDatabase): The results database.
+        name (str): Name of the run to select.
+        hostname (str): Select runs on this host.
+        device (str): Select runs on this device type.
+
+    Executions without samples (such as those imported from CSV files)
+    contribute their reported value as a single sample.
+
+    Returns:
+        dict[str, list[float]]: The samples of each benchmark.
+
+    Raises:
+        ValueError: When executions of one benchmark in the run have different
+          parameters.
+    """
+    df = database.query(name=name, hostname=hostname, device=device)
+
+    samples = {}
+    argument_sets = {}
+    for row in df.itertuples():
+        _check_arguments(
+            argument_sets, row.benchmark, json.loads(row.parameters or '{}'), name
+        )
+        values = database.samples(row.execution_id)
+        if len(values) == 0 and not pandas.isna(row.value):
+            values = [row.value]
+
+        samples.setdefault(row.benchmark, []).extend(
+            v for v in values if math.isfinite(v)
+        )
+
+    return samples
+
+
+def _check_arguments(argument_sets, benchmark, arguments, name):
+    """Require the same arguments in all executions of a benchmark.
+
+    Samples are pooled by benchmark name, so executions with different
+    arguments (for example, different ``N``) must not be compared as one.
+    """
+    key = json.dumps(arguments, sort_keys=True)
+    if argument_sets.setdefault(benchmark, key) != key:
+        raise ValueError(
+            f'Run {name} has executions of {benchmark} with different arguments.'
+        )
+
+
+def compare(
+    baseline,
+    candidate,
+    statistic=stats.DEFAULT_STATISTIC,
+    confidence=stats.DEFAULT_CONFIDENCE,
+    alpha=DEFAULT_ALPHA,
+    min_effect=DEFAULT_MIN_EFFECT,
+):
+    """Compare the performance of benchmarks in two result sets.
+
+    Args:
+        baseline (dict[str, list[float]]): Baseline samples of each benchmark.
+        candidate (dict[str, list[float]]): Candidate samples of each
+          benchmark.
+        statistic (str): Statistic of the samples to compare (``'mean'`` or
+          ``'median'``).
+        confidence (float): Confidence level of the ratio confidence interval.
+        alpha (float): Significance level of the Mann-Whitney U test.
+        min_effect (float): Minimum relative change to report as a regression
+          or improvement.
+
+    The ratio is ``statistic(candidate) / statistic(baseline)``. All benchmarks
+    report performance (higher is better), so ratios above 1 are speedups. A
+    benchmark is a ``'regression'`` (or ``'improvement'``) when the
+    Mann-Whitney U test rejects equal distributions at level *alpha* and the
+    ratio is below ``1 - min_effect`` (or above ``1 + min_effect``). Otherwise,
+    it is ``'unchanged'``, or ``'n/a'`` when there are too few samples to test.
+
+    Returns:
+        pandas.DataFrame: One row per benchmark present in both sets (see
+        `COLUMNS`), sorted by ratio.
+    """
+    rows = []
+    for benchmark in baseline.keys() & candidate.keys():
+        a = numpy.asarray(baseline[benchmark], dtype=float)
+        b = numpy.asarray(candidate[benchmark], dtype=float)
+        if len(a) == 0 or len(b) == 0:
+            continue
+
+        baseline_value = float(stats.STATISTICS[statistic](a))
+        candidate_value = float(stats.STATISTICS[statistic](b))
+        ratio = candidate_value / baseline_value
+        ci_low, ci_high = stats.bootstrap_ratio_confidence_interval(
+            a, b, statistic, confidence
+        )
+        _, p_value = stats.mann_whitney_u(b, a)
+
+        if (
+            math.isnan(p_value)
+            or len(a) < MIN_TEST_SAMPLES
+            or len(b) < MIN_TEST_SAMPLES
+        ):
+            change = 'n/a'
+        elif p_value < alpha and ratio < 1 - min_effect:
+            change = 'regression'
+        elif p_value < alpha and ratio > 1 + min_effect:
+            change = 'improvement'
+        else:
+            change = 'unchanged'
+
+        rows.append(
+            dict(
+                benchmark=benchmark,
+                baseline=baseline_value,
+                candidate=candidate_value,
+                ratio=ratio,
+                ci_low=ci_low,
+                ci_high=ci_high,
+                p_value=p_value,
+                change=change,
+            )
+        )
+
+    df = pandas.DataFrame(rows, columns=COLUMNS)
+    return df.sort_values('ratio', ignore_index=True)
+
+
+def geometric_mean(ratios):
+    """float: The geometric mean of the finite, positive ratios."""
+    ratios = numpy.asarray(ratios, dtype=float)
+    ratios = ratios[numpy.isfinite(ratios) & (ratios > 0)]
+    if len(ratios) == 0:
+        return math.nan
+
+    return float(numpy.exp(numpy.mean(numpy.log(ratios))))
+
+
+def _format_rows(df):
+    """Format the comparison and summary rows as strings."""
+    rows = []
+    for row in df.itertuples():
+        rows.append(
+            [
+                row.benchmark,
+                f'{row.baseline:.4g}',
+                f'{row.candidate:.4g}',
+                f'{row.ratio:.3f}',
+                f'[{row.ci_low:.3f}, {row.ci_high:.3f}]',
+                f'{row.p_value:.3g}',
+                row.change,
+            ]
+        )
+
+    rows.append(
+        [
+            'geometric mean',
+            '',
+            '',
+            f'{geometric_mean(df["ratio"]):.3f}',
+            '',
+            '',
+            f'{sum(df["change"] == "regression")} regressions, '
+            f'{sum(df["change"] == "improvement")} improvements',
+        ]
+    )
+    return rows
+
+
+def _headers(baseline_name, candidate_name, confidence):
+    return [
+        'Benchmark',
+        baseline_name,
+        candidate_name,
+        'Ratio',
+        f'{confidence:.0%} CI',
+        'p-value',
+        'Change',
+    ]
+
+
+def to_markdown(df, baseline_name, candidate_name, confidence=stats.DEFAULT_CONFIDENCE):
+    """Format a comparison as a markdown table.
+
+    Args:
+        df (pandas.DataFrame): The comparison (see `compare`).
+        baseline_name (str): Name of the baseline result set.
+        candidate_name (str): Name of the candidate result set.
+        confidence (float): Confidence level of the ratio confidence interval.
+
+    Returns:
+        str: The table with a geometric mean summary row.
+    """
+    headers = _headers(baseline_name, candidate_name, confidence)
+    lines = [
+        '| ' + ' | '.join(headers) + ' |',
+        '|' + '|'.join(['---'] + ['--:'] * 5 + ['---']) + '|',
+    ]
+    lines.extend('| ' + ' | '.join(row) + ' |' for row in _format_rows(df))
+    return '\n'.join(lines) + '\n'
+
+
+def to_html(df, baseline_name, candidate_name, confidence=stats.DEFAULT_CONFIDENCE):
+    """Format a comparison as an HTML table.
+
+    Args:
+        df (pandas.DataFrame): The comparison (see `compare`).
+        baseline_name (str): Name of the baseline result set.
+        candidate_name (str): Name of the candidate result set.
+        confidence (float): Confidence level of the ratio confidence interval.
+
+    Returns:
+        str: The table with a geometric mean summary row.
+    """
+    headers = _headers(baseline_name, candidate_name, confidence)
+    lines = [
+        '<table>',
+        '<tr>' + ''.join(f'<th>{html.escape(h)}</th>' for h in headers) + '</tr>',
+    ]
+    for row in _format_rows(df):
+        css_class = row[-1] if row[-1] in {'regression', 'improvement'} else ''
+        lines.append(
+            f'<tr class="{css_class}">'
+            + ''.join(f'<td>{html.escape(value)}</td>' for value in row)
+            + '</tr>'
+        )
+    lines.append('</table>')
+    return '\n'.join(lines) + '\n'
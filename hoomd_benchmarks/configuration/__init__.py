@@ -2,3 +2,112 @@
 # Part of HOOMD-blue, released under the BSD 3-Clause License.
 
 """Methods that create initial configurations for benchmarks."""
+
+from .hard_sphere import make_hard_sphere_configuration
+from .inhomogeneous import PROFILES, make_inhomogeneous_configuration
+from .lattice import LATTICES, make_lattice_configuration
+from .replicate import replicate_configuration
+
+DEFAULT_CONFIGURATION = 'hard_sphere'
+CONFIGURATIONS = ['hard_sphere', *LATTICES.keys(), *PROFILES]
+
+
+def make_configuration(
+    configuration,
+    N,
+    rho,
+    dimensions,
+    device,
+    verbose,
+    n_types=1,
+    randomize_steps=0,
+    replicate=1,
+    jitter=None,
+    relax_steps=0,
+):
+    """Make an initial configuration with the chosen generator.
+
+    Args:
+        configuration (str): Name of the generator: ``'hard_sphere'``, the
+          name of a lattice in `lattice.LATTICES`, or the name of a density
+          profile in `inhomogeneous.PROFILES`.
+        N (int): Number of particles.
+        rho (float): Number density.
+        dimensions (int): Number of dimensions (2 or 3).
+        device (hoomd.device.Device): Device object to execute on.
+        verbose (bool): Set to True to provide details to stdout.
+        n_types (int): Number of particle types.
+        randomize_steps (int): Number of Monte Carlo steps to randomize lattice
+          configurations.
+        replicate (int): When greater than 1, generate a configuration with
+          ``N / replicate**dimensions`` particles and replicate it
+          ``replicate`` times along each box edge.
+        jitter (float): Maximum translation move size when relaxing replicated
+          configurations (see `replicate.replicate_configuration`).
+        relax_steps (int): Number of Monte Carlo steps to relax replicated
+          configurations.
+
+    Returns:
+        pathlib.Path: Path to the GSD file with the initial configuration.
+    """
+    if replicate > 1:
+        base_N, remainder = divmod(N, replicate**dimensions)
+        if remainder != 0:
+            raise ValueError(
+                f'N={N} is not divisible by replicate**dimensions='
+                f'{replicate**dimensions}'
+            )
+
+        base_path = make_configuration(
+            configuration,
+            N=base_N,
+            rho=rho,
+            dimensions=dimensions,
+            device=device,
+            verbose=verbose,
+            n_types=n_types,
+            randomize_steps=randomize_steps,
+        )
+        return replicate_configuration(
+            base_path,
+            replicate=replicate,
+            device=device,
+            verbose=verbose,
+            jitter=jitter,
+            relax_steps=relax_steps,
+        )
+
+    if configuration == 'hard_sphere':
+        return make_hard_sphere_configuration(
+            N=N,
+            rho=rho,
+            dimensions=dimensions,
+            device=device,
+            verbose=verbose,
+            n_types=n_types,
+        )
+
+    if configuration in LATTICES:
+        return make_lattice_configuration(
+            N=N,
+            rho=rho,
+            dimensions=dimensions,
+            device=device,
+            verbose=verbose,
+            n_types=n_types,
+            lattice=configuration,
+            randomize_steps=randomize_steps,
+        )
+
+    if configuration in PROFILES:
+        return make_inhomogeneous_configuration(
+            N=N,
+            rho=rho,
+            dimensions=dimensions,
+            device=device,
+            verbose=verbose,
+            n_types=n_types,
+            profile=configuration,
+        )
+
+    raise ValueError(f'Invalid configuration: {configuration}')
@@ -0,0 +1,215 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Command line interface to the initial configuration cache."""
+
+import argparse
+import copy
+import datetime
+import itertools
+
+from .. import common
+from . import (
+    CONFIGURATIONS,
+    DEFAULT_CONFIGURATION,
+    cache,
+    make_configuration,
+    prepare,
+)
+from .replicate import DEFAULT_JITTER
+
+SECONDS_PER_DAY = 86400
+
+
+def list_entries(args):
+    """List the entries in the cache."""
+    index = cache.read_index()
+    by_last_use = sorted(index.items(), key=lambda item: item[1]['last_used'])
+
+    total_size = 0
+    for filename, entry in by_last_use:
+        last_used = datetime.datetime.fromtimestamp(entry['last_used'])
+        print(
+            f'{filename}  {entry["size"] / 1024**2:10.2f} MiB  '
+            f'{last_used:%Y-%m-%d %H:%M}  {entry["parameters"]}'
+        )
+        total_size += entry['size']
+
+    print(f'{len(index)} entries, {total_size / 1024**2:0.2f} MiB')
+
+
+def prune_entries(args):
+    """Remove entries from the cache."""
+    max_size = None
+    if args.max_size is not None:
+        max_size = int(args.max_size * 1024**2)
+
+    older_than = None
+    if args.older_than is not None:
+        older_than = args.older_than * SECONDS_PER_DAY
+
+    removed = cache.prune(max_size=max_size, older_than=older_than, remove_all=args.all)
+    for filename in removed:
+        print(f'Removed {filename}')
+
+
+def warm_entries(args):
+    """Generate cache entries."""
+    device = common.make_hoomd_device(args)
+
+    for N, rho, n_types in itertools.product(args.N, args.rho, args.n_types):
+        make_configuration(
+            args.configuration,
+            N=N,
+            rho=rho,
+            dimensions=args.dimensions,
+            device=device,
+            verbose=args.verbose,
+            n_types=n_types,
+            randomize_steps=args.randomize_steps,
+            replicate=args.replicate,
+            jitter=args.jitter,
+            relax_steps=args.relax_steps,
+        )
+
+
+def prepare_entries(args):
+    """Generate the configurations needed by the selected benchmarks."""
+    from ..suite import select_benchmarks
+
+    arguments = copy.copy(vars(args))
+    for key in ('func', 'benchmarks', 'workers', 'verbose', 'N', 'rho'):
+        del arguments[key]
+
+    requests = []
+    for benchmark_class in select_benchmarks(args.benchmarks):
+        for N, rho in itertools.product(args.N, args.rho):
+            requests.extend(
+                benchmark_class.required_configurations(dict(N=N, rho=rho, **arguments))
+            )
+
+    requests = prepare.unique_configurations(requests)
+    print(f'Preparing {len(requests)} configuration(s)')
+
+    for parameters, path in prepare.prepare(requests, args.workers, args.verbose):
+        print(f'{path}: {parameters}')
+
+
+def add_configuration_arguments(parser):
+    """Add the arguments that select configurations to the parser."""
+    parser.add_argument(
+        '--configuration',
+        type=str,
+        choices=CONFIGURATIONS,
+        default=DEFAULT_CONFIGURATION,
+        help='Initial configuration generator.',
+    )
+    parser.add_argument(
+        '-N',
+        type=int,
+        nargs='+',
+        default=[common.DEFAULT_N],
+        help='Number of particles.',
+    )
+    parser.add_argument(
+        '--rho',
+        type=float,
+        nargs='+',
+        default=[common.DEFAULT_RHO],
+        help='Number density.',
+    )
+    parser.add_argument(
+        '--dimensions',
+        type=int,
+        choices=[2, 3],
+        default=common.DEFAULT_DIMENSIONS,
+        help='Number of dimensions.',
+    )
+    parser.add_argument(
+        '--randomize_steps',
+        type=int,
+        default=0,
+        help='Number of steps to randomize lattice initial configurations.',
+    )
+    parser.add_argument(
+        '--replicate',
+        type=int,
+        default=1,
+        help='Replicate a smaller initial configuration along each box edge.',
+    )
+    parser.add_argument(
+        '--jitter',
+        type=float,
+        default=None,
+        help='Maximum move size when relaxing replicated configurations'
+        f' (default: {DEFAULT_JITTER}, requires --relax_steps).',
+    )
+    parser.add_argument(
+        '--relax_steps',
+        type=int,
+        default=0,
+        help='Number of steps to relax replicated configurations.',
+    )
+    parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output.')
+
+
+parser = argparse.ArgumentParser(
+    prog='python -m hoomd_benchmarks.configuration',
+    description=f'Manage the initial configuration cache in {cache.get_cache_dir()}.',
+)
+subparsers = parser.add_subparsers(required=True)
+
+list_parser = subparsers.add_parser('list', help='List cache entries.')
+list_parser.set_defaults(func=list_entries)
+
+prune_parser = subparsers.add_parser('prune', help='Remove cache entries.')
+prune_parser.add_argument(
+    '--max_size',
+    type=float,
+    help='Remove the least recently used entries until the cache is smaller '
+    'than this size (in MiB).',
+)
+prune_parser.add_argument(
+    '--older_than',
+    type=float,
+    help='Remove entries last used more than this many days ago.',
+)
+prune_parser.add_argument('--all', action='store_true', help='Remove all entries.')
+prune_parser.set_defaults(func=prune_entries)
+
+warm_parser = subparsers.add_parser('warm', help='Generate cache entries.')
+warm_parser.add_argument(
+    '--device',
+    type=str,
+    choices=['CPU', 'GPU'],
+    default='CPU',
+    help='Execution device.',
+)
+add_configuration_arguments(warm_parser)
+warm_parser.add_argument(
+    '--n_types', type=int, nargs='+', default=[1], help='Number of particle types.'
+)
+warm_parser.set_defaults(func=warm_entries)
+
+prepare_parser = subparsers.add_parser(
+    'prepare',
+    help='Generate the configurations needed by the selected benchmarks '
+    'in parallel.',
+)
+add_configuration_arguments(prepare_parser)
+prepare_parser.add_argument(
+    '--benchmarks',
+    type=str,
+    default='*',
+    help='Select the benchmarks by class name using `fnmatch` syntax.',
+)
+prepare_parser.add_argument(
+    '--workers',
+    type=int,
+    default=None,
+    help='Number of worker processes (default: number of CPUs).',
+)
+prepare_parser.set_defaults(func=prepare_entries)
+
+args = parser.parse_args()
+args.func(args)
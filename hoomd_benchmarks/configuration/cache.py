@@ -0,0 +1,248 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Managed cache of initial configuration files.
+
+Each cache entry is a GSD file named by a hash of the generator name, the
+generator version, and all generation parameters. ``index.json`` in the cache
+directory records the metadata of each entry. File locks ensure that only one
+process generates a given entry while other processes (for example, other jobs
+in a SLURM array) wait for it to complete.
+
+Set the environment variable ``HOOMD_BENCHMARKS_CACHE_DIR`` to choose the cache
+directory and ``HOOMD_BENCHMARKS_CACHE_MAX_SIZE`` to limit the total size of the
+cache (in MiB). When the cache exceeds the limit, the least recently used
+entries are removed.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import pathlib
+import time
+
+INDEX_FILENAME = 'index.json'
+
+
+def get_cache_dir():
+    """pathlib.Path: The cache directory."""
+    return pathlib.Path(
+        os.environ.get('HOOMD_BENCHMARKS_CACHE_DIR', 'initial_configuration_cache')
+    )
+
+
+def get_max_size():
+    """int: The maximum size of the cache in bytes (None when unlimited)."""
+    max_size = os.environ.get('HOOMD_BENCHMARKS_CACHE_MAX_SIZE')
+    if max_size is None:
+        return None
+
+    return int(float(max_size) * 1024**2)
+
+
+def entry_filename(generator, version, parameters):
+    """Get the filename of a cache entry.
+
+    Args:
+        generator (str): Name of the generator.
+        version (int): Version of the generator.
+        parameters (dict): All parameters that affect the generated file.
+
+    Returns:
+        str: The filename.
+    """
+    description = json.dumps(
+        dict(generator=generator, version=version, parameters=parameters),
+        sort_keys=True,
+    )
+    key = hashlib.sha256(description.encode('utf-8')).hexdigest()[0:16]
+    return f'{generator}_{key}.gsd'
+
+
+@contextlib.contextmanager
+def _lock(path, blocking=True):
+    """Hold an exclusive lock on path for the duration of the context.
+
+    Yields:
+        bool: True when the lock was acquired (always True when blocking).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        flags = fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+
+        try:
+            fcntl.flock(f, flags)
+        except BlockingIOError:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _lock_path(filename):
+    return get_cache_dir() / f'{filename}.lock'
+
+
+def read_index():
+    """Read the cache index.
+
+    Returns:
+        dict: Metadata of each entry, keyed by filename.
+    """
+    index_path = get_cache_dir() / INDEX_FILENAME
+    if not index_path.exists():
+        return {}
+
+    with open(index_path) as f:
+        return json.load(f)
+
+
+@contextlib.contextmanager
+def _update_index():
+    """Read, modify, and atomically write the index while holding its lock."""
+    index_path = get_cache_dir() / INDEX_FILENAME
+    with _lock(get_cache_dir() / f'{INDEX_FILENAME}.lock'):
+        index = read_index()
+        yield index
+
+        tmp_path = index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, index_path)
+
+
+def get_entry(generator, version, parameters, device, verbose, generate):
+    """Get the path to a cache entry, generating it when needed.
+
+    Args:
+        generator (str): Name of the generator.
+        version (int): Version of the generator. Increment the version when the
+          generator changes to invalidate old entries.
+        parameters (dict): All parameters that affect the generated file.
+        device (hoomd.device.Device): Device object to execute on.
+        verbose (bool): Set to True to provide details to stdout.
+        generate (callable): Function that writes the file given the path to
+          write. All ranks call *generate*.
+
+    Rank 0 holds the entry's lock while checking for and generating the file.
+    *generate* writes to a temporary file which is moved into place when
+    complete, so other processes never read partially written files.
+
+    Returns:
+        pathlib.Path: Path to the GSD file.
+    """
+    print_messages = verbose and device.communicator.rank == 0
+    filename = entry_filename(generator, version, parameters)
+    file_path = get_cache_dir() / filename
+
+    with contextlib.ExitStack() as stack:
+        if device.communicator.rank == 0:
+            stack.enter_context(_lock(_lock_path(filename)))
+        device.communicator.barrier()
+
+        if file_path.exists():
+            if print_messages:
+                print(f'Using existing {file_path}')
+        else:
+            if print_messages:
+                print(f'Generating {file_path} ({generator}: {parameters})')
+
+            tmp_path = file_path.with_suffix('.partial.gsd')
+            if device.communicator.rank == 0:
+                tmp_path.unlink(missing_ok=True)
+            device.communicator.barrier()
+
+            generate(tmp_path)
+            device.communicator.barrier()
+
+            if device.communicator.rank == 0:
+                os.replace(tmp_path, file_path)
+            device.communicator.barrier()
+
+            if print_messages:
+                print('.. done')
+
+        if device.communicator.rank == 0:
+            with _update_index() as index:
+                entry = index.setdefault(
+                    filename,
+                    dict(
+                        generator=generator,
+                        version=version,
+                        parameters=parameters,
+                        created=time.time(),
+                    ),
+                )
+                entry['size'] = file_path.stat().st_size
+                entry['last_used'] = time.time()
+
+    if device.communicator.rank == 0:
+        max_size = get_max_size()
+        if max_size is not None:
+            prune(max_size=max_size, keep=[filename])
+
+    return file_path
+
+
+def prune(max_size=None, older_than=None, keep=(), remove_all=False):
+    """Remove cache entries.
+
+    Args:
+        max_size (int): Remove the least recently used entries until the total
+          size of the cache is at most *max_size* bytes.
+        older_than (float): Remove entries last used more than *older_than*
+          seconds ago.
+        keep (list[str]): Filenames of entries to keep.
+        remove_all (bool): Remove all entries.
+
+    Entries that are locked by another process are not removed.
+
+    Returns:
+        list[str]: Filenames of the removed entries.
+    """
+    removed = []
+    now = time.time()
+
+    with _update_index() as index:
+        # drop entries that were removed by other means
+        for filename in list(index.keys()):
+            if not (get_cache_dir() / filename).exists():
+                del index[filename]
+
+        total_size = sum(entry['size'] for entry in index.values())
+        by_last_use = sorted(index.items(), key=lambda item: item[1]['last_used'])
+
+        for filename, entry in by_last_use:
+            if filename in keep:
+                continue
+
+            if not (
+                remove_all
+                or (max_size is not None and total_size > max_size)
+                or (older_than is not None and now - entry['last_used'] > older_than)
+            ):
+                continue
+
+            with _lock(_lock_path(filename), blocking=False) as acquired:
+                if not acquired:
+                    continue
+
+                (get_cache_dir() / filename).unlink(missing_ok=True)
+                # Some entries (such as warmup checkpoints) have a JSON sidecar.
+                (get_cache_dir() / filename).with_suffix('.json').unlink(
+                    missing_ok=True
+                )
+
+            # Keep the lock file: another process may be waiting on it.
+            total_size -= entry['size']
+            del index[filename]
+            removed.append(filename)
+
+    return removed
@@ -3,14 +3,19 @@
 
 """Hard sphere initial configuration."""
 
+import functools
 import itertools
 import math
-import pathlib
 
 import gsd.hoomd
 import hoomd
 import numpy
 
+from . import cache
+
+# Increment when the generated configurations change.
+GENERATOR_VERSION = 1
+
 
 def make_hard_sphere_configuration(N, rho, dimensions, device, verbose, n_types=1):
     """Make an initial configuration of hard spheres, or find it in the cache.
@@ -30,46 +35,52 @@ def make_hard_sphere_configuration(N, rho, dimensions, device, verbose, n_types=
     than 1, the types are assigned sequentially to particles and named
     ``str(type_id)``.
     """
-    print_messages = verbose and device.communicator.rank == 0
+    if dimensions not in (2, 3):
+        raise ValueError('Invalid dimensions: must be 2 or 3')
+
+    parameters = dict(N=N, rho=rho, dimensions=dimensions, n_types=n_types)
 
     if n_types > 1:
         one_type_path = make_hard_sphere_configuration(
             N, rho, dimensions, device, verbose, 1
         )
 
-        filename = f'hard_sphere_{N}_{rho}_{dimensions}_{n_types}.gsd'
-        file_path = pathlib.Path('initial_configuration_cache') / filename
-
-        if print_messages:
-            print(f'.. adding types to {file_path}')
-
-        # add types to the file
-        if device.communicator.rank == 0:
-            with gsd.hoomd.open(one_type_path, mode='rb') as one_type_gsd:
-                snapshot = one_type_gsd[0]
-                snapshot.particles.types = [str(i) for i in range(0, n_types)]
-                snapshot.particles.typeid = [
-                    i % n_types for i in range(0, snapshot.particles.N)
-                ]
-
-                with gsd.hoomd.open(file_path, mode='wb') as n_types_gsd:
-                    n_types_gsd.append(snapshot)
+        def add_types(file_path):
+            if device.communicator.rank == 0:
+                with gsd.hoomd.open(one_type_path, mode='rb') as one_type_gsd:
+                    snapshot = one_type_gsd[0]
+                    snapshot.particles.types = [str(i) for i in range(0, n_types)]
+                    snapshot.particles.typeid = [
+                        i % n_types for i in range(0, snapshot.particles.N)
+                    ]
 
-        return file_path
+                    with gsd.hoomd.open(file_path, mode='wb') as n_types_gsd:
+                        n_types_gsd.append(snapshot)
 
-    filename = f'hard_sphere_{N}_{rho}_{dimensions}.gsd'
-    file_path = pathlib.Path('initial_configuration_cache') / filename
+        return cache.get_entry(
+            'hard_sphere', GENERATOR_VERSION, parameters, device, verbose, add_types
+        )
 
-    if dimensions not in (2, 3):
-        raise ValueError('Invalid dimensions: must be 2 or 3')
+    return cache.get_entry(
+        'hard_sphere',
+        GENERATOR_VERSION,
+        parameters,
+        device,
+        verbose,
+        functools.partial(
+            _generate,
+            N=N,
+            rho=rho,
+            dimensions=dimensions,
+            device=device,
+            verbose=verbose,
+        ),
+    )
 
-    if file_path.exists():
-        if print_messages:
-            print(f'Using existing {file_path}')
-        return file_path
 
-    if print_messages:
-        print(f'Generating {file_path}')
+def _generate(file_path, N, rho, dimensions, device, verbose):
+    """Generate a hard sphere configuration and write it to file_path."""
+    print_messages = verbose and device.communicator.rank == 0
 
     # initial configuration on a grid
     spacing = 1.5
@@ -140,7 +151,3 @@ def make_hard_sphere_configuration(N, rho, dimensions, device, verbose, n_types=
         raise RuntimeError('Compression failed to complete')
 
     hoomd.write.GSD.write(state=sim.state, mode='xb', filename=str(file_path))
-
-    if print_messages:
-        print('.. done')
-    return file_path
@@ -0,0 +1,199 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Inhomogeneous initial configurations: slabs, droplets, and gradients."""
+
+import functools
+import math
+
+import gsd.hoomd
+import numpy
+
+from . import cache
+from .lattice import DIAMETER, lattice_geometry, lattice_positions
+
+# Increment when the generated configurations change.
+GENERATOR_VERSION = 2
+
+PROFILES = ('slab', 'droplet', 'gradient')
+
+# Fraction of the lattice sites occupied by particles.
+DENSE_FRACTION = 0.25
+
+# Probability of keeping a lattice site in the vapor relative to the dense
+# phase.
+VAPOR_WEIGHT = 0.01
+
+# Lattice of the dense phase in each number of dimensions.
+DENSE_LATTICE = {2: 'hex', 3: 'fcc'}
+
+
+def profile_weights(profile, position, box_lengths, fraction):
+    """Compute the relative probability of occupying each lattice site.
+
+    Args:
+        profile (str): ``'slab'``, ``'droplet'``, or ``'gradient'``.
+        position (numpy.ndarray): Site positions (M, 3) centered on the
+          origin.
+        box_lengths (numpy.ndarray): Box edge lengths.
+        fraction (float): Fraction of the sites to occupy.
+
+    The slab spans the box in x (and y) and occupies *fraction* of the box in
+    z (y in 2D) starting at the lower box edge. The droplet is a sphere (or
+    disk) with *fraction* of the box volume centered a quarter of the box
+    from the lower edge on each axis. Sites outside them are occupied with the
+    relative probability `VAPOR_WEIGHT`. The gradient occupies sites with a
+    probability that increases linearly along the last axis (from
+    `VAPOR_WEIGHT`).
+
+    A uniform domain decomposition with an even number of domains on an axis
+    has a boundary at the box center, so the dense regions are off center to
+    imbalance every uniform split along the axes that cut through them (all
+    axes for the droplet, the last axis for the slab and gradient).
+
+    Returns:
+        numpy.ndarray: The weight of each site.
+    """
+    dimensions = len(box_lengths)
+    axis = dimensions - 1
+
+    if profile == 'slab':
+        inside = position[:, axis] < (fraction - 0.5) * box_lengths[axis]
+    elif profile == 'droplet':
+        volume = fraction * numpy.prod(box_lengths)
+        if dimensions == 3:  # noqa: PLR2004: 3 is not magic
+            radius = (3 * volume / (4 * math.pi)) ** (1 / 3)
+        else:
+            radius = math.sqrt(volume / math.pi)
+
+        if 2 * radius > min(box_lengths):
+            raise ValueError(
+                f'A droplet with {fraction:.3g} of the box volume does not fit '
+                'in the box.'
+            )
+        delta = position[:, 0:dimensions] + box_lengths / 4
+        delta -= box_lengths * numpy.round(delta / box_lengths)
+        inside = numpy.linalg.norm(delta, axis=1) <= radius
+    elif profile == 'gradient':
+        return position[:, axis] / box_lengths[axis] + 0.5 + VAPOR_WEIGHT
+    else:
+        raise ValueError(f'Invalid profile: {profile}')
+
+    return numpy.where(inside, 1.0, VAPOR_WEIGHT)
+
+
+def inhomogeneous_positions(N, rho, dimensions, profile, seed=0):
+    """Place particles with a non-uniform density.
+
+    Args:
+        N (int): Number of particles.
+        rho (float): Number density of the dense phase.
+        dimensions (int): Number of dimensions (2 or 3).
+        profile (str): ``'slab'``, ``'droplet'``, or ``'gradient'``.
+        seed (int): Random number seed used to choose the occupied sites.
+
+    Make a lattice at the density *rho* with ``N / DENSE_FRACTION`` sites,
+    then choose *N* sites with probabilities given by `profile_weights`. The
+    mean density is about ``DENSE_FRACTION * rho``.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The particle positions (N, 3)
+        centered on the origin and the box edge lengths.
+    """
+    lattice = DENSE_LATTICE[dimensions]
+    M = math.ceil(N / DENSE_FRACTION)
+    n_cells, cell_lengths, nearest_neighbor = lattice_geometry(M, rho, lattice)
+    if nearest_neighbor < DIAMETER:
+        raise ValueError(
+            f'The {lattice} lattice at rho={rho} overlaps (nearest neighbor '
+            f'distance {nearest_neighbor:0.4g}).'
+        )
+
+    box_lengths = n_cells * cell_lengths
+    sites = lattice_positions(M, rho, lattice)
+
+    weights = profile_weights(profile, sites, box_lengths, N / M)
+    rng = numpy.random.default_rng(seed)
+    chosen = rng.choice(M, size=N, replace=False, p=weights / weights.sum())
+
+    return sites[numpy.sort(chosen)], box_lengths
+
+
+def make_inhomogeneous_configuration(
+    N, rho, dimensions, device, verbose, n_types=1, profile='slab'
+):
+    """Make an inhomogeneous configuration of spheres, or find it in the cache.
+
+    Args:
+        N (int): Number of particles.
+        rho (float): Number density of the dense phase.
+        dimensions (int): Number of dimensions (2 or 3).
+        device (hoomd.device.Device): Device object to execute on.
+        verbose (bool): Set to True to provide details to stdout.
+        n_types (int): Number of particle types.
+        profile (str): Density profile: ``'slab'`` (a liquid slab in vapor),
+          ``'droplet'`` (a liquid droplet in vapor), or ``'gradient'`` (a
+          linear density gradient).
+
+    The particles occupy the sites of a lattice at the dense phase density
+    (see `inhomogeneous_positions`), so the configuration is free of overlaps
+    between spheres of diameter 1.0. With a uniform domain decomposition that
+    cuts through the dense phase (see `profile_weights`), the ranks that hold
+    it have more particles than the others.
+
+    When ``n_types`` is 1, the particle type is 'A'. When ``n_types`` is greater
+    than 1, the types are assigned sequentially to particles and named
+    ``str(type_id)``.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f'Invalid profile: {profile}')
+
+    parameters = dict(
+        profile=profile,
+        N=N,
+        rho=rho,
+        dimensions=dimensions,
+        n_types=n_types,
+    )
+
+    return cache.get_entry(
+        'inhomogeneous',
+        GENERATOR_VERSION,
+        parameters,
+        device,
+        verbose,
+        functools.partial(_generate, device=device, verbose=verbose, **parameters),
+    )
+
+
+def _generate(file_path, profile, N, rho, dimensions, n_types, device, verbose):
+    """Generate an inhomogeneous configuration and write it to file_path."""
+    print_messages = verbose and device.communicator.rank == 0
+
+    # only rank 0 needs the particle data
+    if device.communicator.rank != 0:
+        return
+
+    if print_messages:
+        print(f'.. placing {N} particles in a {profile} profile')
+
+    position, box_lengths = inhomogeneous_positions(N, rho, dimensions, profile)
+
+    box = [0, 0, 0, 0, 0, 0]
+    box[0:dimensions] = box_lengths.tolist()
+
+    if n_types == 1:
+        types = ['A']
+    else:
+        types = [str(i) for i in range(0, n_types)]
+
+    frame = gsd.hoomd.Frame()
+    frame.configuration.box = box
+    frame.configuration.dimensions = dimensions
+    frame.particles.N = N
+    frame.particles.types = types
+    frame.particles.typeid = numpy.arange(N, dtype=numpy.uint32) % n_types
+    frame.particles.position = position
+
+    with gsd.hoomd.open(file_path, mode='xb') as f:
+        f.append(frame)
@@ -0,0 +1,236 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Lattice initial configuration."""
+
+import functools
+import math
+
+import gsd.hoomd
+import hoomd
+import numpy
+
+from . import cache
+
+# Increment when the generated configurations change.
+GENERATOR_VERSION = 1
+
+# Unit cells: dimensions, cell edge lengths relative to the first edge, basis
+# positions in fractional coordinates, and the nearest neighbor distance
+# relative to the first edge.
+LATTICES = {
+    'sc': dict(
+        dimensions=3,
+        aspect=[1, 1, 1],
+        basis=[[0, 0, 0]],
+        nearest_neighbor=1,
+    ),
+    'bcc': dict(
+        dimensions=3,
+        aspect=[1, 1, 1],
+        basis=[[0, 0, 0], [0.5, 0.5, 0.5]],
+        nearest_neighbor=math.sqrt(3) / 2,
+    ),
+    'fcc': dict(
+        dimensions=3,
+        aspect=[1, 1, 1],
+        basis=[[0, 0, 0], [0.5, 0.5, 0], [0.5, 0, 0.5], [0, 0.5, 0.5]],
+        nearest_neighbor=1 / math.sqrt(2),
+    ),
+    'square': dict(
+        dimensions=2,
+        aspect=[1, 1],
+        basis=[[0, 0]],
+        nearest_neighbor=1,
+    ),
+    'hex': dict(
+        dimensions=2,
+        aspect=[1, math.sqrt(3)],
+        basis=[[0, 0], [0.5, 0.5]],
+        nearest_neighbor=1,
+    ),
+}
+
+DIAMETER = 1.0
+
+
+def lattice_geometry(N, rho, lattice):
+    """Choose the lattice geometry for N particles at the given number density.
+
+    Args:
+        N (int): Number of particles.
+        rho (float): Number density.
+        lattice (str): Name of the lattice (a key of `LATTICES`).
+
+    Choose the number of unit cells in each direction so that the box is nearly
+    cubic and has at least *N* lattice sites.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, float]: The number of cells in each
+        direction, the cell edge lengths, and the nearest neighbor distance.
+    """
+    cell = LATTICES[lattice]
+    dimensions = cell['dimensions']
+    aspect = numpy.array(cell['aspect'], dtype=float)
+
+    scale = (N / (len(cell['basis']) * numpy.prod(1 / aspect))) ** (1 / dimensions)
+    n_cells = numpy.ceil(scale / aspect).astype(int)
+
+    # cell edge lengths at the target density
+    volume = N / rho
+    a = (volume / numpy.prod(n_cells * aspect)) ** (1 / dimensions)
+
+    return n_cells, a * aspect, cell['nearest_neighbor'] * a
+
+
+def lattice_positions(N, rho, lattice, seed=0):
+    """Place particles on a lattice at the given number density.
+
+    Args:
+        N (int): Number of particles.
+        rho (float): Number density.
+        lattice (str): Name of the lattice (a key of `LATTICES`).
+        seed (int): Random number seed used to choose vacancies.
+
+    When there are more lattice sites than particles, remove randomly chosen
+    sites so that the vacancies are distributed uniformly.
+
+    Returns:
+        numpy.ndarray: The particle positions (N, 3) centered on the origin.
+    """
+    n_cells, cell_lengths, _ = lattice_geometry(N, rho, lattice)
+    dimensions = len(n_cells)
+    basis = numpy.array(LATTICES[lattice]['basis'], dtype=float)
+
+    # all sites, ordered by cell and then basis
+    origins = numpy.indices(n_cells, dtype=float).reshape(dimensions, -1).T
+    sites = (origins[:, numpy.newaxis, :] + basis[numpy.newaxis, :, :]).reshape(
+        -1, dimensions
+    )
+
+    if len(sites) > N:
+        rng = numpy.random.default_rng(seed)
+        sites = sites[numpy.sort(rng.choice(len(sites), size=N, replace=False))]
+
+    position = numpy.zeros((N, 3), dtype=numpy.float32)
+    position[:, 0:dimensions] = (sites - n_cells / 2) * cell_lengths
+
+    return position
+
+
+def make_lattice_configuration(
+    N, rho, dimensions, device, verbose, n_types=1, lattice='fcc', randomize_steps=0
+):
+    """Make an initial configuration of spheres on a lattice, or find it in the cache.
+
+    Args:
+        N (int): Number of particles.
+        rho (float): Number density.
+        dimensions (int): Number of dimensions (2 or 3).
+        device (hoomd.device.Device): Device object to execute on.
+        verbose (bool): Set to True to provide details to stdout.
+        n_types (int): Number of particle types.
+        lattice (str): Name of the lattice (a key of `LATTICES`).
+        randomize_steps (int): Number of hard sphere Monte Carlo steps to run
+          to randomize the lattice.
+
+    Place N particles on the lattice at the given number density *rho* with
+    NumPy array operations. The configuration is free of overlaps between
+    spheres of diameter 1.0, so it is an alternative to the compressed
+    configurations generated by `make_hard_sphere_configuration` that is fast
+    to generate at large N. Set *randomize_steps* to run a short hard sphere
+    Monte Carlo simulation that melts the lattice.
+
+    When ``n_types`` is 1, the particle type is 'A'. When ``n_types`` is greater
+    than 1, the types are assigned sequentially to particles and named
+    ``str(type_id)``.
+    """
+    if lattice not in LATTICES:
+        raise ValueError(f'Invalid lattice: {lattice}')
+
+    if LATTICES[lattice]['dimensions'] != dimensions:
+        raise ValueError(
+            f'The {lattice} lattice requires '
+            f'dimensions={LATTICES[lattice]["dimensions"]}'
+        )
+
+    parameters = dict(
+        lattice=lattice,
+        N=N,
+        rho=rho,
+        dimensions=dimensions,
+        n_types=n_types,
+        randomize_steps=randomize_steps,
+    )
+
+    return cache.get_entry(
+        'lattice',
+        GENERATOR_VERSION,
+        parameters,
+        device,
+        verbose,
+        functools.partial(_generate, device=device, verbose=verbose, **parameters),
+    )
+
+
+def _generate(
+    file_path, lattice, N, rho, dimensions, n_types, randomize_steps, device, verbose
+):
+    """Generate a lattice configuration and write it to file_path."""
+    print_messages = verbose and device.communicator.rank == 0
+
+    n_cells, cell_lengths, nearest_neighbor = lattice_geometry(N, rho, lattice)
+    if nearest_neighbor < DIAMETER:
+        raise ValueError(
+            f'The {lattice} lattice at rho={rho} overlaps (nearest neighbor '
+            f'distance {nearest_neighbor:0.4g}).'
+        )
+
+    box = [0, 0, 0, 0, 0, 0]
+    box[0:dimensions] = (n_cells * cell_lengths).tolist()
+
+    if n_types == 1:
+        types = ['A']
+    else:
+        types = [str(i) for i in range(0, n_types)]
+
+    # only rank 0 needs the particle data
+    if device.communicator.rank == 0:
+        position = lattice_positions(N, rho, lattice)
+        typeid = numpy.arange(N, dtype=numpy.uint32) % n_types
+
+    if randomize_steps == 0:
+        if device.communicator.rank == 0:
+            frame = gsd.hoomd.Frame()
+            frame.configuration.box = box
+            frame.configuration.dimensions = dimensions
+            frame.particles.N = N
+            frame.particles.types = types
+            frame.particles.typeid = typeid
+            frame.particles.position = position
+
+            with gsd.hoomd.open(file_path, mode='xb') as f:
+                f.append(frame)
+        return
+
+    snapshot = hoomd.Snapshot(communicator=device.communicator)
+    snapshot.configuration.box = box
+    if snapshot.communicator.rank == 0:
+        snapshot.particles.types = types
+        snapshot.particles.N = N
+        snapshot.particles.typeid[:] = typeid
+        snapshot.particles.position[:] = position
+
+    mc = hoomd.hpmc.integrate.Sphere()
+    mc.shape[types] = dict(diameter=DIAMETER)
+
+    sim = hoomd.Simulation(device=device, seed=10)
+    sim.create_state_from_snapshot(snapshot)
+    sim.operations.integrator = mc
+
+    if print_messages:
+        print(f'.. randomizing positions for {randomize_steps} steps')
+
+    sim.run(randomize_steps)
+
+    hoomd.write.GSD.write(state=sim.state, mode='xb', filename=str(file_path))
@@ -0,0 +1,75 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Generate initial configurations concurrently before running benchmarks."""
+
+import concurrent.futures
+import json
+import multiprocessing
+
+_device = None
+
+
+def _generate(parameters, verbose):
+    """Generate one configuration in a worker process."""
+    global _device  # noqa: PLW0603: one device per worker process
+
+    import hoomd
+
+    from . import make_configuration
+
+    if _device is None:
+        _device = hoomd.device.CPU(num_cpu_threads=1)
+        if not verbose:
+            _device.notice_level = 0
+
+    return str(make_configuration(device=_device, verbose=verbose, **parameters))
+
+
+def unique_configurations(requests):
+    """Remove duplicate configuration requests.
+
+    Args:
+        requests (list[dict]): Configuration parameters.
+
+    Returns:
+        list[dict]: The unique configuration parameters in the original order.
+    """
+    unique = {}
+    for parameters in requests:
+        unique.setdefault(json.dumps(parameters, sort_keys=True), parameters)
+    return list(unique.values())
+
+
+def prepare(requests, workers=None, verbose=False):
+    """Generate initial configurations in a pool of worker processes.
+
+    Args:
+        requests (list[dict]): Keyword arguments for
+          `configuration.make_configuration` (excluding ``device`` and
+          ``verbose``).
+        workers (int): Number of worker processes (defaults to the number of
+          CPUs).
+        verbose (bool): Set to True to provide details to stdout.
+
+    Each worker generates configurations on a single CPU thread. Configurations
+    that are already in the cache are not generated again, and the cache locks
+    ensure that workers requesting the same file (such as the base of
+    replicated configurations) generate it only once.
+
+    Returns:
+        list[tuple[dict, str]]: The parameters and path of each configuration.
+    """
+    requests = unique_configurations(requests)
+
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=context
+    ) as executor:
+        futures = [
+            executor.submit(_generate, parameters, verbose) for parameters in requests
+        ]
+        return [
+            (parameters, future.result())
+            for parameters, future in zip(requests, futures)
+        ]
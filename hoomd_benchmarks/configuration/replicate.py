@@ -0,0 +1,137 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Replicated initial configuration."""
+
+import functools
+
+import gsd.hoomd
+import hoomd
+import numpy
+
+from . import cache
+
+# Increment when the generated configurations change.
+GENERATOR_VERSION = 1
+
+DEFAULT_JITTER = 0.1
+
+
+def replicate_configuration(
+    base_path, replicate, device, verbose, jitter=None, relax_steps=0
+):
+    """Replicate a configuration, or find the replicated configuration in the cache.
+
+    Args:
+        base_path (pathlib.Path): Path to the GSD file to replicate.
+        replicate (int): Number of copies along each box edge.
+        device (hoomd.device.Device): Device object to execute on.
+        verbose (bool): Set to True to provide details to stdout.
+        jitter (float): Maximum translation move size in the relaxation
+          (defaults to `DEFAULT_JITTER`). Only valid with *relax_steps*.
+        relax_steps (int): Number of hard sphere Monte Carlo steps to run after
+          replicating.
+
+    Tile the periodic configuration in *base_path* ``replicate**dimensions``
+    times with NumPy array operations. The replicated configuration has the
+    same density as the base configuration and is free of overlaps when the
+    base configuration is. Set *relax_steps* to randomly displace the particles
+    with a short hard sphere Monte Carlo simulation (with translation moves up
+    to *jitter*) so that the copies are no longer identical.
+
+    Returns:
+        pathlib.Path: Path to the GSD file with the replicated configuration.
+    """
+    if jitter is not None and relax_steps == 0:
+        raise ValueError('jitter requires relax_steps > 0.')
+    if jitter is None:
+        jitter = DEFAULT_JITTER
+
+    tiled_path = cache.get_entry(
+        'replicate',
+        GENERATOR_VERSION,
+        dict(base=base_path.name, replicate=replicate),
+        device,
+        verbose,
+        functools.partial(
+            _write_tiled_frame, base_path=base_path, replicate=replicate, device=device
+        ),
+    )
+
+    if relax_steps == 0:
+        return tiled_path
+
+    return cache.get_entry(
+        'relax',
+        GENERATOR_VERSION,
+        dict(base=tiled_path.name, jitter=jitter, relax_steps=relax_steps),
+        device,
+        verbose,
+        functools.partial(
+            _relax,
+            base_path=tiled_path,
+            jitter=jitter,
+            relax_steps=relax_steps,
+            device=device,
+            verbose=verbose,
+        ),
+    )
+
+
+def _relax(file_path, base_path, jitter, relax_steps, device, verbose):
+    """Relax the configuration in base_path and write it to file_path."""
+    sim = hoomd.Simulation(device=device, seed=10)
+    sim.create_state_from_gsd(filename=str(base_path))
+
+    mc = hoomd.hpmc.integrate.Sphere(default_d=jitter)
+    mc.shape[sim.state.particle_types] = dict(diameter=1.0)
+    sim.operations.integrator = mc
+
+    if verbose and device.communicator.rank == 0:
+        print(f'.. relaxing for {relax_steps} steps')
+
+    sim.run(relax_steps)
+
+    hoomd.write.GSD.write(state=sim.state, mode='xb', filename=str(file_path))
+
+
+def _write_tiled_frame(file_path, base_path, replicate, device):
+    """Tile the first frame of base_path and write it to file_path."""
+    if device.communicator.rank != 0:
+        return
+
+    with gsd.hoomd.open(base_path, mode='rb') as base_gsd:
+        base = base_gsd[0]
+
+    dimensions = base.configuration.dimensions
+    box = numpy.array(base.configuration.box, dtype=float)
+    if numpy.any(box[3:] != 0):
+        raise ValueError('Cannot replicate triclinic boxes.')
+
+    # offsets of each copy, centered on the origin
+    copies = numpy.indices([replicate] * dimensions, dtype=float)
+    copies = copies.reshape(dimensions, -1).T
+    offsets = numpy.zeros((len(copies), 3), dtype=numpy.float32)
+    offsets[:, 0:dimensions] = (copies - (replicate - 1) / 2) * box[0:dimensions]
+
+    position = (
+        base.particles.position[numpy.newaxis, :, :] + offsets[:, numpy.newaxis, :]
+    )
+
+    replicated_box = numpy.zeros(6)
+    replicated_box[0:dimensions] = box[0:dimensions] * replicate
+
+    frame = gsd.hoomd.Frame()
+    frame.configuration.box = replicated_box
+    frame.configuration.dimensions = dimensions
+    frame.particles.N = base.particles.N * len(copies)
+    frame.particles.types = base.particles.types
+    frame.particles.position = position.reshape(-1, 3)
+    frame.particles.typeid = numpy.tile(base.particles.typeid, len(copies))
+    if base.particles.orientation is not None:
+        frame.particles.orientation = numpy.tile(
+            base.particles.orientation, (len(copies), 1)
+        )
+
+    with gsd.hoomd.open(file_path, mode='xb') as f:
+        f.append(frame)
@@ -0,0 +1,87 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""In-process cache of initial configuration snapshots."""
+
+import collections
+
+# Estimate of the memory used by one particle in a full snapshot (all per
+# particle quantities in double precision). Use an estimate that is the same on
+# all ranks so that all ranks make the same eviction decisions.
+BYTES_PER_PARTICLE = 256
+
+DEFAULT_MAX_BYTES = 4 * 1024**3
+
+
+class SnapshotCache:
+    """Least recently used cache of snapshots.
+
+    Args:
+        max_bytes (int): Maximum estimated memory used by the cached snapshots.
+          Set to 0 to disable the cache.
+
+    Benchmarks in the same process often initialize many simulations from the
+    same initial configuration. Store the snapshot (and timestep) of each loaded
+    configuration so that later simulations can initialize with
+    ``create_state_from_snapshot`` instead of reading and parsing the GSD file
+    again. Evict the least recently used snapshots when the estimated memory
+    exceeds *max_bytes*.
+
+    Snapshots store data only on rank 0, so the cache only uses significant
+    memory on rank 0.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+
+    def get(self, key):
+        """Get a cached value.
+
+        Args:
+            key (tuple): Key identifying the configuration.
+
+        Returns:
+            The cached value, or None when *key* is not in the cache.
+        """
+        if key not in self._entries:
+            return None
+
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def put(self, key, value, N):
+        """Add a value to the cache.
+
+        Args:
+            key (tuple): Key identifying the configuration.
+            value: Value to cache.
+            N (int): Number of particles in the snapshot.
+        """
+        nbytes = N * BYTES_PER_PARTICLE
+        if nbytes > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+
+        self._entries[key] = (value, nbytes)
+        self._bytes += nbytes
+
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self._bytes -= evicted_bytes
+
+    def clear(self):
+        """Remove all cached values."""
+        self._entries.clear()
+        self._bytes = 0
+
+    @property
+    def nbytes(self):
+        """int: Estimated memory used by the cached snapshots."""
+        return self._bytes
+
+
+snapshot_cache = SnapshotCache()
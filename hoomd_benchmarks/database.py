@@ -0,0 +1,529 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""SQLite database of benchmark results.
+
+The database has three tables:
+
+* ``runs``: One row for each run of the suite (or of an individual benchmark),
+  identified by the run name, host, HOOMD-blue version, and device.
+* ``executions``: One row for each completed benchmark execution in a run
+  with its parameters and summary statistics. An execution is identified by
+  its run, benchmark, parameters, and start time, so importing the same
+  records again does not add them twice.
+* ``samples``: One row for each performance sample of an execution.
+
+Add result records (see `results`) with `ResultsDatabase.add_record`, import
+JSON Lines and CSV files with `ResultsDatabase.import_file`, and query the
+results as pandas data frames with `ResultsDatabase.query`.
+
+Run ``python -m hoomd_benchmarks.database --help`` for the command line
+interface.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sqlite3
+
+import pandas
+
+from . import results
+
+DEFAULT_DATABASE = 'hoomd_benchmarks.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_key TEXT UNIQUE NOT NULL,
+    name TEXT,
+    hostname TEXT,
+    hoomd_version TEXT,
+    device TEXT,
+    num_ranks INTEGER,
+    hoomd_build TEXT,
+    start_time TEXT
+);
+CREATE TABLE IF NOT EXISTS executions (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    benchmark TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    parameters_hash TEXT NOT NULL,
+    units TEXT,
+    value REAL,
+    statistic TEXT,
+    ci_low REAL,
+    ci_high REAL,
+    summary TEXT,
+    start_time TEXT,
+    stop_time TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    execution_id INTEGER NOT NULL REFERENCES executions(id),
+    repetition INTEGER NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS runs_hoomd_version ON runs(hoomd_version);
+CREATE INDEX IF NOT EXISTS runs_hostname ON runs(hostname);
+CREATE INDEX IF NOT EXISTS executions_benchmark ON executions(benchmark);
+CREATE INDEX IF NOT EXISTS executions_parameters ON executions(parameters_hash);
+CREATE INDEX IF NOT EXISTS executions_run ON executions(run_id);
+CREATE INDEX IF NOT EXISTS samples_execution ON samples(execution_id);
+CREATE UNIQUE INDEX IF NOT EXISTS executions_unique ON executions(
+    run_id, benchmark, parameters_hash, COALESCE(start_time, '')
+);
+"""
+
+
+def get_database_path():
+    """str: The database path (``HOOMD_BENCHMARKS_DATABASE`` or the default)."""
+    return os.environ.get('HOOMD_BENCHMARKS_DATABASE', DEFAULT_DATABASE)
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True)
+
+
+def _parameters_hash(parameters):
+    return hashlib.sha256(_canonical(parameters).encode('utf-8')).hexdigest()[0:16]
+
+
+def _real(value):
+    """Store non-finite values as NULL."""
+    if value is None or not math.isfinite(value):
+        return None
+    return value
+
+
+class ResultsDatabase:
+    """SQLite store of benchmark results.
+
+    Args:
+        path (str): Path to the database file (created when it does not
+          exist).
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = get_database_path()
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def add_run(
+        self,
+        run_key,
+        name=None,
+        hostname=None,
+        hoomd_version=None,
+        device=None,
+        num_ranks=None,
+        hoomd_build=None,
+        start_time=None,
+    ):
+        """Find or add a run.
+
+        Args:
+            run_key (str): Unique key identifying the run.
+            name (str): Name of the run.
+            hostname (str): Host the run executed on.
+            hoomd_version (str): HOOMD-blue version.
+            device (str): Device type (``'CPU'`` or ``'GPU'``).
+            num_ranks (int): Number of MPI ranks.
+            hoomd_build (dict): HOOMD-blue build configuration.
+            start_time (str): Time the run started.
+
+        Returns:
+            int: The id of the run.
+        """
+        row = self.connection.execute(
+            'SELECT id FROM runs WHERE run_key = ?', (run_key,)
+        ).fetchone()
+        if row is not None:
+            return row[0]
+
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (run_key, name, hostname, hoomd_version, device, '
+                'num_ranks, hoomd_build, start_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    run_key,
+                    name,
+                    hostname,
+                    hoomd_version,
+                    device,
+                    num_ranks,
+                    _canonical(hoomd_build),
+                    start_time,
+                ),
+            )
+        return cursor.lastrowid
+
+    def add_execution(
+        self,
+        run_id,
+        benchmark,
+        value,
+        parameters=None,
+        units=None,
+        samples=(),
+        summary=None,
+        start_time=None,
+        stop_time=None,
+    ):
+        """Add a benchmark execution and its samples.
+
+        An execution that is already in the database (with the same run,
+        benchmark, parameters, and start time) is not added again.
+
+        Args:
+            run_id (int): The id of the run (see `add_run`).
+            benchmark (str): Name of the benchmark class.
+            value (float): The reported performance.
+            parameters (dict): The benchmark arguments.
+            units (str): Units of the performance.
+            samples (list[float]): The performance samples.
+            summary (dict): The summary statistics.
+            start_time (str): Time the execution started.
+            stop_time (str): Time the execution finished.
+
+        Returns:
+            int: The id of the (new or existing) execution.
+        """
+        if parameters is None:
+            parameters = {}
+        if summary is None:
+            summary = {}
+
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT OR IGNORE INTO executions (run_id, benchmark, parameters, '
+                'parameters_hash, units, value, statistic, ci_low, ci_high, '
+                'summary, start_time, stop_time) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    run_id,
+                    benchmark,
+                    _canonical(parameters),
+                    _parameters_hash(parameters),
+                    units,
+                    _real(value),
+                    summary.get('statistic'),
+                    _real(summary.get('ci_low')),
+                    _real(summary.get('ci_high')),
+                    _canonical(summary),
+                    start_time,
+                    stop_time,
+                ),
+            )
+            if cursor.rowcount == 0:
+                return self.connection.execute(
+                    'SELECT id FROM executions WHERE run_id = ? AND benchmark = ? '
+                    "AND parameters_hash = ? AND COALESCE(start_time, '') = ?",
+                    (
+                        run_id,
+                        benchmark,
+                        _parameters_hash(parameters),
+                        start_time or '',
+                    ),
+                ).fetchone()[0]
+
+            execution_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO samples (execution_id, repetition, value) '
+                'VALUES (?, ?, ?)',
+                [(execution_id, i, _real(v)) for i, v in enumerate(samples)],
+            )
+
+        return execution_id
+
+    def add_record(self, record):
+        """Add a result record.
+
+        Args:
+            record (dict): The record (see `results.make_record`).
+
+        Records of benchmarks that did not complete (``'failed'``,
+        ``'timeout'``, or ``'skipped'``) have no performance and are not
+        added.
+
+        Returns:
+            int: The id of the execution, or None when the record is not added.
+        """
+        if record.get('status', 'completed') != 'completed':
+            return None
+
+        hoomd_build = record.get('hoomd', {})
+        device = record.get('device', {})
+        host = record.get('host', {})
+
+        run_key = record.get('run_id')
+        if run_key is None:
+            run_key = _canonical(
+                [
+                    record.get('name'),
+                    host.get('hostname'),
+                    hoomd_build.get('version'),
+                    device.get('type'),
+                    device.get('num_ranks'),
+                ]
+            )
+
+        run_id = self.add_run(
+            run_key,
+            name=record.get('name'),
+            hostname=host.get('hostname'),
+            hoomd_version=hoomd_build.get('version'),
+            device=device.get('type'),
+            num_ranks=device.get('num_ranks'),
+            hoomd_build=hoomd_build,
+            start_time=record.get('start_time'),
+        )
+
+        summary = record.get('summary') or {}
+        return self.add_execution(
+            run_id,
+            record['benchmark'],
+            summary.get('value'),
+            parameters=record.get('arguments'),
+            units=record.get('units'),
+            samples=[math.nan if v is None else v for v in record.get('samples', [])],
+            summary=summary,
+            start_time=record.get('start_time'),
+            stop_time=record.get('stop_time'),
+        )
+
+    def import_jsonl(self, filename):
+        """Import the records in a JSON Lines file (see `results.JSONLWriter`).
+
+        Returns:
+            int: The number of imported executions (including executions that
+            are already in the database).
+        """
+        n = 0
+        for record in results.read_records(filename):
+            if self.add_record(record) is not None:
+                n += 1
+        return n
+
+    def import_csv(self, filename, hostname=None, device=None):
+        """Import a CSV file written by the benchmark suite's ``--output``.
+
+        Args:
+            filename (str): Name of the file.
+            hostname (str): Host the results were measured on.
+            device (str): Device the results were measured on.
+
+        Each column is a run named (and versioned) by the column header. The
+        CSV files do not record the benchmark parameters or samples.
+
+        Returns:
+            int: The number of imported executions.
+        """
+        df = pandas.read_csv(filename, index_col=0)
+
+        n = 0
+        for name in df.columns:
+            run_id = self.add_run(
+                _canonical(['csv', os.path.abspath(filename), name, hostname, device]),
+                name=name,
+                hostname=hostname,
+                hoomd_version=name,
+                device=device,
+            )
+            for benchmark, value in df[name].items():
+                if pandas.isna(value):
+                    continue
+                self.add_execution(run_id, benchmark, float(value))
+                n += 1
+
+        return n
+
+    def import_file(self, filename, hostname=None, device=None):
+        """Import a ``.jsonl`` or ``.csv`` file.
+
+        Returns:
+            int: The number of imported executions.
+        """
+        if filename.endswith('.csv'):
+            return self.import_csv(filename, hostname=hostname, device=device)
+        return self.import_jsonl(filename)
+
+    def query(
+        self,
+        benchmark=None,
+        hostname=None,
+        hoomd_version=None,
+        name=None,
+        device=None,
+        parameters=None,
+    ):
+        """Query benchmark executions.
+
+        Args:
+            benchmark (str): Select executions of this benchmark class.
+            hostname (str): Select runs on this host.
+            hoomd_version (str): Select runs with this HOOMD-blue version.
+            name (str): Select runs with this name.
+            device (str): Select runs on this device type.
+            parameters (dict): Select executions whose parameters include
+              these values.
+
+        Returns:
+            pandas.DataFrame: One row per execution with the run's ``name``,
+            ``hostname``, ``hoomd_version``, ``device``, ``num_ranks``, and the
+            execution's ``benchmark``, ``value``, ``statistic``, ``ci_low``,
+            ``ci_high``, ``units``, ``parameters``, and ``start_time``.
+        """
+        conditions = []
+        values = []
+        for column, value in (
+            ('executions.benchmark', benchmark),
+            ('runs.hostname', hostname),
+            ('runs.hoomd_version', hoomd_version),
+            ('runs.name', name),
+            ('runs.device', device),
+        ):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                values.append(value)
+
+        sql = (
+            'SELECT executions.id AS execution_id, runs.name, runs.hostname, '
+            'runs.hoomd_version, runs.device, runs.num_ranks, '
+            'executions.benchmark, executions.value, executions.statistic, '
+            'executions.ci_low, executions.ci_high, executions.units, '
+            'executions.parameters, executions.start_time '
+            'FROM executions JOIN runs ON executions.run_id = runs.id'
+        )
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY executions.id'
+
+        df = pandas.read_sql_query(sql, self.connection, params=values)
+
+        if parameters:
+            keep = [
+                all(json.loads(p).get(k) == v for k, v in parameters.items())
+                for p in df['parameters']
+            ]
+            df = df[keep]
+
+        return df
+
+    def samples(self, execution_id):
+        """Get the performance samples of an execution.
+
+        Returns:
+            list[float]: The samples in order (``nan`` for missing values).
+        """
+        rows = self.connection.execute(
+            'SELECT value FROM samples WHERE execution_id = ? ORDER BY repetition',
+            (execution_id,),
+        ).fetchall()
+        return [math.nan if row[0] is None else row[0] for row in rows]
+
+
+def history(df):
+    """Pivot queried executions to one column per run name.
+
+    Args:
+        df (pandas.DataFrame): Executions from `ResultsDatabase.query`.
+
+    Returns:
+        pandas.DataFrame: The mean value of each benchmark (rows) in each run
+        (columns), in the order the runs were added.
+    """
+    return df.pivot_table(
+        index='benchmark', columns='name', values='value', aggfunc='mean', sort=False
+    )
+
+
+def main():
+    """Implement the command line interface."""
+    parser = argparse.ArgumentParser(
+        prog='python -m hoomd_benchmarks.database',
+        description='Manage the SQLite database of benchmark results.',
+    )
+    parser.add_argument(
+        '--database',
+        type=str,
+        default=get_database_path(),
+        help='Path to the database file.',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser(
+        'import', help='Import .jsonl result records or .csv suite output.'
+    )
+    import_parser.add_argument('files', nargs='+', help='Files to import.')
+    import_parser.add_argument(
+        '--hostname', type=str, help='Host the CSV results were measured on.'
+    )
+    import_parser.add_argument(
+        '--device', type=str, help='Device the CSV results were measured on.'
+    )
+
+    query_parser = subparsers.add_parser('query', help='Query benchmark results.')
+    query_parser.add_argument('--benchmark', type=str, help='Benchmark class name.')
+    query_parser.add_argument('--hostname', type=str, help='Host name.')
+    query_parser.add_argument('--version', type=str, help='HOOMD-blue version.')
+    query_parser.add_argument('--name', type=str, help='Run name.')
+    query_parser.add_argument('--device', type=str, help='Device type.')
+    query_parser.add_argument(
+        '--parameter',
+        type=str,
+        nargs=2,
+        action='append',
+        metavar=('NAME', 'VALUE'),
+        help='Select executions with this parameter value (JSON). May be repeated.',
+    )
+    query_parser.add_argument(
+        '--history',
+        action='store_true',
+        help='Show one column per run instead of one row per execution.',
+    )
+
+    args = parser.parse_args()
+    database = ResultsDatabase(args.database)
+
+    if args.command == 'import':
+        for filename in args.files:
+            n = database.import_file(
+                filename, hostname=args.hostname, device=args.device
+            )
+            print(f'Imported {n} executions from {filename}')
+    elif args.command == 'query':
+        parameters = None
+        if args.parameter is not None:
+            parameters = {name: json.loads(value) for name, value in args.parameter}
+
+        df = database.query(
+            benchmark=args.benchmark,
+            hostname=args.hostname,
+            hoomd_version=args.version,
+            name=args.name,
+            device=args.device,
+            parameters=parameters,
+        )
+        if args.history:
+            df = history(df)
+        else:
+            df = df.drop(columns=['execution_id', 'parameters'])
+
+        with pandas.option_context('display.max_rows', None, 'display.width', None):
+            print(df)
+
+    database.close()
+
+
+if __name__ == '__main__':
+    main()
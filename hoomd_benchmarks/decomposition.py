@@ -0,0 +1,392 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Sweep the MPI domain decomposition of a benchmark.
+
+A domain decomposition is a list of three axes (x, y, z). Each axis is the
+number of evenly spaced domains in that direction or a list with the fraction
+of the box in each domain (see `hoomd.Simulation.create_state_from_gsd`).
+Benchmarks accept one with the ``domain_decomposition`` argument.
+
+`layouts` enumerates every grid ``(nx, ny, nz)`` with ``nx * ny * nz`` equal to
+the rank count and, optionally, skewed split fractions along each decomposed
+axis. `run_sweep` executes a benchmark on each layout in isolated workers and
+`analyze` ranks the layouts by performance along with their ghost particle
+counts.
+
+Run ``python -m hoomd_benchmarks.decomposition --help`` for the command line
+interface. Counting particles on more than one rank requires mpi4py.
+"""
+
+import itertools
+
+import numpy
+import pandas
+
+from . import mpi, results, scaling, worker
+
+SWEEP_OPTIONS = (
+    'benchmark',
+    'ranks',
+    'skew',
+    'launcher',
+    'timeout',
+    'jsonl',
+    'output',
+)
+
+COLUMNS = [
+    'grid',
+    'split_fractions',
+    'value',
+    'ghost_particles',
+    'max_ghost_particles',
+    'imbalance',
+]
+
+
+def parse_axis(value):
+    """Parse one axis of a domain decomposition.
+
+    Args:
+        value (int | str | list[float]): The number of domains, a list of split
+          fractions, or a string with either (for example, ``'2'`` or
+          ``'0.3,0.7'``).
+
+    Returns:
+        int | list[float]: The number of domains or the split fractions.
+    """
+    if isinstance(value, str):
+        if ',' not in value:
+            return int(value)
+
+        value = value.split(',')
+
+    if isinstance(value, (list, tuple)):
+        return [float(fraction) for fraction in value]
+
+    return int(value)
+
+
+def parse_domain_decomposition(values):
+    """Parse a domain decomposition.
+
+    Args:
+        values (list): The three axes (see `parse_axis`), or None.
+
+    Returns:
+        list: The parsed axes, or None.
+    """
+    if values is None:
+        return None
+
+    if len(values) != 3:  # noqa: PLR2004: x, y, and z
+        raise ValueError('A domain decomposition has three axes.')
+
+    return [parse_axis(value) for value in values]
+
+
+def to_hoomd(domain_decomposition):
+    """Convert a domain decomposition to the form HOOMD-blue accepts.
+
+    HOOMD-blue takes either three numbers of domains or three lists of split
+    fractions, so convert the evenly spaced axes to fractions when any axis
+    has split fractions.
+
+    Returns:
+        tuple: The ``domain_decomposition`` argument of
+        `hoomd.Simulation.create_state_from_gsd`.
+    """
+    if domain_decomposition is None:
+        return (None, None, None)
+
+    if all(isinstance(axis, int) for axis in domain_decomposition):
+        return tuple(domain_decomposition)
+
+    return tuple(
+        [1 / axis] * axis if isinstance(axis, int) else list(axis)
+        for axis in domain_decomposition
+    )
+
+
+def factorizations(ranks, dimensions=3):
+    """Find every domain grid for a number of ranks.
+
+    Args:
+        ranks (int): Number of MPI ranks.
+        dimensions (int): Number of dimensions (2 or 3). 2D grids have one
+          domain in z.
+
+    Returns:
+        list[tuple[int, int, int]]: The grids ``(nx, ny, nz)`` with
+        ``nx * ny * nz == ranks``.
+    """
+    grids = []
+    for nx in range(1, ranks + 1):
+        if ranks % nx != 0:
+            continue
+
+        for ny in range(1, ranks // nx + 1):
+            if (ranks // nx) % ny != 0:
+                continue
+
+            nz = ranks // (nx * ny)
+            if dimensions == 2 and nz != 1:  # noqa: PLR2004: 2 is not magic
+                continue
+            grids.append((nx, ny, nz))
+
+    return grids
+
+
+def skewed_fractions(n, skew):
+    """Split an axis into domains with linearly increasing widths.
+
+    Args:
+        n (int): Number of domains.
+        skew (float): Relative width change from the center to the last
+          domain (``0 <= skew < 1``). The first domain is ``1 - skew`` and the
+          last ``1 + skew`` times the mean width.
+
+    Returns:
+        list[float]: The split fractions.
+    """
+    if not 0 <= skew < 1:
+        raise ValueError('skew must be in [0, 1).')
+
+    widths = 1 + skew * numpy.linspace(-1, 1, n)
+    return [float(width) for width in widths / widths.sum()]
+
+
+def layouts(ranks, dimensions=3, skews=()):
+    """Enumerate the domain decompositions for a number of ranks.
+
+    Args:
+        ranks (int): Number of MPI ranks.
+        dimensions (int): Number of dimensions (2 or 3).
+        skews (list[float]): For each skew (see `skewed_fractions`), add a
+          layout with skewed split fractions along each axis that has more
+          than one domain.
+
+    Returns:
+        list[list]: The domain decompositions.
+    """
+    decompositions = []
+    for grid in factorizations(ranks, dimensions):
+        decompositions.append(list(grid))
+
+        for skew, axis in itertools.product(skews, range(3)):
+            if grid[axis] > 1:
+                decomposition = list(grid)
+                decomposition[axis] = skewed_fractions(grid[axis], skew)
+                decompositions.append(decomposition)
+
+    return decompositions
+
+
+def particle_counts(sim):
+    """Count the particles in the local domain of this rank.
+
+    Returns:
+        tuple[int, int]: The number of local and ghost particles.
+    """
+    with sim.state.cpu_local_snapshot as snapshot:
+        return (
+            len(snapshot.particles.position),
+            len(snapshot.particles.ghost_position),
+        )
+
+
+def summarize(sim):
+    """Summarize the particle distribution of a decomposed simulation.
+
+    Call on all ranks after the simulation has run (HOOMD-blue exchanges ghost
+    particles during the run).
+
+    Returns:
+        dict: The particles on each rank (``local_particles`` and
+        ``ghost_particles``) and the ``imbalance``
+        factor (the maximum number of local particles divided by the mean) on
+        rank 0. None on the other ranks.
+    """
+    counts = mpi.gather(sim.device.communicator, particle_counts(sim))
+    if counts is None:
+        return None
+
+    local = [count[0] for count in counts]
+    return results.to_json(
+        dict(
+            local_particles=local,
+            ghost_particles=[count[1] for count in counts],
+            imbalance=max(local) / numpy.mean(local),
+        )
+    )
+
+
+def run_sweep(
+    benchmark_name,
+    arguments,
+    device,
+    ranks,
+    decompositions,
+    launcher=scaling.DEFAULT_LAUNCHER,
+    **kwargs,
+):
+    """Execute a benchmark with each domain decomposition.
+
+    Args:
+        benchmark_name (str): Name of the benchmark class.
+        arguments (dict): Benchmark arguments.
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        ranks (int): Number of MPI ranks.
+        decompositions (list[list]): The domain decompositions (see
+          `layouts`).
+        launcher (str): Command that launches the MPI workers. ``{ranks}`` is
+          replaced by the rank count.
+        kwargs: Additional arguments for `worker.run_isolated`.
+
+    Returns:
+        list[dict]: The result record of each decomposition.
+    """
+    records = []
+    for decomposition in decompositions:
+        print(f'Running {benchmark_name} with decomposition {decomposition}')
+        records.append(
+            worker.run_isolated(
+                benchmark_name,
+                dict(arguments, domain_decomposition=decomposition),
+                device,
+                launcher=launcher.format(ranks=ranks),
+                **kwargs,
+            )
+        )
+
+    return records
+
+
+def analyze(records):
+    """Rank the domain decompositions by performance.
+
+    Args:
+        records (list[dict]): The result records (see `run_sweep`).
+
+    Returns:
+        pandas.DataFrame: One row per decomposition (see `COLUMNS`), from the
+        best to the worst performance. ``ghost_particles`` is the total over
+        all ranks.
+    """
+    rows = []
+    for record in records:
+        decomposition = record['arguments']['domain_decomposition']
+        row = dict(
+            grid=tuple(
+                axis if isinstance(axis, int) else len(axis) for axis in decomposition
+            ),
+            split_fractions=None,
+            value=numpy.nan,
+            ghost_particles=numpy.nan,
+            max_ghost_particles=numpy.nan,
+            imbalance=numpy.nan,
+        )
+        if any(isinstance(axis, list) for axis in decomposition):
+            row['split_fractions'] = decomposition
+
+        if record['status'] == 'completed':
+            row['value'] = record['summary']['value']
+            summary = record['summary'].get('decomposition')
+            if summary is not None:
+                row['ghost_particles'] = sum(summary['ghost_particles'])
+                row['max_ghost_particles'] = max(summary['ghost_particles'])
+                row['imbalance'] = summary['imbalance']
+
+        rows.append(row)
+
+    df = pandas.DataFrame(rows, columns=COLUMNS, dtype=object)
+    df['value'] = df['value'].astype(float)
+    return df.sort_values('value', ascending=False, ignore_index=True)
+
+
+def add_sweep_arguments(parser):
+    """Add the decomposition sweep options to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+    """
+    parser.add_argument('--ranks', type=int, required=True, help='Number of MPI ranks.')
+    parser.add_argument(
+        '--skew',
+        type=float,
+        nargs='+',
+        default=[],
+        help='Also sweep skewed split fractions with these skews (0 to 1).',
+    )
+    parser.add_argument(
+        '--launcher',
+        type=str,
+        default=scaling.DEFAULT_LAUNCHER,
+        help='MPI launcher command, {ranks} is replaced by the number of ranks.',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='Stop runs that take longer than this many seconds.',
+    )
+    parser.add_argument(
+        '--jsonl',
+        type=str,
+        default=None,
+        help='Append the result record of each decomposition to this file.',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=str,
+        default=None,
+        help='Write the ranked decompositions to this CSV file.',
+    )
+
+
+def main():
+    """Implement the command line interface."""
+    from .suite import make_driver_parser
+
+    parser = make_driver_parser(
+        'python -m hoomd_benchmarks.decomposition',
+        'Sweep the MPI domain decomposition of a benchmark.',
+    )
+    add_sweep_arguments(parser)
+    args = parser.parse_args()
+
+    arguments = vars(args).copy()
+    for name in (*SWEEP_OPTIONS, 'device', 'domain_decomposition'):
+        del arguments[name]
+
+    records = run_sweep(
+        args.benchmark,
+        arguments,
+        args.device,
+        args.ranks,
+        layouts(args.ranks, args.dimensions, args.skew),
+        launcher=args.launcher,
+        run_id=results.new_run_id(),
+        timeout=args.timeout,
+    )
+
+    if args.jsonl is not None:
+        writer = results.JSONLWriter(args.jsonl)
+        for record in records:
+            writer.write(record)
+
+    df = analyze(records)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            f.write(df.to_csv(index=False))
+
+    print(df.to_string(index=False))
+    if len(df) > 0:
+        print(f'Best: {df["grid"].iloc[0]} {df["split_fractions"].iloc[0] or ""}')
+        print(f'Worst: {df["grid"].iloc[-1]} {df["split_fractions"].iloc[-1] or ""}')
+
+
+if __name__ == '__main__':
+    main()
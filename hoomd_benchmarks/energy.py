@@ -0,0 +1,115 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Measure energy with the Linux RAPL powercap counters."""
+
+import math
+import pathlib
+
+POWERCAP_ROOT = '/sys/class/powercap'
+
+
+class RaplReader:
+    """Read the RAPL package energy counters.
+
+    Args:
+        root (str): Path to the powercap sysfs directory. Pass the path to a
+          directory with the same layout to read other counters (for example,
+          in tests).
+
+    The reader sums the ``energy_uj`` counters of the top level
+    ``intel-rapl:<package>`` domains. Subdomains (``intel-rapl:<package>:<n>``)
+    are included in their package and are not read. The counters measure the
+    energy of the whole node, not just this process.
+
+    Each counter counts from 0 to ``max_energy_range_uj`` and then wraps
+    around to 0 (modulo ``max_energy_range_uj + 1``). `energy` corrects for
+    one wraparound per domain between reads and cannot detect more, so the
+    time between reads must be shorter than the wraparound period
+    ``(max_energy_range_uj + 1) / power``. For example, a package with the
+    common range of about 262 kJ wraps every 17 minutes at 250 W, so
+    benchmark repetitions (the time between reads) must be shorter than that.
+    """
+
+    def __init__(self, root=POWERCAP_ROOT):
+        self.domains = []
+        for path in sorted(pathlib.Path(root).glob('intel-rapl:*')):
+            if path.name.count(':') != 1:
+                continue
+
+            try:
+                (path / 'energy_uj').read_text()
+                max_range = int((path / 'max_energy_range_uj').read_text())
+            except (OSError, ValueError):
+                continue
+
+            self.domains.append((path, max_range))
+
+    @property
+    def available(self):
+        """bool: True when at least one counter is readable."""
+        return len(self.domains) > 0
+
+    def read(self):
+        """Read the counters.
+
+        Returns:
+            list[int]: The value of each counter in microjoules.
+        """
+        return [int((path / 'energy_uj').read_text()) for path, _ in self.domains]
+
+    def energy(self, start, end):
+        """Compute the energy consumed between two reads.
+
+        Args:
+            start (list[int]): Counters from `read`.
+            end (list[int]): Counters from a later call to `read`.
+
+        Returns:
+            float: The energy in joules.
+        """
+        total = 0
+        for (_, max_range), a, b in zip(self.domains, start, end):
+            difference = b - a
+            if difference < 0:
+                difference += max_range + 1
+            total += difference
+
+        return total / 1e6
+
+
+def summarize(repetitions, N):
+    """Summarize the energy measured in benchmark repetitions.
+
+    Args:
+        repetitions (list[tuple[float, float, int]]): The energy (joules),
+          wall time (seconds), and number of steps of each repetition.
+        N (int): Number of particles.
+
+    Returns:
+        dict: Totals over all repetitions: ``joules``, ``seconds``, mean
+        ``power`` (watts), ``joules_per_step``, ``joules_per_particle_step``,
+        and ``tps_per_watt`` (``nan`` when there are no repetitions).
+    """
+    joules = sum(repetition[0] for repetition in repetitions)
+    seconds = sum(repetition[1] for repetition in repetitions)
+    steps = sum(repetition[2] for repetition in repetitions)
+
+    if joules <= 0 or seconds <= 0 or steps <= 0:
+        return dict(
+            joules=joules,
+            seconds=seconds,
+            power=math.nan,
+            joules_per_step=math.nan,
+            joules_per_particle_step=math.nan,
+            tps_per_watt=math.nan,
+        )
+
+    return dict(
+        joules=joules,
+        seconds=seconds,
+        power=joules / seconds,
+        joules_per_step=joules / steps,
+        joules_per_particle_step=joules / (steps * N),
+        tps_per_watt=steps / joules,
+    )
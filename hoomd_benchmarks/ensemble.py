@@ -0,0 +1,265 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Measure the throughput of an ensemble of independent simulations.
+
+`run_ensemble` splits the MPI world into partitions with
+`hoomd.communicator.Communicator` and executes one instance of a benchmark in
+each partition. Every instance has ``N`` particles. `analyze` sums the
+particle steps per second (``N`` times the time steps or sweeps per second) of
+all instances and divides by the number of nodes, so ensembles with different
+numbers of partitions compare directly with one large simulation on all ranks.
+
+Run the driver with an MPI launcher. It executes the ensemble once for each
+value of ``--ranks_per_partition``. For example, add ``-N 4000
+--ranks_per_partition 1 64`` to compare 64 instances with 4000 particles each
+to one instance on all 64 ranks::
+
+    mpirun -n 64 python -m hoomd_benchmarks.ensemble --benchmark MDPairLJ ...
+
+Run ``python -m hoomd_benchmarks.ensemble --help`` for the command line
+interface. Gathering the results on more than one rank requires mpi4py.
+"""
+
+import math
+import socket
+import types
+
+import hoomd
+import pandas
+
+from . import common, mpi, results
+
+ENSEMBLE_OPTIONS = ('benchmark', 'ranks_per_partition', 'jsonl', 'output')
+
+COLUMNS = [
+    'partitions',
+    'ranks_per_partition',
+    'nodes',
+    'N',
+    'value',
+    'particle_steps_per_second',
+    'particle_steps_per_second_per_node',
+    'relative',
+]
+
+
+def run_ensemble(
+    benchmark_class, arguments, device, ranks_per_partition, name=None, run_id=None
+):
+    """Execute one instance of a benchmark in each partition.
+
+    Call on all ranks.
+
+    Args:
+        benchmark_class (type): The benchmark class.
+        arguments (dict): Keyword arguments for the benchmark constructor
+          (excluding ``device``).
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        ranks_per_partition (int): Number of MPI ranks in each partition.
+        name (str): Name identifying the benchmark run.
+        run_id (str): Identifier shared by all records of one run.
+
+    Each record has an ``ensemble`` field with the ``partition`` index, the
+    number of ``partitions``, ``ranks_per_partition``, and the number of
+    ``nodes`` (distinct host names) in the MPI world.
+
+    Returns:
+        list[dict]: The result record of each partition on rank 0 of the
+        world. None on the other ranks.
+    """
+    world = hoomd.communicator.Communicator()
+    if world.num_ranks % ranks_per_partition != 0:
+        raise ValueError(
+            f'{world.num_ranks} ranks do not split into partitions of '
+            f'{ranks_per_partition}.'
+        )
+
+    communicator = hoomd.communicator.Communicator(
+        ranks_per_partition=ranks_per_partition
+    )
+
+    # Print the status messages of the first partition only.
+    arguments = dict(
+        arguments,
+        verbose=arguments.get('verbose', False) and communicator.partition == 0,
+    )
+    benchmark = benchmark_class(
+        device=common.make_hoomd_device(
+            types.SimpleNamespace(device=device, verbose=arguments['verbose']),
+            communicator,
+        ),
+        **arguments,
+    )
+
+    start_time = results.timestamp()
+    performance = benchmark.execute()
+    stop_time = results.timestamp()
+
+    record = None
+    if communicator.rank == 0:
+        record = results.make_record(
+            benchmark, performance, start_time, stop_time, name=name, run_id=run_id
+        )
+
+    gathered = mpi.gather(world, (socket.gethostname(), record))
+    if gathered is None:
+        return None
+
+    nodes = len({hostname for hostname, _ in gathered})
+    records = [record for _, record in gathered if record is not None]
+    for partition, record in enumerate(records):
+        record['ensemble'] = dict(
+            partition=partition,
+            partitions=communicator.num_partitions,
+            ranks_per_partition=ranks_per_partition,
+            nodes=nodes,
+        )
+
+    return records
+
+
+def analyze(records):
+    """Compute the aggregate throughput of each ensemble.
+
+    Args:
+        records (list[dict]): The result records (see `run_ensemble`).
+
+    ``value`` is the mean performance of the instances in an ensemble. An
+    instance that did not complete, or has no value, makes the metrics of its
+    ensemble ``nan``.
+    ``relative`` is the throughput per node relative to the ensemble with the
+    fewest partitions (typically one simulation on all ranks).
+
+    Returns:
+        pandas.DataFrame: One row per ensemble (see `COLUMNS`), sorted by the
+        number of partitions.
+    """
+    ensembles = {}
+    for record in records:
+        ensemble = record['ensemble']
+        ensembles.setdefault(
+            (ensemble['partitions'], ensemble['ranks_per_partition']), []
+        ).append(record)
+
+    rows = []
+    for (partitions, ranks_per_partition), members in sorted(ensembles.items()):
+        values = []
+        for member in members:
+            value = math.nan
+            if (
+                member['status'] == 'completed'
+                and member['summary']['value'] is not None
+            ):
+                value = member['summary']['value']
+            values.append(value)
+        particle_steps = sum(
+            value * member['arguments']['N'] for value, member in zip(values, members)
+        )
+        nodes = members[0]['ensemble']['nodes']
+        rows.append(
+            dict(
+                partitions=partitions,
+                ranks_per_partition=ranks_per_partition,
+                nodes=nodes,
+                N=members[0]['arguments']['N'],
+                value=sum(values) / len(values),
+                particle_steps_per_second=particle_steps,
+                particle_steps_per_second_per_node=particle_steps / nodes,
+            )
+        )
+
+    df = pandas.DataFrame(rows, columns=COLUMNS)
+    if len(df) > 0:
+        df['relative'] = (
+            df['particle_steps_per_second_per_node']
+            / df['particle_steps_per_second_per_node'].iloc[0]
+        )
+    return df
+
+
+def add_ensemble_arguments(parser):
+    """Add the ensemble options to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+    """
+    parser.add_argument(
+        '--ranks_per_partition',
+        type=int,
+        nargs='+',
+        default=[1],
+        help='Numbers of MPI ranks in each partition.',
+    )
+    parser.add_argument(
+        '--jsonl',
+        type=str,
+        default=None,
+        help='Append the result record of each instance to this JSON Lines file.',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=str,
+        default=None,
+        help='Write the ensemble throughput to this CSV file.',
+    )
+
+
+def main():
+    """Implement the command line interface."""
+    from .suite import make_driver_parser, select_benchmarks
+
+    parser = make_driver_parser(
+        'python -m hoomd_benchmarks.ensemble',
+        'Measure the throughput of an ensemble of independent simulations.',
+    )
+    add_ensemble_arguments(parser)
+    args = parser.parse_args()
+    benchmark_class = select_benchmarks(args.benchmark)[0]
+
+    arguments = vars(args).copy()
+    for name in (*ENSEMBLE_OPTIONS, 'device'):
+        del arguments[name]
+
+    world = hoomd.communicator.Communicator()
+    for ranks_per_partition in args.ranks_per_partition:
+        if world.num_ranks % ranks_per_partition != 0:
+            parser.error(
+                f'--ranks_per_partition {ranks_per_partition} does not divide '
+                f'{world.num_ranks} ranks'
+            )
+
+    run_id = mpi.broadcast(world, results.new_run_id())
+    records = []
+    for ranks_per_partition in args.ranks_per_partition:
+        if world.rank == 0:
+            print(
+                f'Running {world.num_ranks // ranks_per_partition} instances of '
+                f'{args.benchmark} on {ranks_per_partition} ranks each',
+                flush=True,
+            )
+
+        ensemble = run_ensemble(
+            benchmark_class, arguments, args.device, ranks_per_partition, run_id=run_id
+        )
+        if ensemble is not None:
+            records.extend(ensemble)
+
+    if world.rank != 0:
+        return
+
+    if args.jsonl is not None:
+        writer = results.JSONLWriter(args.jsonl)
+        for record in records:
+            writer.write(record)
+
+    df = analyze(records)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            f.write(df.to_csv(index=False))
+    print(df.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -21,6 +21,19 @@ class HPMCBenchmark(common.Benchmark):
         """Get the performance in sweeps per second."""
         return self.sim.operations.integrator.mps / self.sim.state.N_particles
 
+    def warmup_observables(self):
+        """Add the HPMC acceptance ratios to the warmup observables."""
+        observables = super().warmup_observables()
+
+        t = self.sim.operations.integrator.translate_moves
+        r = self.sim.operations.integrator.rotate_moves
+        if sum(t) > 0:
+            observables['translate_acceptance'] = t[0] / sum(t)
+        if sum(r) > 0:
+            observables['rotate_acceptance'] = r[0] / sum(r)
+
+        return observables
+
     def run(self, steps):
         """Run the benchmark and report HPMC specific info in verbose mode."""
         super().run(steps)
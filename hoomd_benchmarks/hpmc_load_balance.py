@@ -0,0 +1,24 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Hard sphere Monte Carlo load balancing benchmark."""
+
+from . import hpmc_sphere, load_balance
+
+
+class HPMCLoadBalance(load_balance.LoadBalanceBenchmark, hpmc_sphere.HPMCSphere):
+    """Hard particle Monte Carlo sphere benchmark of an inhomogeneous system.
+
+    See Also:
+        `load_balance.LoadBalanceBenchmark`, `hpmc_base.HPMCBenchmark`
+    """
+
+    @staticmethod
+    def make_argument_parser():
+        """Make an ArgumentParser instance for benchmark options."""
+        parser = hpmc_sphere.HPMCSphere.make_argument_parser()
+        return load_balance.LoadBalanceBenchmark.add_load_balance_arguments(parser)
+
+
+if __name__ == '__main__':
+    HPMCLoadBalance.main()
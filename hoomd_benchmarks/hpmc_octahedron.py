@@ -6,7 +6,6 @@
 import hoomd
 
 from . import hpmc_base
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 
 class HPMCOctahedron(hpmc_base.HPMCBenchmark):
@@ -18,14 +17,6 @@ class HPMCOctahedron(hpmc_base.HPMCBenchmark):
 
     def make_simulation(self):
         """Make the Simulation object."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         mc = hoomd.hpmc.integrate.ConvexPolyhedron()
         mc.shape['A'] = dict(
             vertices=[
@@ -39,7 +30,7 @@ class HPMCOctahedron(hpmc_base.HPMCBenchmark):
         )
 
         sim = hoomd.Simulation(device=self.device, seed=100)
-        sim.create_state_from_gsd(filename=str(path))
+        self.create_state(sim)
         sim.operations.integrator = mc
 
         return sim
@@ -6,7 +6,6 @@
 import hoomd
 
 from . import common, hpmc_base
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 DEFAULT_MODE = 'compiled'
 
@@ -46,19 +45,11 @@ class HPMCPair(hpmc_base.HPMCBenchmark):
 
     def make_simulation(self):
         """Make the Simulation object."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         integrator = hoomd.hpmc.integrate.Sphere(default_d=0.18)
         integrator.shape['A'] = dict(diameter=self.diameter)
 
         sim = hoomd.Simulation(device=self.device, seed=10)
-        sim.create_state_from_gsd(filename=str(path))
+        self.create_state(sim)
 
         if self.mode == 'compiled':
             pair = self.pair_class(**self.pair_class_args)
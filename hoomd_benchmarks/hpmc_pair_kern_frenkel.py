@@ -6,7 +6,6 @@
 import hoomd
 
 from . import hpmc_pair
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 
 class HPMCPairKernFrenkel(hpmc_pair.HPMCPair):
@@ -41,19 +40,11 @@ class HPMCPairKernFrenkel(hpmc_pair.HPMCPair):
 
     def make_simulation(self):
         """Make the Simulation object."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         integrator = hoomd.hpmc.integrate.Sphere(default_d=0)
         integrator.shape['A'] = dict(diameter=self.diameter, orientable=True)
 
         sim = hoomd.Simulation(device=self.device, seed=10)
-        sim.create_state_from_gsd(filename=str(path))
+        self.create_state(sim)
 
         if self.mode == 'compiled':
             square_well = hoomd.hpmc.pair.Step()
@@ -7,7 +7,6 @@ import hoomd
 import numpy
 
 from . import common, hpmc_base
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 DEFAULT_MODE = 'compiled'
 DEFAULT_LEAF_CAPACITY = 0
@@ -64,19 +63,11 @@ class HPMCPairUnionWCA(hpmc_base.HPMCBenchmark):
 
     def make_simulation(self):
         """Make the Simulation object."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         integrator = hoomd.hpmc.integrate.Sphere(default_d=0.3, default_a=0.4)
         integrator.shape['A'] = dict(diameter=0, orientable=True)
 
         sim = hoomd.Simulation(device=self.device, seed=10)
-        sim.create_state_from_gsd(filename=str(path))
+        self.create_state(sim)
 
         sigma = 0.1
         r_cut = 2 ** (1 / 6) * sigma
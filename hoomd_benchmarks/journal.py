@@ -0,0 +1,123 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Journal completed suite entries so that interrupted runs can resume.
+
+The journal is a JSON Lines file of result records (see `results`). The suite
+appends each record as soon as the benchmark finishes and tags it with the
+``journal_key`` of its entry: the benchmark, its arguments, the device, the run
+name, and the HOOMD-blue version. A later run with the same journal skips the
+entries that have a completed record. The journal is also a regular results
+file that `database` and `compare` read at any time.
+"""
+
+import hashlib
+import json
+import os
+
+from . import mpi, results
+
+
+def entry_key(benchmark, arguments, device, name, version):
+    """Compute the key that identifies one suite entry.
+
+    Args:
+        benchmark (str): Name of the benchmark class.
+        arguments (dict): Arguments of the benchmark (excluding ``device``).
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        name (str): Name identifying the benchmark run.
+        version (str): HOOMD-blue version.
+
+    Returns:
+        str: The key.
+    """
+    entry = dict(
+        benchmark=benchmark,
+        arguments=results.to_json(arguments),
+        device=device,
+        name=name,
+        version=version,
+    )
+    text = json.dumps(entry, sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _truncate_incomplete_line(filename):
+    """Remove an incomplete last line left by a job that was killed."""
+    if not os.path.isfile(filename):
+        return
+
+    with open(filename, 'rb+') as f:
+        data = f.read()
+        if len(data) > 0 and not data.endswith(b'\n'):
+            f.truncate(data.rfind(b'\n') + 1)
+
+
+class Journal:
+    """Record completed suite entries in a JSON Lines file.
+
+    Args:
+        filename (str): Name of the journal file. The journal reads existing
+          records from the file and appends new ones.
+        communicator (hoomd.communicator.Communicator): Communicator of the
+          MPI ranks that share the journal (None for a single process).
+
+    Only rank 0 reads, repairs, and writes the file. It broadcasts the
+    completed entries so that all ranks skip the same benchmarks.
+    """
+
+    def __init__(self, filename, communicator=None):
+        self.filename = filename
+        is_root = communicator is None or communicator.rank == 0
+
+        completed = None
+        if is_root:
+            _truncate_incomplete_line(filename)
+            completed = {}
+            if os.path.isfile(filename):
+                for record in results.read_records(filename):
+                    key = record.get('journal_key')
+                    if key is not None and record['status'] == 'completed':
+                        completed[key] = record
+
+        if communicator is not None:
+            completed = mpi.broadcast(communicator, completed)
+        self.completed = completed
+
+        self._writer = None
+        if is_root:
+            self._writer = results.JSONLWriter(filename)
+
+    def is_completed(self, key):
+        """bool: True when the journal has a completed record for *key*."""
+        return key in self.completed
+
+    def run_id(self, name):
+        """Find the run identifier of a resumed run.
+
+        Args:
+            name (str): Name identifying the benchmark run.
+
+        Returns:
+            str: The ``run_id`` of the journaled records with the given name,
+            or None when there are none.
+        """
+        for record in self.completed.values():
+            if record['name'] == name:
+                return record['run_id']
+
+        return None
+
+    def write(self, key, record):
+        """Append a record to the journal.
+
+        Args:
+            key (str): The entry key (see `entry_key`).
+            record (dict): The result record.
+        """
+        record['journal_key'] = key
+        if record['status'] == 'completed':
+            self.completed[key] = record
+
+        if self._writer is not None:
+            self._writer.write(record)
@@ -0,0 +1,140 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Record the wall time of individual time steps."""
+
+import time
+
+import hoomd
+import numpy
+
+DEFAULT_CAPACITY = 1_000_000
+PERCENTILES = (50, 90, 99)
+
+
+class _TimestampAction(hoomd.custom.Action):
+    """Store the wall clock time and timestep in preallocated ring buffers."""
+
+    def __init__(self, capacity):
+        super().__init__()
+        self.times = numpy.zeros(capacity, dtype=numpy.float64)
+        self.timesteps = numpy.zeros(capacity, dtype=numpy.int64)
+        self.segments = numpy.zeros(capacity, dtype=numpy.int64)
+        self.count = 0
+        self.segment = 0
+
+    def act(self, timestep):
+        i = self.count % len(self.times)
+        self.times[i] = time.perf_counter()
+        self.timesteps[i] = timestep
+        self.segments[i] = self.segment
+        self.count += 1
+
+
+class LatencyRecorder:
+    """Record the wall time of every ``period`` time steps.
+
+    Args:
+        sim (hoomd.Simulation): Simulation to record.
+        period (int): Record the time every ``period`` steps.
+        capacity (int): Number of records to keep. When full, the oldest
+          records are overwritten.
+
+    `LatencyRecorder` adds a `hoomd.write.CustomWriter` to the simulation
+    that stores a timestamp in a preallocated NumPy ring buffer. The latency
+    is the time between consecutive records divided by the number of steps
+    between them, so a spike (for example, a neighbor list rebuild or a GSD
+    flush) appears in the distribution instead of being averaged into the
+    mean time steps per second. Each call to the writer costs a Python
+    callback; increase *period* to reduce the overhead in fast simulations.
+
+    Call `new_segment` before each `hoomd.Simulation.run` so that the time
+    spent between runs is excluded.
+
+    Note:
+        On the GPU, the recorded time is when the host reaches the writer,
+        which may be before the preceding kernels complete.
+    """
+
+    def __init__(self, sim, period=1, capacity=DEFAULT_CAPACITY):
+        self.sim = sim
+        self._action = _TimestampAction(capacity)
+        self._writer = hoomd.write.CustomWriter(
+            action=self._action, trigger=hoomd.trigger.Periodic(period)
+        )
+
+    def attach(self):
+        """Start recording."""
+        self.sim.operations.writers.append(self._writer)
+
+    def detach(self):
+        """Stop recording."""
+        self.sim.operations.writers.remove(self._writer)
+
+    def new_segment(self):
+        """Exclude the time between the previous record and the next."""
+        self._action.segment += 1
+
+    def reset(self):
+        """Discard all records."""
+        self._action.count = 0
+
+    @property
+    def latencies(self):
+        """numpy.ndarray: Timestep and latency (in seconds) of each record.
+
+        A structured array with the fields ``timestep`` and ``latency`` in the
+        order recorded. The latency is the wall time per step since the
+        previous record in the same segment.
+        """
+        action = self._action
+        capacity = len(action.times)
+        n = min(action.count, capacity)
+        order = (numpy.arange(n) + action.count - n) % capacity
+
+        times = action.times[order]
+        timesteps = action.timesteps[order]
+        segments = action.segments[order]
+
+        same_segment = segments[1:] == segments[:-1]
+        steps = timesteps[1:] - timesteps[:-1]
+        keep = same_segment & (steps > 0)
+
+        result = numpy.zeros(
+            numpy.count_nonzero(keep),
+            dtype=[('timestep', numpy.int64), ('latency', numpy.float64)],
+        )
+        result['timestep'] = timesteps[1:][keep]
+        result['latency'] = (times[1:] - times[:-1])[keep] / steps[keep]
+        return result
+
+    def summarize(self):
+        """Summarize the latency distribution.
+
+        Returns:
+            dict: The number of records ``n``, ``mean``, percentiles ``p50``,
+            ``p90``, ``p99``, and ``max`` of the latency in seconds (``nan``
+            when there are no records).
+        """
+        latency = self.latencies['latency']
+        summary = dict(n=len(latency))
+
+        if len(latency) == 0:
+            summary['mean'] = numpy.nan
+            summary.update({f'p{p}': numpy.nan for p in PERCENTILES})
+            summary['max'] = numpy.nan
+            return summary
+
+        summary['mean'] = float(numpy.mean(latency))
+        for p, value in zip(PERCENTILES, numpy.percentile(latency, PERCENTILES)):
+            summary[f'p{p}'] = float(value)
+        summary['max'] = float(numpy.max(latency))
+        return summary
+
+    def save(self, filename):
+        """Save the latency series to a NumPy ``.npy`` file.
+
+        Args:
+            filename (str): Name of the file to write.
+        """
+        numpy.save(filename, self.latencies)
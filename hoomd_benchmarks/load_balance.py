@@ -0,0 +1,161 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Methods common to load balancing benchmarks."""
+
+import hoomd
+
+from . import common, decomposition
+from .configuration.inhomogeneous import PROFILES
+
+DEFAULT_PROFILE = 'slab'
+DEFAULT_LOAD_BALANCE_PERIOD = 100
+DEFAULT_LOAD_BALANCE_TOLERANCE = 1.02
+
+
+class LoadBalanceBenchmark(common.Benchmark):
+    """Base class for benchmarks of inhomogeneous systems.
+
+    Args:
+        profile (str): Density profile of the initial configuration:
+          ``'slab'``, ``'droplet'``, or ``'gradient'`` (see
+          `configuration.inhomogeneous`). Replaces ``configuration``.
+
+        load_balance (bool): Set to True to measure again with a
+          `hoomd.tune.LoadBalancer` after measuring without one.
+
+        load_balance_period (int): Number of time steps between load balancing
+          steps.
+
+        load_balance_tolerance (float): Load imbalance to tolerate before
+          adjusting the domain boundaries.
+
+        kwargs: Keyword arguments accepted by the next class in the method
+          resolution order.
+
+    List this class before the benchmark class that defines the simulation::
+
+        class MDLoadBalance(load_balance.LoadBalanceBenchmark, MDPairLJ):
+            pass
+
+    ``summary['decomposition']`` reports the particles on each rank and the
+    imbalance factor at the end of the measurement (see
+    `decomposition.summarize`). With ``load_balance``, the reported
+    performance is the performance with the load balancer and
+    ``summary['load_balance']`` reports the ``unbalanced`` performance and
+    decomposition summary, and the ``gain`` (the ratio of the balanced to the
+    unbalanced performance).
+
+    The benchmark does not run on a single rank, where there is no domain
+    decomposition to balance, so serial runs of the suite skip it.
+
+    Note:
+        Counting the particles on more than one rank requires mpi4py, and
+        load balancing requires HOOMD-blue built with MPI.
+
+    See Also:
+        `common.Benchmark`
+    """
+
+    SUPPORTS_WARMUP_CHECKPOINT = False
+
+    def __init__(
+        self,
+        profile=DEFAULT_PROFILE,
+        load_balance=False,
+        load_balance_period=DEFAULT_LOAD_BALANCE_PERIOD,
+        load_balance_tolerance=DEFAULT_LOAD_BALANCE_TOLERANCE,
+        **kwargs,
+    ):
+        self.profile = profile
+        self.load_balance = load_balance
+        self.load_balance_period = load_balance_period
+        self.load_balance_tolerance = load_balance_tolerance
+        kwargs['configuration'] = profile
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def add_load_balance_arguments(parser):
+        """Add the load balancing options to an argument parser."""
+        parser.add_argument(
+            '--profile',
+            type=str,
+            choices=PROFILES,
+            default=DEFAULT_PROFILE,
+            help='Density profile of the initial configuration.',
+        )
+        parser.add_argument(
+            '--load_balance',
+            action='store_true',
+            help='Also measure with hoomd.tune.LoadBalancer.',
+        )
+        parser.add_argument(
+            '--load_balance_period',
+            type=int,
+            default=DEFAULT_LOAD_BALANCE_PERIOD,
+            help='Number of time steps between load balancing steps.',
+        )
+        parser.add_argument(
+            '--load_balance_tolerance',
+            type=float,
+            default=DEFAULT_LOAD_BALANCE_TOLERANCE,
+            help='Load imbalance to tolerate.',
+        )
+        return parser
+
+    @classmethod
+    def runs_on_device(cls, device):
+        """Returns True when the benchmark can be run on the given device."""
+        if device.communicator.num_ranks == 1:
+            return False
+        return super().runs_on_device(device)
+
+    @classmethod
+    def required_configurations(cls, arguments):
+        """Get the initial configurations that the benchmark will request."""
+        return super().required_configurations(
+            dict(arguments, configuration=arguments.get('profile', DEFAULT_PROFILE))
+        )
+
+    def execute(self):
+        """Execute the benchmark without and then with load balancing."""
+        print_messages = self.verbose and self.device.communicator.rank == 0
+
+        performance = super().execute()
+        self.summary['decomposition'] = decomposition.summarize(self.sim)
+
+        if print_messages:
+            self._print_distribution('unbalanced')
+
+        if not self.load_balance:
+            return performance
+
+        unbalanced = self.summary
+        self.sim.operations.tuners.append(
+            hoomd.tune.LoadBalancer(
+                trigger=hoomd.trigger.Periodic(self.load_balance_period),
+                tolerance=self.load_balance_tolerance,
+            )
+        )
+
+        # The warmup of the second execution balances the initial load.
+        performance = super().execute()
+        self.summary['decomposition'] = decomposition.summarize(self.sim)
+        self.summary['load_balance'] = dict(
+            unbalanced_value=unbalanced['value'],
+            unbalanced_decomposition=unbalanced['decomposition'],
+            gain=self.summary['value'] / unbalanced['value'],
+        )
+
+        if print_messages:
+            self._print_distribution('balanced')
+            print(f'.. load balancing gain {self.summary["load_balance"]["gain"]:.3f}')
+
+        return performance
+
+    def _print_distribution(self, label):
+        distribution = self.summary['decomposition']
+        print(
+            f'.. {label}: particles per rank {distribution["local_particles"]}, '
+            f'imbalance {distribution["imbalance"]:.3f}'
+        )
@@ -0,0 +1,24 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Lennard-Jones load balancing benchmark."""
+
+from . import load_balance, md_pair_lj
+
+
+class MDLoadBalance(load_balance.LoadBalanceBenchmark, md_pair_lj.MDPairLJ):
+    """Lennard-Jones molecular dynamics benchmark of an inhomogeneous system.
+
+    See Also:
+        `load_balance.LoadBalanceBenchmark`, `md_pair.MDPair`
+    """
+
+    @staticmethod
+    def make_argument_parser():
+        """Make an ArgumentParser instance for benchmark options."""
+        parser = md_pair_lj.MDPairLJ.make_argument_parser()
+        return load_balance.LoadBalanceBenchmark.add_load_balance_arguments(parser)
+
+
+if __name__ == '__main__':
+    MDLoadBalance.main()
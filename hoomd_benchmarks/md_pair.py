@@ -6,7 +6,6 @@
 import hoomd
 
 from . import common
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 DEFAULT_BUFFER = 0.4
 DEFAULT_REBUILD_CHECK_DELAY = 1
@@ -83,23 +82,23 @@ class MDPair(common.Benchmark):
         parser.add_argument('--mode', default=DEFAULT_MODE, help='Shift mode.')
         return parser
 
+    @classmethod
+    def required_configurations(cls, arguments):
+        """Get the initial configurations that the benchmark will request."""
+        return [
+            common.configuration_parameters(
+                arguments, arguments.get('n_types', DEFAULT_N_TYPES)
+            )
+        ]
+
     def make_simulation(self):
         """Make the Simulation object."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-            n_types=self.n_types,
-        )
-
         integrator = hoomd.md.Integrator(dt=0.005)
         cell = hoomd.md.nlist.Cell(buffer=self.buffer)
         cell.rebuild_check_delay = self.rebuild_check_delay
 
         sim = hoomd.Simulation(device=self.device)
-        sim.create_state_from_gsd(filename=str(path))
+        self.create_state(sim, n_types=self.n_types)
         sim.always_compute_pressure = self.always_compute_pressure
 
         if self.pair_class is hoomd.md.pair.LJ:
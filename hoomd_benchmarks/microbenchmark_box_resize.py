@@ -6,7 +6,6 @@
 import hoomd
 
 from . import common
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 
 class MicrobenchmarkBoxResize(common.Benchmark):
@@ -18,16 +17,8 @@ class MicrobenchmarkBoxResize(common.Benchmark):
 
     def make_simulation(self):
         """Make the Simulation object."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         sim = hoomd.Simulation(device=self.device, seed=100)
-        sim.create_state_from_gsd(filename=str(path))
+        self.create_state(sim)
         sim.operations.updaters.clear()
         sim.operations.computes.clear()
         sim.operations.writers.clear()
@@ -9,7 +9,6 @@ import hoomd
 import numpy as np
 
 from . import common
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 try:
     import cupy as cp
@@ -67,20 +66,13 @@ class MicrobenchmarkCustomForce(common.ComparativeBenchmark):
             ' - cupy is not available.',
             stacklevel=2,
         )
+        self.summary = self.summarize([0])
         return [0]
 
     def make_simulations(self):
         """Make the simulation objects."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         sim0 = hoomd.Simulation(device=self.device, seed=100)
-        sim0.create_state_from_gsd(filename=str(path))
+        self.create_state(sim0)
         sim0.operations.updaters.clear()
         sim0.operations.computes.clear()
         sim0.operations.writers.clear()
@@ -91,7 +83,7 @@ class MicrobenchmarkCustomForce(common.ComparativeBenchmark):
         )
 
         sim1 = hoomd.Simulation(device=self.device, seed=100)
-        sim1.create_state_from_gsd(filename=str(path))
+        self.create_state(sim1)
         sim1.operations.updaters.clear()
         sim1.operations.computes.clear()
         sim1.operations.writers.clear()
@@ -6,7 +6,6 @@
 import hoomd
 
 from . import common
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 
 class NeverTrigger(hoomd.trigger.Trigger):
@@ -31,18 +30,10 @@ class MicrobenchmarkCustomTrigger(common.ComparativeBenchmark):
 
     def make_simulations(self):
         """Make the Simulation objects."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         variant = hoomd.variant.Ramp(A=0, B=1, t_start=0, t_ramp=100)
 
         sim0 = hoomd.Simulation(device=self.device, seed=100)
-        sim0.create_state_from_gsd(filename=str(path))
+        self.create_state(sim0)
         sim0.operations.updaters.clear()
         sim0.operations.computes.clear()
         sim0.operations.writers.clear()
@@ -60,7 +51,7 @@ class MicrobenchmarkCustomTrigger(common.ComparativeBenchmark):
         sim0.operations.updaters.append(box_resize0)
 
         sim1 = hoomd.Simulation(device=self.device, seed=100)
-        sim1.create_state_from_gsd(filename=str(path))
+        self.create_state(sim1)
         sim1.operations.updaters.clear()
         sim1.operations.computes.clear()
         sim1.operations.writers.clear()
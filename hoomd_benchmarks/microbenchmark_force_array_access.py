@@ -6,7 +6,6 @@
 import hoomd
 
 from . import common
-from .configuration.hard_sphere import make_hard_sphere_configuration
 from .microbenchmark_custom_force import ConstantForce
 
 
@@ -39,17 +38,9 @@ class MicrobenchmarkForceArrayAccess(common.ComparativeBenchmark):
 
     def make_simulations(self):
         """Make the simulation objects."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         dt = 0.0
         sim0 = hoomd.Simulation(device=self.device, seed=100)
-        sim0.create_state_from_gsd(filename=str(path))
+        self.create_state(sim0)
         sim0.operations.updaters.clear()
         sim0.operations.computes.clear()
         sim0.operations.writers.clear()
@@ -64,7 +55,7 @@ class MicrobenchmarkForceArrayAccess(common.ComparativeBenchmark):
         sim0.operations.add(hoomd.write.CustomWriter(1, AccessForceAction()))
 
         sim1 = hoomd.Simulation(device=self.device, seed=100)
-        sim1.create_state_from_gsd(filename=str(path))
+        self.create_state(sim1)
         sim1.operations.updaters.clear()
         sim1.operations.computes.clear()
         sim1.operations.writers.clear()
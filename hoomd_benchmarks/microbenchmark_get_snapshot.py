@@ -6,7 +6,6 @@
 import hoomd
 
 from . import common
-from .configuration.hard_sphere import make_hard_sphere_configuration
 from .microbenchmark_custom_updater import EmptyAction
 
 
@@ -33,16 +32,8 @@ class MicrobenchmarkGetSnapshot(common.ComparativeBenchmark):
 
     def make_simulations(self):
         """Make the Simulation objects."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         sim0 = hoomd.Simulation(device=self.device, seed=100)
-        sim0.create_state_from_gsd(filename=str(path))
+        self.create_state(sim0)
         sim0.operations.updaters.clear()
         sim0.operations.computes.clear()
         sim0.operations.writers.clear()
@@ -57,7 +48,7 @@ class MicrobenchmarkGetSnapshot(common.ComparativeBenchmark):
         sim0.operations.updaters.append(empty_updater)
 
         sim1 = hoomd.Simulation(device=self.device, seed=100)
-        sim1.create_state_from_gsd(filename=str(path))
+        self.create_state(sim1)
         sim1.operations.updaters.clear()
         sim1.operations.computes.clear()
         sim1.operations.writers.clear()
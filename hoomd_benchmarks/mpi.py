@@ -0,0 +1,67 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""MPI helpers for values that all ranks must agree on.
+
+HOOMD-blue does not expose collective operations on Python objects, so these
+helpers use mpi4py when there is more than one rank. mpi4py is optional and
+only needed by features that make run-time decisions on multiple ranks.
+"""
+
+_partition_comms = {}
+
+
+def _get_mpi_comm(communicator):
+    """Get the mpi4py communicator matching a HOOMD communicator."""
+    try:
+        from mpi4py import MPI
+    except ImportError as error:
+        raise RuntimeError(
+            'mpi4py is required for this feature when using more than one rank.'
+        ) from error
+
+    if communicator.num_partitions == 1:
+        return MPI.COMM_WORLD
+
+    # One process may partition the world in more than one way.
+    key = (communicator.num_partitions, communicator.partition)
+    if key not in _partition_comms:
+        _partition_comms[key] = MPI.COMM_WORLD.Split(
+            communicator.partition, MPI.COMM_WORLD.Get_rank()
+        )
+    return _partition_comms[key]
+
+
+def broadcast(communicator, value):
+    """Broadcast a value from rank 0 to all ranks.
+
+    Args:
+        communicator (hoomd.communicator.Communicator): Communicator that
+          defines the ranks (within the current partition).
+        value: Picklable value to broadcast. Only the value on rank 0 is used.
+
+    Returns:
+        The value from rank 0.
+    """
+    if communicator.num_ranks == 1:
+        return value
+
+    return _get_mpi_comm(communicator).bcast(value, root=0)
+
+
+def gather(communicator, value):
+    """Gather a value from every rank on rank 0.
+
+    Args:
+        communicator (hoomd.communicator.Communicator): Communicator that
+          defines the ranks (within the current partition).
+        value: Picklable value to gather.
+
+    Returns:
+        list: The value of each rank (in rank order) on rank 0 and None on the
+        other ranks.
+    """
+    if communicator.num_ranks == 1:
+        return [value]
+
+    return _get_mpi_comm(communicator).gather(value, root=0)
@@ -0,0 +1,343 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Sample the process resource usage in a background thread.
+
+The readers return empty values when the files are missing (for example, on
+systems without ``/proc`` or without ``cpufreq``), and the summaries report
+``nan`` for quantities that could not be measured.
+"""
+
+import math
+import os
+import threading
+import time
+
+DEFAULT_INTERVAL = 0.1
+
+# Without throttle counters, report throttling when the mean frequency drops
+# below this fraction of the cores' base frequency.
+THROTTLE_FRACTION = 0.9
+
+STATUS_PATH = '/proc/self/status'
+STAT_PATH = '/proc/self/stat'
+CPU_PATH = '/sys/devices/system/cpu/cpu{cpu}'
+FREQUENCY_PATH = CPU_PATH + '/cpufreq/scaling_cur_freq'
+REFERENCE_FREQUENCY_PATHS = (CPU_PATH + '/cpufreq/base_frequency',)
+THROTTLE_COUNT_PATHS = (
+    CPU_PATH + '/thermal_throttle/core_throttle_count',
+    CPU_PATH + '/thermal_throttle/package_throttle_count',
+)
+
+# Fields of /proc/self/stat after the command name (field 3 is index 0).
+_STAT_UTIME = 11
+_STAT_STIME = 12
+
+
+def read_status(path=STATUS_PATH):
+    """Read memory and context switch counters from ``/proc/self/status``.
+
+    Returns:
+        dict: ``rss`` and ``hwm`` (in bytes), ``voluntary_ctxt_switches`` and
+        ``nonvoluntary_ctxt_switches``. Missing values are omitted.
+    """
+    status = {}
+    try:
+        with open(path) as f:
+            lines = f.readlines()
+    except OSError:
+        return status
+
+    names = dict(
+        VmRSS='rss',
+        VmHWM='hwm',
+        voluntary_ctxt_switches='voluntary_ctxt_switches',
+        nonvoluntary_ctxt_switches='nonvoluntary_ctxt_switches',
+    )
+    for line in lines:
+        key, _, value = line.partition(':')
+        if key not in names:
+            continue
+
+        fields = value.split()
+        if len(fields) == 0:
+            continue
+
+        number = int(fields[0])
+        if len(fields) > 1 and fields[1] == 'kB':
+            number *= 1024
+        status[names[key]] = number
+
+    return status
+
+
+def read_cpu_times(path=STAT_PATH):
+    """Read the user and system CPU time from ``/proc/self/stat``.
+
+    Returns:
+        tuple[float, float]: The user and system time in seconds, or None when
+        the file is missing.
+    """
+    try:
+        with open(path) as f:
+            stat = f.read()
+    except OSError:
+        return None
+
+    # The command name may contain spaces, the other fields follow the last ')'.
+    fields = stat[stat.rfind(')') + 2 :].split()
+    ticks = os.sysconf('SC_CLK_TCK')
+    return int(fields[_STAT_UTIME]) / ticks, int(fields[_STAT_STIME]) / ticks
+
+
+def _affinity_cpus():
+    """list[int]: The cores this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count()))
+
+
+def _read_per_cpu(cpus, path):
+    """Read an integer from a per core file for each core that has it."""
+    values = []
+    for cpu in cpus:
+        try:
+            with open(path.format(cpu=cpu)) as f:
+                values.append(int(f.read()))
+        except (OSError, ValueError):
+            continue
+
+    return values
+
+
+def read_frequencies(cpus=None, path=FREQUENCY_PATH):
+    """Read the current frequency of CPU cores.
+
+    Args:
+        cpus (list[int]): CPU cores to read (defaults to the cores this process
+          may run on).
+        path (str): Path to the frequency file with a ``{cpu}`` placeholder.
+
+    Returns:
+        list[float]: The frequency (in Hz) of each core that reports one.
+    """
+    if cpus is None:
+        cpus = _affinity_cpus()
+
+    return [value * 1000.0 for value in _read_per_cpu(cpus, path)]
+
+
+def read_reference_frequency(cpus=None, paths=REFERENCE_FREQUENCY_PATHS):
+    """Read the frequency that loaded cores should sustain.
+
+    Args:
+        cpus (list[int]): CPU cores to read (defaults to the cores this process
+          may run on).
+        paths (list[str]): Frequency files to try in order, with a ``{cpu}``
+          placeholder. The default reads the base frequency. The maximum
+          frequency of the scaling governor is the turbo limit on most
+          systems, which loaded cores do not sustain, so it is not a fallback.
+
+    Returns:
+        float: The mean frequency (in Hz) over the cores, or ``nan`` when no
+        file is readable.
+    """
+    if cpus is None:
+        cpus = _affinity_cpus()
+
+    for path in paths:
+        frequencies = read_frequencies(cpus, path)
+        if len(frequencies) > 0:
+            return sum(frequencies) / len(frequencies)
+
+    return math.nan
+
+
+def read_throttle_count(cpus=None, paths=THROTTLE_COUNT_PATHS):
+    """Read the thermal throttling event counters of CPU cores.
+
+    Args:
+        cpus (list[int]): CPU cores to read (defaults to the cores this process
+          may run on).
+        paths (list[str]): Counter files with a ``{cpu}`` placeholder.
+
+    Returns:
+        int: The sum of the counters, or None when no counter is readable.
+    """
+    if cpus is None:
+        cpus = _affinity_cpus()
+
+    counts = [count for path in paths for count in _read_per_cpu(cpus, path)]
+    if len(counts) == 0:
+        return None
+
+    return sum(counts)
+
+
+def take_sample():
+    """Read all resource counters.
+
+    Returns:
+        dict: The wall clock time ``time``, the values from `read_status`,
+        ``cpu_time`` (user + system seconds, when available), and
+        ``frequency`` (mean over the cores, when available), and
+        ``throttle_count`` (see `read_throttle_count`, when available).
+    """
+    sample = dict(time=time.perf_counter())
+    sample.update(read_status())
+
+    cpu_times = read_cpu_times()
+    if cpu_times is not None:
+        sample['cpu_time'] = sum(cpu_times)
+
+    frequencies = read_frequencies()
+    if len(frequencies) > 0:
+        sample['frequency'] = sum(frequencies) / len(frequencies)
+
+    throttle_count = read_throttle_count()
+    if throttle_count is not None:
+        sample['throttle_count'] = throttle_count
+
+    return sample
+
+
+class ResourceSampler:
+    """Sample the resource usage of this process in a background thread.
+
+    Args:
+        interval (float): Time between samples in seconds.
+
+    Call `start` before and `stop` after the timed region. Call
+    `begin_repetition` and `end_repetition` around each benchmark repetition
+    to take a sample at the boundaries and group the samples by repetition.
+
+    Note:
+        The thread samples when the Python interpreter switches threads. Long
+        running compiled code that holds the GIL delays samples, but the
+        samples at the repetition boundaries are always taken. The peak memory
+        and throttling come from kernel counters (``VmHWM`` and
+        ``thermal_throttle``) that capture events between samples.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.repetitions = []
+        self._samples = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the sampling thread."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def begin_repetition(self):
+        """Start collecting samples for a new repetition."""
+        samples = [take_sample()]
+        with self._lock:
+            self._samples = samples
+
+    def end_repetition(self):
+        """Finish collecting samples for the current repetition."""
+        sample = take_sample()
+        with self._lock:
+            self._samples.append(sample)
+            self.repetitions.append(self._samples)
+            self._samples = None
+
+    def _sample_loop(self):
+        while not self._stop_event.wait(self.interval):
+            sample = take_sample()
+            with self._lock:
+                if self._samples is not None:
+                    self._samples.append(sample)
+
+    def summarize(self, N):
+        """Summarize the samples of each repetition.
+
+        Args:
+            N (int): Number of particles.
+
+        Returns:
+            list[dict]: For each repetition: the number of samples ``n``,
+            ``peak_rss`` (the largest RSS sampled during the repetition in
+            bytes), ``peak_rss_per_particle`` (bytes), ``hwm`` (the process
+            high water mark ``VmHWM`` at the end of the repetition, which
+            includes earlier repetitions and the setup), ``hwm_increase`` (the
+            growth of the high water mark during the repetition),
+            ``cpu_utilization`` (CPU seconds per wall clock second),
+            ``voluntary_ctxt_switches`` and ``nonvoluntary_ctxt_switches``
+            during the repetition, ``mean_frequency`` (Hz),
+            ``throttle_events`` (the increase of the thermal throttling
+            counters), and ``throttled``. With throttle counters, ``throttled``
+            is True when they increased. Otherwise, it is True when the mean
+            frequency dropped below `THROTTLE_FRACTION` of the base frequency
+            (see `read_reference_frequency`). ``throttled`` is None when
+            neither is available.
+        """
+        reference_frequency = read_reference_frequency()
+
+        summaries = []
+        for samples in self.repetitions:
+            first, last = samples[0], samples[-1]
+            rss = [sample['rss'] for sample in samples if 'rss' in sample]
+            frequency = [
+                sample['frequency'] for sample in samples if 'frequency' in sample
+            ]
+
+            summary = dict(n=len(samples))
+            summary['peak_rss'] = max(rss, default=math.nan)
+            summary['peak_rss_per_particle'] = summary['peak_rss'] / N
+            if 'hwm' in first and 'hwm' in last:
+                summary['hwm'] = last['hwm']
+                summary['hwm_increase'] = last['hwm'] - first['hwm']
+            else:
+                summary['hwm'] = math.nan
+                summary['hwm_increase'] = math.nan
+
+            elapsed = last['time'] - first['time']
+            if 'cpu_time' in first and 'cpu_time' in last and elapsed > 0:
+                summary['cpu_utilization'] = (
+                    last['cpu_time'] - first['cpu_time']
+                ) / elapsed
+            else:
+                summary['cpu_utilization'] = math.nan
+
+            for name in ('voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches'):
+                if name in first and name in last:
+                    summary[name] = last[name] - first[name]
+                else:
+                    summary[name] = math.nan
+
+            if len(frequency) > 0:
+                summary['mean_frequency'] = sum(frequency) / len(frequency)
+            else:
+                summary['mean_frequency'] = math.nan
+
+            if 'throttle_count' in first and 'throttle_count' in last:
+                summary['throttle_events'] = (
+                    last['throttle_count'] - first['throttle_count']
+                )
+                summary['throttled'] = summary['throttle_events'] > 0
+            else:
+                summary['throttle_events'] = math.nan
+                if len(frequency) > 0 and math.isfinite(reference_frequency):
+                    summary['throttled'] = (
+                        summary['mean_frequency']
+                        < THROTTLE_FRACTION * reference_frequency
+                    )
+                else:
+                    summary['throttled'] = None
+
+            summaries.append(summary)
+
+        return summaries
@@ -0,0 +1,199 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Structured benchmark result records.
+
+Reading records does not require HOOMD-blue, so analysis tools (such as
+`database` and `compare`) work on machines without it.
+"""
+
+import datetime
+import json
+import math
+import os
+import platform
+import socket
+import uuid
+
+import numpy
+
+# Increment when the record format changes.
+RECORD_VERSION = 1
+
+HOOMD_BUILD_FIELDS = (
+    'version',
+    'git_sha1',
+    'git_branch',
+    'gpu_enabled',
+    'gpu_platform',
+    'gpu_api_version',
+    'mpi_enabled',
+    'tbb_enabled',
+    'compile_flags',
+    'cxx_compiler',
+    'floating_point_precision',
+)
+
+
+def timestamp():
+    """str: The current UTC time in ISO 8601 format."""
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def to_json(value):
+    """Convert a value to types that JSON can represent.
+
+    Convert NumPy scalars and arrays to Python values, tuples to lists, and
+    non-finite floats to None.
+    """
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, numpy.ndarray)):
+        return [to_json(item) for item in value]
+    if isinstance(value, numpy.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def new_run_id():
+    """str: A unique identifier for a run of one or more benchmarks."""
+    return uuid.uuid4().hex
+
+
+def hoomd_build():
+    """dict: The HOOMD-blue version and build configuration."""
+    import hoomd
+
+    return {
+        name: to_json(getattr(hoomd.version, name))
+        for name in HOOMD_BUILD_FIELDS
+        if hasattr(hoomd.version, name)
+    }
+
+
+def domain_decomposition(benchmark):
+    """Get the domain decomposition of a benchmark's simulation.
+
+    Returns:
+        dict: The number of domains in each direction (``grid``) and the
+        ``split_fractions`` (see `hoomd.State.domain_decomposition`), or None
+        when the simulation is not decomposed (such as builds without MPI).
+    """
+    if not hasattr(benchmark, 'sim'):
+        return None
+
+    state = benchmark._recorded_simulation().state
+    try:
+        grid = state.domain_decomposition
+        split_fractions = state.domain_decomposition_split_fractions
+    except (AttributeError, RuntimeError):
+        return None
+
+    return to_json(dict(grid=grid, split_fractions=split_fractions))
+
+
+def make_record(benchmark, performance, start_time, stop_time, name=None, run_id=None):
+    """Make a result record for one benchmark execution.
+
+    Args:
+        benchmark (common.Benchmark): The executed benchmark.
+        performance (list[float]): The performance samples returned by
+          ``execute``.
+        start_time (str): Time the execution started (see `timestamp`).
+        stop_time (str): Time the execution finished (see `timestamp`).
+        name (str): Name identifying the benchmark run (defaults to the
+          HOOMD-blue version).
+        run_id (str): Identifier shared by all records of one run (see
+          `new_run_id`).
+
+    Returns:
+        dict: The record. ``record['status']`` is ``'completed'``.
+    """
+    import hoomd
+
+    device = benchmark.device
+    if name is None:
+        name = hoomd.version.version
+
+    return to_json(
+        dict(
+            record_version=RECORD_VERSION,
+            name=name,
+            run_id=run_id,
+            benchmark=type(benchmark).__name__,
+            status='completed',
+            units=benchmark.units,
+            samples=performance,
+            summary=benchmark.summary,
+            arguments=benchmark.arguments(),
+            device=dict(
+                type=type(device).__name__,
+                num_ranks=device.communicator.num_ranks,
+                num_partitions=device.communicator.num_partitions,
+                devices=getattr(device, 'devices', []),
+            ),
+            domain_decomposition=domain_decomposition(benchmark),
+            hoomd=hoomd_build(),
+            host=dict(
+                hostname=socket.gethostname(),
+                platform=platform.platform(),
+                python=platform.python_version(),
+            ),
+            start_time=start_time,
+            stop_time=stop_time,
+        )
+    )
+
+
+class JSONLWriter:
+    """Append records to a JSON Lines file.
+
+    Args:
+        filename (str): Name of the file.
+
+    `write` appends one line per record and flushes it to disk, so a job that
+    is killed keeps all records written before.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def write(self, record):
+        """Append a record to the file.
+
+        Args:
+            record (dict): The record (see `make_record`).
+        """
+        with open(self.filename, 'a') as f:
+            f.write(json.dumps(record, sort_keys=True) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def read_records(filename):
+    """Read the records in a JSON Lines file.
+
+    Args:
+        filename (str): Name of the file.
+
+    A job killed while writing leaves an incomplete last line without a line
+    terminator, which is ignored.
+
+    Returns:
+        list[dict]: The records.
+    """
+    records = []
+    with open(filename) as f:
+        for line in f:
+            if not line.strip():
+                continue
+
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                if line.endswith('\n'):
+                    raise
+
+    return records
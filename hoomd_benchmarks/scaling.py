@@ -0,0 +1,280 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Measure the strong and weak MPI scaling of a benchmark.
+
+`run_sweep` executes one benchmark at each rank count in a series, each in an
+isolated worker (see `worker.run_isolated`) started by an MPI launcher. In
+strong scaling, the number of particles is fixed. In weak scaling, ``N`` is the
+number of particles per rank. `analyze` computes the speedup, parallel
+efficiency, and Karp-Flatt metric (the experimentally determined serial
+fraction) relative to the smallest rank count.
+
+All benchmarks report rates per time step (or sweep), so the performance of a
+weak scaling point is ideal when it matches the smallest rank count.
+
+Run ``python -m hoomd_benchmarks.scaling --help`` for the command line
+interface. For example, on one Linux machine::
+
+    python -m hoomd_benchmarks.scaling --benchmark MDPairLJ --device CPU --ranks 1 2 4 8
+"""
+
+import math
+
+import pandas
+
+from . import results, worker
+
+MODES = ('strong', 'weak')
+
+DEFAULT_LAUNCHER = 'mpirun -n {ranks}'
+
+SCALING_OPTIONS = (
+    'benchmark',
+    'ranks',
+    'mode',
+    'launcher',
+    'timeout',
+    'jsonl',
+    'output',
+)
+
+COLUMNS = [
+    'mode',
+    'ranks',
+    'N',
+    'value',
+    'speedup',
+    'ideal_speedup',
+    'efficiency',
+    'karp_flatt',
+    'domain_decomposition',
+]
+
+
+def karp_flatt(speedup, n):
+    """Compute the Karp-Flatt metric.
+
+    Args:
+        speedup (float): Speedup on *n* times the baseline resources.
+        n (float): Ratio of resources to the baseline.
+
+    Returns:
+        float: The serial fraction ``(1/speedup - 1/n) / (1 - 1/n)`` (``nan``
+        when *n* is 1).
+    """
+    if n == 1 or speedup <= 0 or math.isnan(speedup):
+        return math.nan
+
+    return (1 / speedup - 1 / n) / (1 - 1 / n)
+
+
+def point_arguments(arguments, mode, ranks):
+    """Make the benchmark arguments for one point of a sweep.
+
+    Args:
+        arguments (dict): Benchmark arguments. In weak scaling, ``N`` is the
+          number of particles per rank.
+        mode (str): ``'strong'`` or ``'weak'``.
+        ranks (int): Number of MPI ranks.
+
+    Returns:
+        dict: The arguments.
+    """
+    if mode not in MODES:
+        raise ValueError(f'Invalid scaling mode {mode}.')
+
+    point = dict(arguments)
+    if mode == 'weak':
+        point['N'] = arguments['N'] * ranks
+    return point
+
+
+def run_sweep(
+    benchmark_name,
+    arguments,
+    device,
+    ranks,
+    mode='strong',
+    launcher=DEFAULT_LAUNCHER,
+    **kwargs,
+):
+    """Execute a benchmark at each rank count.
+
+    Args:
+        benchmark_name (str): Name of the benchmark class.
+        arguments (dict): Benchmark arguments (see `point_arguments`).
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        ranks (list[int]): The rank counts.
+        mode (str): ``'strong'`` or ``'weak'``.
+        launcher (str): Command that launches the MPI workers. ``{ranks}`` is
+          replaced by the rank count.
+        kwargs: Additional arguments for `worker.run_isolated`.
+
+    Returns:
+        list[dict]: The result record of each point.
+    """
+    records = []
+    for n in ranks:
+        print(f'Running {benchmark_name} on {n} ranks', flush=True)
+        record = worker.run_isolated(
+            benchmark_name,
+            point_arguments(arguments, mode, n),
+            device,
+            launcher=launcher.format(ranks=n),
+            **kwargs,
+        )
+        record['scaling'] = dict(mode=mode, ranks=n)
+        records.append(record)
+
+    return records
+
+
+def analyze(records):
+    """Compute the scaling metrics of a sweep.
+
+    Args:
+        records (list[dict]): The result records (see `run_sweep`).
+
+    The speedup of a point on ``p`` ranks is relative to the completed point
+    with the fewest ranks ``p0``: ``value(p) / value(p0)`` in strong scaling and the
+    scaled speedup ``value(p) / value(p0) * p / p0`` in weak scaling. The
+    efficiency is the speedup divided by ``p / p0``. The metrics are ``nan``
+    for points that did not complete (or measured no performance).
+
+    Returns:
+        pandas.DataFrame: One row per point (see `COLUMNS`), sorted by the
+        number of ranks.
+    """
+    rows = []
+    for record in records:
+        value = math.nan
+        if record['status'] == 'completed' and record['summary']['value'] is not None:
+            value = record['summary']['value']
+
+        rows.append(
+            dict(
+                mode=record['scaling']['mode'],
+                ranks=record['scaling']['ranks'],
+                N=record['arguments']['N'],
+                value=value,
+                domain_decomposition=(record.get('domain_decomposition') or {}).get(
+                    'grid'
+                ),
+            )
+        )
+
+    rows.sort(key=lambda row: row['ranks'])
+    completed = [row for row in rows if row['value'] > 0]
+    base = completed[0] if len(completed) > 0 else None
+    for row in rows:
+        row['speedup'] = math.nan
+        row['ideal_speedup'] = math.nan
+        row['efficiency'] = math.nan
+        row['karp_flatt'] = math.nan
+        if base is None:
+            continue
+
+        n = row['ranks'] / base['ranks']
+        row['ideal_speedup'] = n
+        if not row['value'] > 0:
+            continue
+
+        speedup = row['value'] / base['value']
+        if row['mode'] == 'weak':
+            speedup *= n
+
+        row['speedup'] = speedup
+        row['efficiency'] = speedup / n
+        row['karp_flatt'] = karp_flatt(speedup, n)
+
+    return pandas.DataFrame(rows, columns=COLUMNS)
+
+
+def add_scaling_arguments(parser):
+    """Add the scaling sweep options to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser.
+    """
+    parser.add_argument(
+        '--ranks',
+        type=int,
+        nargs='+',
+        required=True,
+        help='Numbers of MPI ranks to run on.',
+    )
+    parser.add_argument(
+        '--mode',
+        type=str,
+        choices=MODES,
+        default='strong',
+        help='Keep N fixed (strong) or N per rank fixed (weak).',
+    )
+    parser.add_argument(
+        '--launcher',
+        type=str,
+        default=DEFAULT_LAUNCHER,
+        help='MPI launcher command, {ranks} is replaced by the number of ranks.',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='Stop points that run longer than this many seconds.',
+    )
+    parser.add_argument(
+        '--jsonl',
+        type=str,
+        default=None,
+        help='Append the result record of each point to this JSON Lines file.',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=str,
+        default=None,
+        help='Write the scaling metrics to this CSV file.',
+    )
+
+
+def main():
+    """Implement the command line interface."""
+    from .suite import make_driver_parser
+
+    parser = make_driver_parser(
+        'python -m hoomd_benchmarks.scaling',
+        'Measure the strong or weak MPI scaling of a benchmark.',
+    )
+    add_scaling_arguments(parser)
+    args = parser.parse_args()
+
+    arguments = vars(args).copy()
+    for name in (*SCALING_OPTIONS, 'device'):
+        del arguments[name]
+
+    records = run_sweep(
+        args.benchmark,
+        arguments,
+        args.device,
+        args.ranks,
+        mode=args.mode,
+        launcher=args.launcher,
+        run_id=results.new_run_id(),
+        timeout=args.timeout,
+    )
+
+    if args.jsonl is not None:
+        writer = results.JSONLWriter(args.jsonl)
+        for record in records:
+            writer.write(record)
+
+    df = analyze(records)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            f.write(df.to_csv(index=False))
+    print(df.to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
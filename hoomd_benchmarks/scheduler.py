@@ -0,0 +1,221 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Run independent benchmark jobs concurrently on disjoint sets of cores.
+
+`core_sets` partitions the cores available to this process into sets of
+``cores_per_job`` cores, optionally keeping each set within one NUMA node.
+`run_packed` executes isolated workers (see `worker.run_isolated`) in
+parallel, one per core set, and each worker pins itself to its cores with
+`os.sched_setaffinity` before initializing the device.
+
+Jobs that run side by side share memory bandwidth, caches, and power. Use
+`measure_contention` to quantify the slowdown this introduces.
+"""
+
+import concurrent.futures
+import math
+import os
+import pathlib
+import queue
+import warnings
+
+import numpy
+
+from . import worker
+
+NODE_ROOT = '/sys/devices/system/node'
+
+
+def parse_cpu_list(text):
+    """Parse a Linux CPU list (for example, ``'0-3,8,10-11'``).
+
+    Returns:
+        list[int]: The CPUs in the list.
+    """
+    cpus = []
+    for item in text.strip().split(','):
+        if item == '':
+            continue
+
+        first, _, last = item.partition('-')
+        if last == '':
+            last = first
+        cpus.extend(range(int(first), int(last) + 1))
+
+    return cpus
+
+
+def numa_nodes(root=NODE_ROOT):
+    """Read the CPUs of each NUMA node.
+
+    Args:
+        root (str): Path to the sysfs node directory.
+
+    Returns:
+        list[list[int]]: The CPUs of each node, or an empty list when the
+        topology is not available.
+    """
+    nodes = []
+    paths = pathlib.Path(root).glob('node[0-9]*')
+    for path in sorted(paths, key=lambda p: int(p.name[4:])):
+        try:
+            nodes.append(parse_cpu_list((path / 'cpulist').read_text()))
+        except (OSError, ValueError):
+            continue
+
+    return nodes
+
+
+def core_sets(cores_per_job, cpus=None, numa=False, root=NODE_ROOT):
+    """Partition cores into disjoint sets.
+
+    Args:
+        cores_per_job (int): Number of cores in each set.
+        cpus (list[int]): Cores to partition (defaults to the affinity of this
+          process).
+        numa (bool): When True, place each set within one NUMA node. Cores
+          left over in a node are not used.
+        root (str): Path to the sysfs node directory.
+
+    Returns:
+        list[list[int]]: The core sets.
+
+    Raises:
+        ValueError: When there are fewer than *cores_per_job* cores.
+    """
+    if cores_per_job < 1:
+        raise ValueError('cores_per_job must be positive.')
+
+    if cpus is None:
+        cpus = os.sched_getaffinity(0)
+    cpus = sorted(cpus)
+
+    groups = [cpus]
+    if numa:
+        nodes = [[cpu for cpu in node if cpu in cpus] for node in numa_nodes(root)]
+        nodes = [node for node in nodes if len(node) > 0]
+        if len(nodes) > 0:
+            groups = nodes
+
+    sets = []
+    for group in groups:
+        for i in range(0, len(group) - cores_per_job + 1, cores_per_job):
+            sets.append(group[i : i + cores_per_job])
+
+    if len(sets) == 0:
+        raise ValueError(
+            f'Cannot fit a job with {cores_per_job} cores on the available cores.'
+        )
+
+    return sets
+
+
+def run_packed(jobs, sets, device, callback=None, **kwargs):
+    """Execute benchmark jobs concurrently, one per core set.
+
+    Args:
+        jobs (list[tuple[str, dict]]): The benchmark name and arguments of each
+          job (see `worker.run_isolated`).
+        sets (list[list[int]]): Disjoint core sets (see `core_sets`). At most
+          ``len(sets)`` jobs run at the same time.
+        device (str): Execution device (``'CPU'``).
+        callback (callable): Called with the job index and record as each job
+          finishes.
+        kwargs: Additional arguments for `worker.run_isolated`.
+
+    Each record includes the ``scheduler`` field: the ``cpus`` the job ran on
+    and the number of ``concurrent_jobs``.
+
+    Returns:
+        list[dict]: The result record of each job, in the order of *jobs*.
+    """
+    free_sets = queue.Queue()
+    for cpus in sets:
+        free_sets.put(cpus)
+
+    def run(benchmark_name, arguments):
+        cpus = free_sets.get()
+        try:
+            record = worker.run_isolated(
+                benchmark_name, arguments, device, cpus=cpus, **kwargs
+            )
+        finally:
+            free_sets.put(cpus)
+
+        record['scheduler'] = dict(cpus=cpus, concurrent_jobs=len(sets))
+        return record
+
+    records = [None] * len(jobs)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(sets)) as executor:
+        futures = {
+            executor.submit(run, benchmark_name, arguments): index
+            for index, (benchmark_name, arguments) in enumerate(jobs)
+        }
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            records[index] = future.result()
+            if callback is not None:
+                callback(index, records[index])
+
+    return records
+
+
+def _value(record):
+    """float: The performance in a record (``nan`` when it did not complete)."""
+    if record['status'] != 'completed' or record['summary']['value'] is None:
+        return math.nan
+
+    return record['summary']['value']
+
+
+def measure_contention(benchmark_name, arguments, sets, device, **kwargs):
+    """Measure the slowdown caused by running jobs side by side.
+
+    Execute the calibration benchmark alone on the first core set, then one
+    copy on every core set at the same time.
+
+    Args:
+        benchmark_name (str): Name of the calibration benchmark class.
+        arguments (dict): Arguments of the calibration benchmark.
+        sets (list[list[int]]): The core sets (see `core_sets`).
+        device (str): Execution device (``'CPU'``).
+        kwargs: Additional arguments for `worker.run_isolated`.
+
+    Returns:
+        dict: The ``benchmark``, the performance ``alone``, the performance of
+        each ``packed`` copy, and the ``slowdown``: the performance alone
+        divided by the median packed performance (1 means no contention).
+        The slowdown is ``nan`` (with a warning) when the calibration did not
+        complete or measured no performance.
+    """
+    alone = worker.run_isolated(
+        benchmark_name, arguments, device, cpus=sets[0], **kwargs
+    )
+    packed = run_packed(
+        [(benchmark_name, arguments)] * len(sets), sets, device, **kwargs
+    )
+
+    alone_value = _value(alone)
+    packed_values = [_value(record) for record in packed]
+    valid_values = [value for value in packed_values if value > 0]
+
+    slowdown = math.nan
+    if len(valid_values) < len(packed_values) or not alone_value > 0:
+        statuses = [alone['status']] + [record['status'] for record in packed]
+        warnings.warn(
+            f'Skipping the contention measurement - {benchmark_name} did not '
+            f'measure a performance in every run (status {statuses}).',
+            stacklevel=2,
+        )
+    else:
+        slowdown = alone_value / float(numpy.median(valid_values))
+
+    return dict(
+        benchmark=benchmark_name,
+        cores_per_job=len(sets[0]),
+        concurrent_jobs=len(sets),
+        alone=alone_value,
+        packed=packed_values,
+        slowdown=slowdown,
+    )
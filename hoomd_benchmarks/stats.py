@@ -0,0 +1,304 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Statistics used to summarize benchmark samples."""
+
+import math
+
+import numpy
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_STATISTIC = 'median'
+DEFAULT_OUTLIER_THRESHOLD = 3.5
+MIN_OUTLIER_SAMPLES = 5
+DEFAULT_BOOTSTRAP_RESAMPLES = 2000
+DEFAULT_STATIONARITY_TOLERANCE = 0.02
+# Treat trends with a t statistic below this value as not significant.
+STATIONARITY_T_CRITICAL = 2.0
+MIN_STATIONARITY_SAMPLES = 3
+
+# Maximum number of values drawn at once when bootstrapping large samples.
+_BOOTSTRAP_BATCH_VALUES = 1_000_000
+
+STATISTICS = {'mean': numpy.mean, 'median': numpy.median}
+
+
+def reject_outliers(samples, threshold=DEFAULT_OUTLIER_THRESHOLD):
+    """Split samples into retained values and outliers.
+
+    Args:
+        samples (list[float]): Sample values.
+        threshold (float): Reject samples with a modified z-score (based on the
+          median absolute deviation) larger than this value.
+
+    Outliers are only rejected when there are at least ``MIN_OUTLIER_SAMPLES``
+    samples.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The retained samples and the
+        rejected outliers.
+    """
+    samples = numpy.asarray(samples, dtype=float)
+    if len(samples) < MIN_OUTLIER_SAMPLES:
+        return samples, samples[0:0]
+
+    median = numpy.median(samples)
+    mad = numpy.median(numpy.abs(samples - median))
+
+    if mad == 0:
+        return samples, samples[0:0]
+
+    z = 0.6745 * (samples - median) / mad
+    keep = numpy.abs(z) <= threshold
+    return samples[keep], samples[~keep]
+
+
+def bootstrap_confidence_interval(
+    samples,
+    statistic=DEFAULT_STATISTIC,
+    confidence=DEFAULT_CONFIDENCE,
+    resamples=DEFAULT_BOOTSTRAP_RESAMPLES,
+    seed=0,
+):
+    """Estimate the confidence interval of a statistic with the bootstrap.
+
+    Args:
+        samples (list[float]): Sample values.
+        statistic (str): Name of the statistic (``'mean'`` or ``'median'``).
+        confidence (float): Confidence level of the interval.
+        resamples (int): Number of bootstrap resamples.
+        seed (int): Random number seed.
+
+    Returns:
+        tuple[float, float]: The lower and upper bounds of the interval.
+        Both are ``nan`` when there are fewer than 2 samples.
+    """
+    samples = numpy.asarray(samples, dtype=float)
+    if len(samples) < 2:  # noqa: PLR2004: need 2 samples for a distribution
+        return math.nan, math.nan
+
+    rng = numpy.random.default_rng(seed)
+    estimates = _bootstrap_estimates(samples, statistic, resamples, rng)
+
+    alpha = 1 - confidence
+    low, high = numpy.quantile(estimates, [alpha / 2, 1 - alpha / 2])
+    return float(low), float(high)
+
+
+def _bootstrap_estimates(samples, statistic, resamples, rng):
+    """Compute the statistic of bootstrap resamples in batches."""
+    batch_size = max(1, _BOOTSTRAP_BATCH_VALUES // len(samples))
+    estimates = []
+    for start in range(0, resamples, batch_size):
+        size = min(batch_size, resamples - start)
+        indices = rng.integers(0, len(samples), size=(size, len(samples)))
+        estimates.append(STATISTICS[statistic](samples[indices], axis=1))
+    return numpy.concatenate(estimates)
+
+
+def bootstrap_ratio_confidence_interval(
+    baseline,
+    candidate,
+    statistic=DEFAULT_STATISTIC,
+    confidence=DEFAULT_CONFIDENCE,
+    resamples=DEFAULT_BOOTSTRAP_RESAMPLES,
+    seed=0,
+):
+    """Estimate the confidence interval of a ratio of statistics.
+
+    Args:
+        baseline (list[float]): Baseline sample values.
+        candidate (list[float]): Candidate sample values.
+        statistic (str): Name of the statistic (``'mean'`` or ``'median'``).
+        confidence (float): Confidence level of the interval.
+        resamples (int): Number of bootstrap resamples.
+        seed (int): Random number seed.
+
+    Resample the baseline and candidate independently and compute the
+    interval of ``statistic(candidate) / statistic(baseline)``.
+
+    Returns:
+        tuple[float, float]: The lower and upper bounds of the interval.
+        Both are ``nan`` when either set has fewer than 2 samples.
+    """
+    baseline = numpy.asarray(baseline, dtype=float)
+    candidate = numpy.asarray(candidate, dtype=float)
+    if len(baseline) < 2 or len(candidate) < 2:  # noqa: PLR2004: see above
+        return math.nan, math.nan
+
+    rng = numpy.random.default_rng(seed)
+    ratios = _bootstrap_estimates(
+        candidate, statistic, resamples, rng
+    ) / _bootstrap_estimates(baseline, statistic, resamples, rng)
+
+    alpha = 1 - confidence
+    low, high = numpy.quantile(ratios, [alpha / 2, 1 - alpha / 2])
+    return float(low), float(high)
+
+
+def _average_ranks(values):
+    """Rank values from 1, assigning tied values their average rank.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]: The ranks and the size of each
+        group of tied values.
+    """
+    _, inverse, counts = numpy.unique(values, return_inverse=True, return_counts=True)
+    average = numpy.cumsum(counts) - (counts - 1) / 2
+    return average[inverse], counts
+
+
+def mann_whitney_u(a, b):
+    """Test whether two samples come from the same distribution.
+
+    Args:
+        a (list[float]): First sample values.
+        b (list[float]): Second sample values.
+
+    Compute the Mann-Whitney U statistic of *a* and the two-sided p-value
+    with the normal approximation (with tie and continuity corrections). The
+    approximation is coarse for fewer than about 8 samples in each set.
+
+    Returns:
+        tuple[float, float]: The U statistic and the p-value (``nan`` when
+        either set is empty or all values are equal).
+    """
+    a = numpy.asarray(a, dtype=float)
+    b = numpy.asarray(b, dtype=float)
+    n1 = len(a)
+    n2 = len(b)
+    if n1 == 0 or n2 == 0:
+        return math.nan, math.nan
+
+    ranks, counts = _average_ranks(numpy.concatenate([a, b]))
+    u = float(numpy.sum(ranks[0:n1]) - n1 * (n1 + 1) / 2)
+
+    n = n1 + n2
+    tie_term = numpy.sum(counts**3 - counts) / (n * (n - 1))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u, math.nan
+
+    difference = u - n1 * n2 / 2
+    z = (abs(difference) - 0.5) / math.sqrt(variance)
+    p_value = min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+    return u, p_value
+
+
+def summarize(
+    samples,
+    statistic=DEFAULT_STATISTIC,
+    confidence=DEFAULT_CONFIDENCE,
+    outlier_threshold=DEFAULT_OUTLIER_THRESHOLD,
+):
+    """Summarize benchmark samples.
+
+    Args:
+        samples (list[float]): Sample values.
+        statistic (str): Name of the central statistic (``'mean'`` or
+          ``'median'``).
+        confidence (float): Confidence level of the interval.
+        outlier_threshold (float): Threshold passed to `reject_outliers`.
+
+    Returns:
+        dict: The number of samples ``n``, the ``mean``, ``median``, standard
+        deviation ``std``, coefficient of variation ``cv``, the chosen
+        ``statistic`` and its ``value``, the confidence interval ``ci_low``
+        and ``ci_high``, the ``relative_ci_width``, and the rejected
+        ``outliers``. All statistics are computed after rejecting outliers.
+        Non-finite samples are ignored.
+    """
+    samples = numpy.asarray(samples, dtype=float)
+    samples = samples[numpy.isfinite(samples)]
+    if len(samples) == 0:
+        return dict(
+            n=0,
+            mean=math.nan,
+            median=math.nan,
+            std=math.nan,
+            cv=math.nan,
+            statistic=statistic,
+            value=math.nan,
+            confidence=confidence,
+            ci_low=math.nan,
+            ci_high=math.nan,
+            relative_ci_width=math.nan,
+            outliers=[],
+        )
+
+    retained, outliers = reject_outliers(samples, outlier_threshold)
+
+    mean = float(numpy.mean(retained))
+    median = float(numpy.median(retained))
+    std = float(numpy.std(retained, ddof=1)) if len(retained) > 1 else math.nan
+    value = float(STATISTICS[statistic](retained))
+    ci_low, ci_high = bootstrap_confidence_interval(retained, statistic, confidence)
+
+    return dict(
+        n=len(retained),
+        mean=mean,
+        median=median,
+        std=std,
+        cv=std / mean if mean != 0 else math.nan,
+        statistic=statistic,
+        value=value,
+        confidence=confidence,
+        ci_low=ci_low,
+        ci_high=ci_high,
+        relative_ci_width=(ci_high - ci_low) / abs(value) if value != 0 else math.nan,
+        outliers=outliers.tolist(),
+    )
+
+
+def linear_trend(samples):
+    """Fit a line to samples taken at equal intervals.
+
+    Args:
+        samples (list[float]): Sample values.
+
+    Returns:
+        tuple[float, float]: The slope (per sample) and its standard error.
+    """
+    y = numpy.asarray(samples, dtype=float)
+    x = numpy.arange(len(y), dtype=float)
+    x -= x.mean()
+
+    sxx = numpy.sum(x**2)
+    slope = numpy.sum(x * (y - y.mean())) / sxx
+    residuals = y - y.mean() - slope * x
+    stderr = math.sqrt(numpy.sum(residuals**2) / (len(y) - 2) / sxx)
+
+    return float(slope), stderr
+
+
+def is_stationary(samples, tolerance=DEFAULT_STATIONARITY_TOLERANCE):
+    """Test whether samples taken at equal intervals have no trend.
+
+    Args:
+        samples (list[float]): Sample values (typically a sliding window of
+          the most recent samples).
+        tolerance (float): Accept trends that change the value by at most this
+          fraction of the mean over the samples.
+
+    The samples are stationary when the drift of the linear trend across the
+    samples is within *tolerance*, or when the slope is not significant
+    (its t statistic is below `STATIONARITY_T_CRITICAL`).
+
+    Returns:
+        bool: True when the samples are stationary.
+    """
+    samples = numpy.asarray(samples, dtype=float)
+    if len(samples) < MIN_STATIONARITY_SAMPLES or not numpy.all(
+        numpy.isfinite(samples)
+    ):
+        return False
+
+    slope, stderr = linear_trend(samples)
+    drift = abs(slope) * (len(samples) - 1)
+    if drift <= tolerance * abs(numpy.mean(samples)):
+        return True
+
+    if stderr == 0:
+        return False
+
+    return abs(slope) / stderr < STATIONARITY_T_CRITICAL
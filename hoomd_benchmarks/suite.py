@@ -0,0 +1,107 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Benchmarks in the suite."""
+
+import argparse
+import fnmatch
+
+from .common import Benchmark
+from .hpmc_load_balance import HPMCLoadBalance
+from .hpmc_octahedron import HPMCOctahedron
+from .hpmc_pair_kern_frenkel import HPMCPairKernFrenkel
+from .hpmc_pair_lj import HPMCPairLJ
+from .hpmc_pair_step import HPMCPairStep
+from .hpmc_pair_union_wca import HPMCPairUnionWCA
+from .hpmc_sphere import HPMCSphere
+from .md_load_balance import MDLoadBalance
+from .md_pair_lj import MDPairLJ
+from .md_pair_opp import MDPairOPP
+from .md_pair_table import MDPairTable
+from .md_pair_wca import MDPairWCA
+from .microbenchmark_box_resize import MicrobenchmarkBoxResize
+from .microbenchmark_custom_force import MicrobenchmarkCustomForce
+from .microbenchmark_custom_trigger import MicrobenchmarkCustomTrigger
+from .microbenchmark_custom_updater import MicrobenchmarkCustomUpdater
+from .microbenchmark_empty_simulation import MicrobenchmarkEmptySimulation
+from .microbenchmark_force_array_access import MicrobenchmarkForceArrayAccess
+from .microbenchmark_get_snapshot import MicrobenchmarkGetSnapshot
+from .microbenchmark_set_snapshot import MicrobenchmarkSetSnapshot
+from .write_gsd import GSD
+from .write_gsd_log import GSDLog
+from .write_hdf5_log import HDF5Log
+
+benchmark_classes = [
+    HPMCSphere,
+    HPMCOctahedron,
+    HPMCPairLJ,
+    HPMCPairStep,
+    HPMCPairKernFrenkel,
+    HPMCPairUnionWCA,
+    HPMCLoadBalance,
+    MDPairLJ,
+    MDPairOPP,
+    MDPairTable,
+    MDPairWCA,
+    MDLoadBalance,
+    MicrobenchmarkBoxResize,
+    MicrobenchmarkEmptySimulation,
+    MicrobenchmarkCustomTrigger,
+    MicrobenchmarkCustomUpdater,
+    MicrobenchmarkCustomForce,
+    MicrobenchmarkGetSnapshot,
+    MicrobenchmarkSetSnapshot,
+    MicrobenchmarkForceArrayAccess,
+    GSD,
+    GSDLog,
+    HDF5Log,
+]
+
+
+def select_benchmarks(pattern):
+    """Select benchmark classes by name.
+
+    Args:
+        pattern (str): `fnmatch` pattern to match against the class names.
+
+    Returns:
+        list[type]: The matching benchmark classes in suite order.
+    """
+    return [
+        benchmark_class
+        for benchmark_class in benchmark_classes
+        if fnmatch.fnmatch(benchmark_class.__name__, pattern)
+    ]
+
+
+def make_driver_parser(prog, description):
+    """Make the argument parser of a driver that executes one benchmark.
+
+    Args:
+        prog (str): Name of the program.
+        description (str): Description of the driver.
+
+    The parser accepts ``--benchmark`` (the name of a class in
+    `benchmark_classes`) and the options of that class. Find the class on the
+    command line first, so that ``--help`` lists its options.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    classes = {cls.__name__: cls for cls in benchmark_classes}
+
+    benchmark_parser = argparse.ArgumentParser(add_help=False)
+    benchmark_parser.add_argument('--benchmark', type=str, choices=sorted(classes))
+    benchmark_name = benchmark_parser.parse_known_args()[0].benchmark
+
+    parser = classes.get(benchmark_name, Benchmark).make_argument_parser()
+    parser.prog = prog
+    parser.description = description
+    parser.add_argument(
+        '--benchmark',
+        type=str,
+        required=True,
+        choices=sorted(classes),
+        help='Benchmark class name.',
+    )
+    return parser
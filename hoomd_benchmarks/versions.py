@@ -0,0 +1,343 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Run the benchmark suite against multiple HOOMD-blue installations.
+
+Each environment is a name, a Python interpreter, and a ``PYTHONPATH`` that
+selects one HOOMD-blue build. `run_environment` executes the suite
+(``python -m hoomd_benchmarks``) in a subprocess with that environment and
+journals the results (see `journal`), so an interrupted run resumes where it
+stopped. `merge` combines the journals into one result set.
+
+Run ``python -m hoomd_benchmarks.versions --help`` for the command line
+interface. Options that the driver does not recognize pass through to the
+suite.
+"""
+
+import argparse
+import concurrent.futures
+import os
+import pathlib
+import queue
+import subprocess
+import sys
+
+import pandas
+
+from . import results, scheduler
+
+
+class Environment:
+    """A HOOMD-blue installation to benchmark.
+
+    Args:
+        name (str): Name of the run (used as ``--name`` in the suite).
+        python (str): Python interpreter.
+        pythonpath (str): ``PYTHONPATH`` that selects the HOOMD-blue build.
+    """
+
+    def __init__(self, name, python, pythonpath):
+        self.name = name
+        self.python = python
+        self.pythonpath = pythonpath
+
+    def to_dict(self):
+        """dict: The environment's name, python, and pythonpath."""
+        return dict(name=self.name, python=self.python, pythonpath=self.pythonpath)
+
+
+def resolve_pythonpath(path):
+    """Find the ``PYTHONPATH`` of a HOOMD-blue build or installation.
+
+    Args:
+        path (str): A directory that contains the ``hoomd`` package (such as a
+          build directory) or an installation prefix with the package in
+          ``lib/python*/site-packages``.
+
+    Returns:
+        str: The directory that contains the ``hoomd`` package, or None when
+        there is none.
+    """
+    path = pathlib.Path(path)
+    if (path / 'hoomd').is_dir():
+        return str(path)
+
+    for site_packages in sorted(path.glob('lib*/python*/site-packages')):
+        if (site_packages / 'hoomd').is_dir():
+            return str(site_packages)
+
+    return None
+
+
+def find_environments(directory, python=sys.executable):
+    """Find the HOOMD-blue installations in a directory.
+
+    Args:
+        directory (str): Directory with one build or installation prefix per
+          subdirectory (see `resolve_pythonpath`).
+        python (str): Python interpreter.
+
+    Returns:
+        list[Environment]: One environment per installation named by the
+        subdirectory, sorted by name.
+    """
+    environments = []
+    for path in sorted(pathlib.Path(directory).iterdir()):
+        pythonpath = resolve_pythonpath(path)
+        if pythonpath is not None:
+            environments.append(
+                Environment(name=path.name, python=python, pythonpath=pythonpath)
+            )
+
+    return environments
+
+
+def journal_path(directory, environment):
+    """str: The journal file of an environment."""
+    return os.path.join(directory, f'{environment.name}.jsonl')
+
+
+def run_environment(environment, device, suite_args, directory, cpus=None):
+    """Execute the benchmark suite in one environment.
+
+    Args:
+        environment (Environment): The environment.
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        suite_args (list[str]): Additional suite command line arguments.
+        directory (str): Directory for the journal files.
+        cpus (list[int]): Pin the suite to these cores.
+
+    Returns:
+        int: The exit code of the suite.
+    """
+    command = [
+        environment.python,
+        '-u',
+        '-m',
+        'hoomd_benchmarks',
+        '--device',
+        device,
+        '--name',
+        environment.name,
+        '--journal',
+        journal_path(directory, environment),
+        *suite_args,
+    ]
+    if cpus is not None:
+        command.extend(['--cpus', ','.join(str(cpu) for cpu in cpus)])
+
+    # Every interpreter imports this copy of hoomd_benchmarks.
+    package_parent = pathlib.Path(__file__).resolve().parent.parent
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([environment.pythonpath, str(package_parent)]),
+    )
+    return subprocess.run(command, env=env, check=False).returncode
+
+
+def run_environments(
+    environments, device, suite_args, directory, cores_per_version=None, numa=False
+):
+    """Execute the benchmark suite in each environment.
+
+    Args:
+        environments (list[Environment]): The environments.
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        suite_args (list[str]): Additional suite command line arguments.
+        directory (str): Directory for the journal files.
+        cores_per_version (int): On CPUs, run the environments concurrently,
+          each pinned to this many cores (see `scheduler.core_sets`). When
+          None, run them one after another.
+        numa (bool): Keep the cores of each environment within one NUMA node.
+
+    Returns:
+        dict[str, int]: The exit code of each environment's suite.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    if cores_per_version is None:
+        return {
+            environment.name: run_environment(
+                environment, device, suite_args, directory
+            )
+            for environment in environments
+        }
+
+    sets = scheduler.core_sets(cores_per_version, numa=numa)
+    free_sets = queue.Queue()
+    for cpus in sets:
+        free_sets.put(cpus)
+
+    def run(environment):
+        cpus = free_sets.get()
+        try:
+            return run_environment(environment, device, suite_args, directory, cpus)
+        finally:
+            free_sets.put(cpus)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(sets)) as executor:
+        codes = executor.map(run, environments)
+        return {
+            environment.name: code for environment, code in zip(environments, codes)
+        }
+
+
+def merge(environments, directory):
+    """Merge the journaled results of the environments.
+
+    Args:
+        environments (list[Environment]): The environments.
+        directory (str): Directory with the journal files.
+
+    Keep the last record of each journal entry (a benchmark that failed and
+    then completed on a resumed run appears once) and tag each record with the
+    ``environment`` it ran in. Completed records also include the HOOMD-blue
+    version and build configuration in ``hoomd``.
+
+    Returns:
+        list[dict]: The records.
+    """
+    merged = []
+    for environment in environments:
+        filename = journal_path(directory, environment)
+        if not os.path.isfile(filename):
+            continue
+
+        entries = {}
+        for record in results.read_records(filename):
+            entries[record.get('journal_key')] = record
+
+        for record in entries.values():
+            record['environment'] = environment.to_dict()
+            merged.append(record)
+
+    return merged
+
+
+def to_dataframe(records):
+    """Tabulate the performance in result records.
+
+    Returns:
+        pandas.DataFrame: One row per benchmark and one column per run name
+        (``nan`` for benchmarks that did not complete).
+    """
+    performance = {}
+    for record in records:
+        value = None
+        if record['status'] == 'completed':
+            value = record['summary']['value']
+        performance.setdefault(record['name'], {})[record['benchmark']] = value
+
+    return pandas.DataFrame(performance, dtype=float)
+
+
+def main():
+    """Implement the command line interface."""
+    parser = argparse.ArgumentParser(
+        prog='python -m hoomd_benchmarks.versions',
+        description='Run the benchmark suite against multiple HOOMD-blue '
+        'installations. Unrecognized options pass through to the suite.',
+        allow_abbrev=False,
+    )
+    parser.add_argument(
+        '--releases',
+        type=str,
+        default=None,
+        help='Directory with one HOOMD-blue installation per subdirectory.',
+    )
+    parser.add_argument(
+        '--environment',
+        type=str,
+        nargs=3,
+        action='append',
+        default=[],
+        metavar=('NAME', 'PYTHON', 'PYTHONPATH'),
+        help='Add an environment by name, interpreter, and PYTHONPATH.'
+        ' May be repeated.',
+    )
+    parser.add_argument(
+        '--python',
+        type=str,
+        default=sys.executable,
+        help='Python interpreter for the installations in --releases.',
+    )
+    parser.add_argument(
+        '--device', type=str, choices=['CPU', 'GPU'], required=True, help='Device.'
+    )
+    parser.add_argument(
+        '--journal_directory',
+        type=str,
+        default='journals',
+        help='Directory for the journal of each environment.',
+    )
+    parser.add_argument(
+        '--cores-per-version',
+        dest='cores_per_version',
+        type=int,
+        default=None,
+        help='Run CPU environments concurrently, each pinned to this many cores.',
+    )
+    parser.add_argument(
+        '--numa',
+        action='store_true',
+        help='Keep the cores of each environment within one NUMA node.',
+    )
+    parser.add_argument(
+        '-o',
+        '--output',
+        type=str,
+        default=None,
+        help='Write the merged performance to this CSV file.',
+    )
+    parser.add_argument(
+        '--jsonl',
+        type=str,
+        default=None,
+        help='Write the merged result records to this JSON Lines file.',
+    )
+    args, suite_args = parser.parse_known_args()
+
+    if args.cores_per_version is not None and args.device != 'CPU':
+        parser.error('--cores-per-version requires --device CPU')
+
+    environments = []
+    if args.releases is not None:
+        environments.extend(find_environments(args.releases, args.python))
+    environments.extend(Environment(*values) for values in args.environment)
+    if len(environments) == 0:
+        parser.error('Provide --releases or --environment')
+
+    codes = run_environments(
+        environments,
+        args.device,
+        suite_args,
+        args.journal_directory,
+        args.cores_per_version,
+        args.numa,
+    )
+    for name, code in codes.items():
+        if code != 0:
+            print(f'{name}: suite exited with code {code}')
+
+    records = merge(environments, args.journal_directory)
+
+    if args.jsonl is not None:
+        # Rewrite the file so that repeated runs do not duplicate records.
+        temporary = args.jsonl + '.tmp'
+        if os.path.isfile(temporary):
+            os.unlink(temporary)
+        writer = results.JSONLWriter(temporary)
+        for record in records:
+            writer.write(record)
+        os.replace(temporary, args.jsonl)
+
+    df = to_dataframe(records)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            f.write(df.to_csv())
+    else:
+        print(df)
+
+
+if __name__ == '__main__':
+    main()
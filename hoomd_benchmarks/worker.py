@@ -0,0 +1,229 @@
+# Copyright (c) 2021-2024 The Regents of the University of Michigan
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Execute benchmarks in isolated worker processes.
+
+`run_isolated` launches ``python -m hoomd_benchmarks.worker JOB_FILE`` for one
+benchmark. The worker reads the job (a JSON file), executes the benchmark in a
+fresh process, and writes the result record (see `results.make_record`) to
+stdout on a line that starts with `RESULT_PREFIX`. All other output passes
+through to the parent's stdout.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import types
+
+from . import results
+
+RESULT_PREFIX = '@hoomd_benchmarks_result '
+
+
+def make_status_record(
+    benchmark_name, arguments, status, start_time, stop_time, name, run_id, **kwargs
+):
+    """Make a result record for a benchmark that did not complete.
+
+    Args:
+        benchmark_name (str): Name of the benchmark class.
+        arguments (dict): The benchmark arguments.
+        status (str): ``'failed'``, ``'timeout'``, or ``'skipped'``.
+        start_time (str): Time the execution started.
+        stop_time (str): Time the execution finished.
+        name (str): Name identifying the benchmark run.
+        run_id (str): Identifier shared by all records of one run.
+        kwargs: Additional fields.
+
+    Returns:
+        dict: The record.
+    """
+    return results.to_json(
+        dict(
+            record_version=results.RECORD_VERSION,
+            name=name,
+            run_id=run_id,
+            benchmark=benchmark_name,
+            status=status,
+            samples=[],
+            summary=None,
+            arguments=arguments,
+            start_time=start_time,
+            stop_time=stop_time,
+            **kwargs,
+        )
+    )
+
+
+def run_isolated(
+    benchmark_name,
+    arguments,
+    device,
+    name=None,
+    run_id=None,
+    timeout=None,
+    launcher='',
+    cpus=None,
+):
+    """Execute a benchmark in a new worker process.
+
+    Args:
+        benchmark_name (str): Name of the benchmark class (see
+          `suite.benchmark_classes`).
+        arguments (dict): Keyword arguments for the benchmark constructor
+          (excluding ``device``).
+        device (str): Execution device (``'CPU'`` or ``'GPU'``).
+        name (str): Name identifying the benchmark run.
+        run_id (str): Identifier shared by all records of one run.
+        timeout (float): Kill the worker after this many seconds.
+        launcher (str): Command that launches the worker (for example,
+          ``'srun -n 16'``).
+        cpus (list[int]): Pin the worker to these cores (see
+          `scheduler.run_packed`).
+
+    Returns:
+        dict: The result record. ``record['status']`` is ``'completed'``,
+        ``'skipped'`` (the benchmark does not run on the device), ``'failed'``,
+        or ``'timeout'``.
+    """
+    job = dict(
+        benchmark=benchmark_name,
+        arguments=arguments,
+        device=device,
+        name=name,
+        run_id=run_id,
+        cpus=cpus,
+    )
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(job, f)
+        job_path = f.name
+
+    command = [
+        *shlex.split(launcher),
+        sys.executable,
+        '-m',
+        'hoomd_benchmarks.worker',
+        job_path,
+    ]
+
+    start_time = results.timestamp()
+    process = subprocess.Popen(
+        command, stdout=subprocess.PIPE, text=True, start_new_session=True
+    )
+
+    # Relay the worker's output as it arrives and keep the result line.
+    result_lines = []
+
+    def relay():
+        for line in process.stdout:
+            if line.startswith(RESULT_PREFIX):
+                result_lines.append(line[len(RESULT_PREFIX) :])
+            else:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+
+    relay_thread = threading.Thread(target=relay, daemon=True)
+    relay_thread.start()
+
+    status = None
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+        status = 'timeout'
+    finally:
+        relay_thread.join()
+        os.unlink(job_path)
+
+    stop_time = results.timestamp()
+
+    if status is None and process.returncode == 0 and len(result_lines) > 0:
+        return json.loads(result_lines[-1])
+
+    if status is None:
+        status = 'failed'
+
+    return make_status_record(
+        benchmark_name,
+        arguments,
+        status,
+        start_time,
+        stop_time,
+        name,
+        run_id,
+        device=dict(type=device),
+        returncode=process.returncode,
+    )
+
+
+def execute_job(job):
+    """Execute the benchmark described by a job and return its record."""
+    from .common import make_hoomd_device
+    from .suite import benchmark_classes
+
+    classes = {cls.__name__: cls for cls in benchmark_classes}
+    benchmark_class = classes[job['benchmark']]
+    arguments = job['arguments']
+
+    # Pin before the device starts its threads so that they inherit the
+    # affinity.
+    if job.get('cpus') is not None:
+        os.sched_setaffinity(0, job['cpus'])
+
+    device = make_hoomd_device(
+        types.SimpleNamespace(
+            device=job['device'], verbose=arguments.get('verbose', False)
+        )
+    )
+
+    start_time = results.timestamp()
+    if not benchmark_class.runs_on_device(device):
+        return device, make_status_record(
+            job['benchmark'],
+            arguments,
+            'skipped',
+            start_time,
+            results.timestamp(),
+            job['name'],
+            job['run_id'],
+            device=dict(type=job['device']),
+        )
+
+    benchmark = benchmark_class(device=device, **arguments)
+    performance = benchmark.execute()
+    stop_time = results.timestamp()
+
+    record = results.make_record(
+        benchmark,
+        performance,
+        start_time,
+        stop_time,
+        name=job['name'],
+        run_id=job['run_id'],
+    )
+    record['formatted_performance'] = benchmark.format_performance()
+    return device, record
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Execute one benchmark job (used by isolated suite runs).'
+    )
+    parser.add_argument('job', type=str, help='Path to the JSON job file.')
+    args = parser.parse_args()
+
+    with open(args.job) as f:
+        job = json.load(f)
+
+    device, record = execute_job(job)
+
+    if device.communicator.rank == 0:
+        print(RESULT_PREFIX + json.dumps(record), flush=True)
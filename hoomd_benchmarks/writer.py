@@ -8,7 +8,6 @@ import time
 import hoomd
 
 from . import common
-from .configuration.hard_sphere import make_hard_sphere_configuration
 
 DEFAULT_BANDWIDTH = False
 
@@ -51,16 +50,8 @@ class Writer(common.Benchmark):
 
     def make_simulation(self):
         """Make the Simulation object."""
-        path = make_hard_sphere_configuration(
-            N=self.N,
-            rho=self.rho,
-            dimensions=self.dimensions,
-            device=self.device,
-            verbose=self.verbose,
-        )
-
         sim = hoomd.Simulation(device=self.device)
-        sim.create_state_from_gsd(filename=str(path))
+        self.create_state(sim)
 
         self.writer = self.make_writer()
         sim.operations.writers.append(self.writer)
@@ -18,18 +18,12 @@ export RELEASES_DIR=/scratch/bbgw/joshuaan/hoomd-releases
 cd $HOME/devel/hoomd-benchmarks
 source $HOME/hoomd-dev-env.sh
 
-rm gpu.csv
+# Resubmit this script to resume an interrupted run. Remove journals/ to start over.
 
-for version in $(ls ${RELEASES_DIR})
-do
-    export PYTHONPATH=${RELEASES_DIR}/${version}
-    srun -n 1 python3 -u -m hoomd_benchmarks --device GPU --output gpu.csv --name "${version}" --repeat 20 -v
-done
+python3 -u -m hoomd_benchmarks.versions --releases ${RELEASES_DIR} --device GPU \
+    --journal_directory journals/gpu --output gpu.csv --jsonl gpu.jsonl \
+    --repeat 20 -v --isolate --launcher "srun -n 1" --timeout 3600
 
-rm cpu.csv
-
-for version in $(ls ${RELEASES_DIR})
-do
-    export PYTHONPATH=${RELEASES_DIR}/${version}
-    srun -n 16 python3 -u -m hoomd_benchmarks --device CPU --output cpu.csv --name "${version}" --repeat 10 -v
-done
+python3 -u -m hoomd_benchmarks.versions --releases ${RELEASES_DIR} --device CPU \
+    --journal_directory journals/cpu --output cpu.csv --jsonl cpu.jsonl \
+    --repeat 10 -v --isolate --launcher "srun -n 16" --timeout 3600
@@ -1,34 +1,135 @@
 # Copyright (c) 2021-2024 The Regents of the University of Michigan
 # Part of HOOMD-blue, released under the BSD 3-Clause License.
 
-"""Generate a benchmark report from a run on Great Lakes.
+"""Generate a benchmark report.
 
-Use to report CPU and GPU benchmark performance in the issue for each
-HOOMD-blue release.
+Without arguments, report the results of a run on Great Lakes. Use to report
+CPU and GPU benchmark performance in the issue for each HOOMD-blue release.
+
+With ``--compare BASELINE CANDIDATE``, compare two named runs (versions,
+commits, or other run names) from JSON Lines result records or a results
+database and report the speedup of each benchmark, with significant
+regressions and improvements flagged.
 """
 
+import argparse
 import subprocess
 
 import pandas
 
-git_sha = subprocess.run(
-    ['git', 'show', '-s', '--format=%H'], capture_output=True, check=True
-).stdout
-git_sha = git_sha.decode('UTF-8').strip()
+from hoomd_benchmarks import compare, stats
+from hoomd_benchmarks.database import ResultsDatabase
+
+
+def release_report():
+    """Print the CPU and GPU results in gpu.csv and cpu.csv."""
+    git_sha = subprocess.run(
+        ['git', 'show', '-s', '--format=%H'], capture_output=True, check=True
+    ).stdout
+    git_sha = git_sha.decode('UTF-8').strip()
+
+    print(f'hoomd-benchmarks results using hoomd-benchmarks@{git_sha}')
+    print()
+
+    df_gpu = pandas.read_csv('gpu.csv', index_col=0)
+
+    print('A100 GPU:')
+    print('```')
+    print(df_gpu)
+    print('```')
+
+    df_cpu = pandas.read_csv('cpu.csv', index_col=0)
+
+    print('AMD EPYC 7763 (16 cores used)')
+    print('```')
+    print(df_cpu)
+    print('```')
+
+
+def comparison_report(args):
+    """Print a comparison of two runs."""
+    baseline_name, candidate_name = args.compare
+
+    if args.database is not None:
+        database = ResultsDatabase(args.database)
+        baseline = compare.load_database_samples(
+            database, baseline_name, hostname=args.hostname, device=args.device
+        )
+        candidate = compare.load_database_samples(
+            database, candidate_name, hostname=args.hostname, device=args.device
+        )
+        database.close()
+    else:
+        baseline = compare.load_jsonl_samples(args.jsonl, baseline_name)
+        candidate = compare.load_jsonl_samples(args.jsonl, candidate_name)
 
-print(f'hoomd-benchmarks results using hoomd-benchmarks@{git_sha}')
-print()
+    df = compare.compare(
+        baseline,
+        candidate,
+        statistic=args.statistic,
+        confidence=args.confidence,
+        alpha=args.alpha,
+        min_effect=args.min_effect,
+    )
 
-df_gpu = pandas.read_csv('gpu.csv', index_col=0)
+    if args.format == 'html':
+        print(compare.to_html(df, baseline_name, candidate_name, args.confidence))
+    else:
+        print(compare.to_markdown(df, baseline_name, candidate_name, args.confidence))
 
-print('A100 GPU:')
-print('```')
-print(df_gpu)
-print('```')
 
-df_cpu = pandas.read_csv('cpu.csv', index_col=0)
+parser = argparse.ArgumentParser(description='Generate a benchmark report.')
+parser.add_argument(
+    '--compare',
+    nargs=2,
+    metavar=('BASELINE', 'CANDIDATE'),
+    help='Compare the runs with these names.',
+)
+source = parser.add_mutually_exclusive_group()
+source.add_argument('--jsonl', nargs='+', help='JSON Lines result record files.')
+source.add_argument('--database', type=str, help='Results database.')
+parser.add_argument('--hostname', type=str, help='Select runs on this host.')
+parser.add_argument('--device', type=str, help='Select runs on this device type.')
+parser.add_argument(
+    '--statistic',
+    type=str,
+    choices=list(stats.STATISTICS.keys()),
+    default=stats.DEFAULT_STATISTIC,
+    help='Statistic of the samples to compare.',
+)
+parser.add_argument(
+    '--confidence',
+    type=float,
+    default=stats.DEFAULT_CONFIDENCE,
+    help='Confidence level of the speedup confidence interval.',
+)
+parser.add_argument(
+    '--alpha',
+    type=float,
+    default=compare.DEFAULT_ALPHA,
+    help='Significance level of the Mann-Whitney U test.',
+)
+parser.add_argument(
+    '--min_effect',
+    type=float,
+    default=compare.DEFAULT_MIN_EFFECT,
+    help='Minimum relative change to flag as a regression or improvement.',
+)
+parser.add_argument(
+    '--format',
+    type=str,
+    choices=['markdown', 'html'],
+    default='markdown',
+    help='Output format of the comparison.',
+)
+args = parser.parse_args()
 
-print('AMD EPYC 7763 (16 cores used)')
-print('```')
-print(df_cpu)
-print('```')
+if args.compare is None:
+    release_report()
+else:
+    if args.jsonl is None and args.database is None:
+        parser.error('--compare requires --jsonl or --database')
+    try:
+        comparison_report(args)
+    except ValueError as error:
+        parser.error(str(error))